@@ -19,3 +19,4 @@ REPORTS_DIR = BASE_DIR / "reports"
 VIDEOS_DIR = REPORTS_DIR / "videos"
 SCREENSHOTS_DIR = REPORTS_DIR / "screenshots"
 DATA_DIR = BASE_DIR / "data"
+CACHE_DIR = BASE_DIR / ".cache"
@@ -8,13 +8,296 @@
 """
 
 import argparse
+import json
+import os
 import subprocess
 import sys
+import time
 
 from configs.path import REPORTS_DIR
 
 
+def startup_bench(argv):
+    """测量浏览器冷启动（无启动缓存）与热启动（命中启动缓存）耗时"""
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py startup-bench", description="浏览器冷/热启动耗时对比"
+    )
+    _browser_arguments(parser)
+    parser.add_argument("--rounds", type=int, default=3, help="冷/热启动各测量次数")
+    args = parser.parse_args(argv)
+
+    config = _apply_browser_arguments(args)
+    if not config.get("webdriver.startup_cache.enabled", False):
+        print("启动缓存未启用（webdriver.startup_cache.enabled），无法对比")
+        return 1
+
+    from src.core.webdriver_manager import DriverManager
+
+    def measure(cold):
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            driver = DriverManager.create_unmanaged_driver(args.browser, cold_start=cold)
+            timings.append(time.perf_counter() - start)
+            driver.quit()
+        return timings
+
+    try:
+        # 配置模板、选项模板等只在首次启动时初始化一次，先启动一次，避免计入第一轮冷启动
+        DriverManager.create_unmanaged_driver(args.browser).quit()
+        cold = measure(cold=True)
+        # 最后一次冷启动已写入缓存，之后都是热启动
+        warm = measure(cold=False)
+    finally:
+        # 删除配置模板与各会话的克隆目录，清理残留进程
+        DriverManager.shutdown()
+
+    def summary(name, timings):
+        avg = sum(timings) / len(timings)
+        detail = ", ".join(f"{t:.3f}" for t in timings)
+        print(f"{name}: 平均 {avg:.3f}s，最快 {min(timings):.3f}s（{detail}）")
+        return avg
+
+    print(f"浏览器启动耗时（{args.browser}，{args.rounds} 轮）")
+    cold_avg = summary("冷启动", cold)
+    warm_avg = summary("热启动", warm)
+    print(f"平均节省: {cold_avg - warm_avg:.3f}s")
+    return 0
+
+
+def log_bench(argv):
+    """测量单次日志调用在调用线程上的开销（立即格式化 vs 延迟参数）"""
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py log-bench", description="日志调用开销对比"
+    )
+    parser.add_argument("--calls", type=int, default=100000, help="每种写法的调用次数")
+    args = parser.parse_args(argv)
+
+    from selenium.webdriver.common.by import By
+
+    from src.core.logger import Logger
+
+    bench = Logger("log_bench")
+    locator = (By.XPATH, "//div[@class='article-list']//tr[3]/td[2]/a")
+    result = {"title": "文章标题", "rows": list(range(20))}
+
+    def measure(level, call):
+        bench.set_level(level)
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            call()
+        return (time.perf_counter() - start) / args.calls * 1e6
+
+    cases = [
+        ("DEBUG关闭  立即格式化", "INFO",
+         lambda: bench.debug(f"成功找到元素: {locator}，结果: {result}")),
+        ("DEBUG关闭  延迟参数", "INFO",
+         lambda: bench.debug("成功找到元素: %s，结果: %s", locator, result)),
+        ("DEBUG开启  立即格式化", "DEBUG",
+         lambda: bench.debug(f"成功找到元素: {locator}，结果: {result}")),
+        ("DEBUG开启  延迟参数", "DEBUG",
+         lambda: bench.debug("成功找到元素: %s，结果: %s", locator, result)),
+        ("INFO关闭   log_action", "WARNING",
+         lambda: bench.log_action("点击", locator, "详情")),
+    ]
+    print(f"日志调用开销（{args.calls} 次，单位 微秒/次，写入由后台线程完成）")
+    for name, level, call in cases:
+        print(f"{name}: {measure(level, call):.2f}")
+    bench.stop()
+    return 0
+
+
+def perf_report(argv):
+    """对比两次运行的页面性能（各指标中位数）"""
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py perf-report", description="页面性能跨运行对比"
+    )
+    parser.add_argument("--run", help="当前运行ID，默认最新一次")
+    parser.add_argument("--baseline", help="基线运行ID，默认当前运行的前一次")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="变化超过该比例时标记（默认0.2）"
+    )
+    args = parser.parse_args(argv)
+
+    from src.core.page_perf import PerfStore, compare_runs
+
+    runs = PerfStore.runs()
+    run = args.run or (runs[-1] if runs else None)
+    if run is None:
+        print("没有已保存的性能记录（reports/perf）")
+        return 1
+    baseline = args.baseline
+    if baseline is None:
+        earlier = runs[: runs.index(run)] if run in runs else []
+        if not earlier:
+            print(f"运行 {run} 之前没有可对比的记录")
+            return 1
+        baseline = earlier[-1]
+
+    rows = compare_runs(PerfStore.load(baseline), PerfStore.load(run))
+    print(f"页面性能对比: {baseline} -> {run}")
+    regressions = 0
+    for page, metric, old, new, change in rows:
+        mark = ""
+        if change is not None and change > args.threshold:
+            mark = "  <- 变慢"
+            regressions += 1
+        ratio = f"{change:+.1%}" if change is not None else "  -"
+        print(f"{page:<20} {metric:<32} {old:>10.2f} {new:>10.2f} {ratio:>8}{mark}")
+    print(f"共 {len(rows)} 项指标，{regressions} 项变化超过 {args.threshold:.0%}")
+    return 0
+
+
+def _browser_arguments(parser):
+    """需要启动浏览器的子命令共用的参数"""
+    parser.add_argument(
+        "--env", default="dev", choices=["dev", "test", "prod"], help="测试环境"
+    )
+    parser.add_argument(
+        "--browser",
+        default="chrome",
+        choices=["chrome", "firefox", "edge"],
+        help="浏览器类型: chrome, firefox, edge",
+    )
+    parser.add_argument("--headless", action="store_true", help="是否使用无头模式运行")
+
+
+def _apply_browser_arguments(args):
+    os.environ["ENV"] = args.env
+    from configs import config
+
+    config._update_current_config()
+    config.webdriver.browser = args.browser
+    if args.headless:
+        config.webdriver.headless = True
+    return config
+
+
+def _select_pages(names):
+    """src/pages 中设置了page_path的页面类（可按类名筛选）"""
+    from src.core.locator_optimizer import discover_pages
+
+    return [
+        page
+        for page in discover_pages()
+        if page.page_path and (not names or page.__name__ in names)
+    ]
+
+
+def _open_pages(driver, pages):
+    """
+    依次打开页面对象定位器所在的页面（需要登录时先登录一次）
+    :return: 逐个产出 (页面类, 路径, 该页面上的定位器)
+    """
+    from configs import config
+    from src.core.locator_health import locator_groups
+    from src.pages.admin_login_page import AdminLoginPage
+
+    logged_in = False
+    for page_class in pages:
+        if page_class.requires_login and not logged_in:
+            AdminLoginPage(driver).login(
+                config.users.admin.username, config.users.admin.password
+            )
+            logged_in = True
+        for path, locators in locator_groups(page_class).items():
+            page_class(driver).navigate_to(f"{config.base_url}{path}")
+            yield page_class, path, locators
+
+
+def locator_report(argv):
+    """在真实页面上为页面对象的定位器寻找更快的等价写法，并测量查找耗时"""
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py locator-report", description="定位器优化报告"
+    )
+    _browser_arguments(parser)
+    parser.add_argument("--page", action="append", help="只检查指定的页面类（可多次指定）")
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="每个定位器在浏览器内的查找次数"
+    )
+    parser.add_argument("--output", help="同时把完整结果写入JSON文件")
+    args = parser.parse_args(argv)
+    _apply_browser_arguments(args)
+
+    from src.core.locator_optimizer import LocatorOptimizer, format_report
+    from src.core.webdriver_manager import DriverManager
+
+    pages = _select_pages(args.page)
+    if not pages:
+        print("没有可检查的页面（页面类需要设置page_path）")
+        return 1
+
+    driver = DriverManager.get_driver(test_name="locator-report")
+    optimizer = LocatorOptimizer(driver, iterations=args.iterations)
+    results = []
+    try:
+        for page_class, _, locators in _open_pages(driver, pages):
+            results.extend(optimizer.optimize_page(page_class, locators))
+    finally:
+        DriverManager.quit_driver()
+        DriverManager.shutdown()
+
+    print(format_report(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"完整结果已写入: {args.output}")
+    return 0
+
+
+def locator_health(argv):
+    """检查全部页面对象的定位器在对应页面上是否存在（每个页面一次脚本）"""
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py locator-health", description="定位器健康检查"
+    )
+    _browser_arguments(parser)
+    parser.add_argument("--page", action="append", help="只检查指定的页面类（可多次指定）")
+    parser.add_argument("--output", help="同时把完整结果写入JSON文件")
+    args = parser.parse_args(argv)
+    _apply_browser_arguments(args)
+
+    from src.core.locator_health import failures, format_health, scan_page, skipped_rows
+    from src.core.webdriver_manager import DriverManager
+
+    pages = _select_pages(args.page)
+    if not pages:
+        print("没有可检查的页面（页面类需要设置page_path）")
+        return 1
+
+    start = time.perf_counter()
+    driver = DriverManager.get_driver(test_name="locator-health")
+    rows = []
+    try:
+        for page_class, path, locators in _open_pages(driver, pages):
+            rows.extend(scan_page(driver, page_class, locators, path))
+    finally:
+        DriverManager.quit_driver()
+        DriverManager.shutdown()
+    for page_class in pages:
+        rows.extend(skipped_rows(page_class))
+
+    print(format_health(rows, time.perf_counter() - start))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"完整结果已写入: {args.output}")
+    return 1 if failures(rows) else 0
+
+
+# 子命令: run_tests.py <子命令> [参数]
+SUBCOMMANDS = {
+    "startup-bench": startup_bench,
+    "log-bench": log_bench,
+    "perf-report": perf_report,
+    "locator-report": locator_report,
+    "locator-health": locator_health,
+}
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        sys.exit(SUBCOMMANDS[sys.argv[1]](sys.argv[2:]))
+
     from src.core.logger import logger  # 延迟导入以避免不必要的依赖
 
     parser = argparse.ArgumentParser(description="Web自动化测试执行脚本")
@@ -57,14 +340,30 @@ def main():
     #     help="是否从 .env 文件加载环境变量（生产环境建议通过其他方式设置）",
     # )
 
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="运行用例前先检查全部页面定位器，有失效的定位器时不执行用例",
+    )
+
     parser.add_argument(
         "test_path", nargs="?", default="tests/", help="测试路径（默认: tests/）"
     )
 
     args = parser.parse_args()
 
+    if args.preflight:
+        logger.info("预检: 定位器健康检查")
+        preflight = ["--env", args.env, "--browser", args.browser]
+        if args.headless:
+            preflight.append("--headless")
+        code = locator_health(preflight)
+        if code:
+            logger.error("定位器健康检查未通过，终止执行（详见上方报告）")
+            sys.exit(code)
+
     logger.info("开始执行测试")
-    logger.info(f"测试路径: {args.test_path}")
+    logger.info("测试路径: %s", args.test_path)
 
     # # 根据参数决定是否加载 .env 文件
     # if args.load_env:
@@ -105,13 +404,13 @@ def main():
     cmd.extend(["-v", "-s"])
 
     # 执行测试
-    logger.info(f"执行命令: {' '.join(cmd)}")
-    logger.info(f"当前环境: {args.env}")
-    logger.info(f"当前浏览器: {args.browser}")
+    logger.info("执行命令: %s", " ".join(cmd))
+    logger.info("当前环境: %s", args.env)
+    logger.info("当前浏览器: %s", args.browser)
 
     try:
         result = subprocess.run(cmd)
-        logger.info(f"测试执行完成，返回码: {result.returncode}")
+        logger.info("测试执行完成，返回码: %s", result.returncode)
 
         # 如果测试成功，启动 Allure 报告
         # if result.returncode:
@@ -132,7 +431,7 @@ def main():
                 )
                 time.sleep(3)  # 等待服务启动
             except Exception as e:
-                logger.error(f"启动 Allure 失败: {e}")
+                logger.error("启动 Allure 失败: %s", e)
         else:
             logger.warning(
                 "Allure CLI 未找到，请确保已安装并添加到 PATH，或手动运行: allure serve ./reports/allure-results"
@@ -143,7 +442,7 @@ def main():
         logger.info("测试被用户中断")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"执行测试时发生错误: {e}")
+        logger.error("执行测试时发生错误: %s", e)
         sys.exit(1)
 
 
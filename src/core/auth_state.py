@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  auth_state.py
+@Time    :  2026/10/16 17:20:46
+@Author  :  owl
+@Desp    :  登录态缓存：登录一次，cookies与localStorage跨会话、跨worker复用
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from configs.path import CACHE_DIR
+
+from .logger import logger
+
+AUTH_DIR = CACHE_DIR / "auth"
+
+
+@contextmanager
+def file_lock(path):
+    """进程间排他文件锁（xdist多个worker之间协调）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            # LK_LOCK最多重试10次，循环直到拿到锁
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class AuthStateStore:
+    """
+    登录态缓存
+
+    第一次登录后保存cookies与localStorage到文件，之后的会话直接注入并做一次
+    有效性检查，只有缓存缺失或已失效时才走真实的UI登录。登录过程持有文件锁，
+    多个worker同时发现失效时只有一个去登录，其余等待后复用新的登录态。
+    """
+
+    def __init__(self, name, base_url, ttl=1800, state_dir=None):
+        """
+        :param name: 缓存名称（如 环境-用户名）
+        :param base_url: 被测站点地址，站点变化时缓存失效
+        :param ttl: 登录态有效期（秒），0表示只依赖有效性检查
+        :param state_dir: 缓存目录
+        """
+        state_dir = Path(state_dir or AUTH_DIR)
+        self.name = name
+        self.base_url = base_url
+        self.ttl = ttl
+        self.state_file = state_dir / f"{name}.json"
+        self.lock_file = state_dir / f"{name}.lock"
+        self.restored = 0
+        self.logins = 0
+
+    def load(self):
+        """读取缓存的登录态，缺失或过期时返回None"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("base_url") != self.base_url:
+            return None
+        if self.ttl and time.time() - state.get("saved_at", 0) > self.ttl:
+            logger.info("登录态缓存已过期: %s", self.name)
+            return None
+        return state
+
+    def save(self, state):
+        """原子写入登录态（包含会话cookie，文件仅当前用户可读写）"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_name(f"{self.state_file.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # 残留的临时文件可能带着更宽的权限
+        os.chmod(tmp_file, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
+    def invalidate(self):
+        """删除登录态缓存"""
+        self.state_file.unlink(missing_ok=True)
+
+    def capture(self, driver):
+        """读取当前浏览器的登录态"""
+        return {
+            "base_url": self.base_url,
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "return Object.assign({}, window.localStorage);"
+            ),
+        }
+
+    def inject(self, driver, state, origin_url):
+        """
+        把登录态注入当前会话
+        :param origin_url: 同源的轻量页面，cookie和localStorage只能在同源页面上设置
+        """
+        driver.get(origin_url)
+        now = time.time()
+        for cookie in state["cookies"]:
+            if cookie.get("expiry") and cookie["expiry"] < now:
+                continue
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug("注入cookie失败: %s - %s", cookie.get("name"), e)
+        if state.get("local_storage"):
+            driver.execute_script(
+                "for (const [k, v] of Object.entries(arguments[0])) "
+                "window.localStorage.setItem(k, v);",
+                state["local_storage"],
+            )
+
+    def restore_or_login(self, driver, origin_url, validate, login):
+        """
+        恢复登录态，失效时登录并刷新缓存
+        :param origin_url: 注入登录态时打开的同源页面
+        :param validate: 检查登录态是否有效的回调，参数为driver，返回bool
+        :param login: 真实UI登录的回调，参数为driver
+        :return: 是否由缓存恢复
+        """
+        start = time.perf_counter()
+        tried = None
+        state = self.load()
+        if state is not None:
+            tried = state["saved_at"]
+            if self._try_restore(driver, state, origin_url, validate, start):
+                return True
+
+        with file_lock(self.lock_file):
+            # 等锁期间其他worker可能已经刷新了登录态
+            state = self.load()
+            if state is not None and state["saved_at"] != tried:
+                if self._try_restore(driver, state, origin_url, validate, start):
+                    return True
+            logger.info("登录态缓存不可用，执行UI登录: %s", self.name)
+            driver.delete_all_cookies()
+            login(driver)
+            self.save(self.capture(driver))
+            self.logins += 1
+        logger.info("UI登录并缓存登录态: %s，耗时 %.3fs", self.name, time.perf_counter() - start)
+        return False
+
+    def _try_restore(self, driver, state, origin_url, validate, start):
+        self.inject(driver, state, origin_url)
+        if not validate(driver):
+            logger.info("缓存的登录态已失效: %s", self.name)
+            return False
+        self.restored += 1
+        logger.info("已恢复登录态: %s，耗时 %.3fs", self.name, time.perf_counter() - start)
+        return True
@@ -11,105 +11,228 @@ import time
 from pathlib import Path
 
 from selenium.common import JavascriptException
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver import ActionChains
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
-
-from configs.path import SCREENSHOTS_DIR
 
+from configs import config
+
+from .dom_script import (
+    FILL_ELEMENT_JS,
+    FILL_FORM_JS,
+    PROBE_JS,
+    READ_MANY_JS,
+    READ_PROPERTIES,
+    ReadResult,
+    js_locator,
+)
+from .element_cache import ElementCache
 from .logger import logger
+from .network_capture import drain_capture
+from .page_perf import collect_page_perf, record_page_perf
+from .readiness import DomReady, ready_predicates, session_strategy, wait_until_ready
+from .screenshot_service import get_screenshot_service
+from .settle import record_settle, wait_for_settle
+from .tab_isolation import context_window_handles
+from .typing_engine import compile_typing
+from .wait_engine import WaitEngine
 
 
 class BasePage:
     """带日志记录的页面基类"""
 
-    def __init__(self, driver):
+    # 是否缓存已定位的元素（复用到元素失效为止，子类可开启）
+    cache_elements = False
+
+    # 页面就绪条件（navigate_to后等待，子类按需设置）
+    # page_load_strategy: 页面需要的加载程度 normal/eager/none，为空时与会话策略一致
+    # ready_locator: 关键元素可见即可操作；network_idle: 是否等待fetch/XHR空闲（可为毫秒数）
+    page_load_strategy = None
+    ready_locator = None
+    network_idle = False
+
+    # 导航后是否采集页面性能（为空时取 perf.enabled）
+    capture_performance = None
+
+    # 页面相对base_url的路径及是否需要登录（供定位器报告等工具直接打开页面）
+    # locator_paths: 不在page_path页面上的定位器 {属性名: 所在页面路径}
+    # optional_locators: 允许不存在的定位器（如依赖测试数据或页面配置的元素）
+    page_path = None
+    requires_login = False
+    locator_paths = {}
+    optional_locators = ()
+
+    def __init__(self, driver, cache_elements=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = WaitEngine(driver)
         self.actions = ActionChains(driver)
         self.logger = logger
+        if cache_elements is None:
+            cache_elements = self.cache_elements
+        self.element_cache = ElementCache(driver) if cache_elements else None
 
     def find_element(self, locator):
         """查找元素"""
+        if self.element_cache is not None:
+            element = self.element_cache.lookup(locator)
+            if element is not None:
+                self.logger.debug("使用缓存的元素: %s", locator)
+                return element
         try:
             self.logger.log_action("查找元素", locator)
-            element = self.wait.until(EC.presence_of_element_located(locator))
-            self.logger.debug(f"成功找到元素: {locator}")
-            return element
+            element = self.wait.wait_for("presence", locator)
+            self.logger.debug("成功找到元素: %s", locator)
         except TimeoutException:
-            self.logger.error(f"元素查找超时: {locator}")
+            self.logger.error("元素查找超时: %s", locator)
             raise
+        if self.element_cache is not None:
+            self.element_cache.store(locator, element)
+        return element
+
+    def _forget_elements(self):
+        """页面导航或切换窗口后清空元素缓存"""
+        if self.element_cache is not None:
+            self.element_cache.invalidate()
+
+    def _retry_stale(self, locator, action):
+        """缓存的元素已失效时清除缓存并重新执行一次"""
+        try:
+            return action()
+        except StaleElementReferenceException:
+            if self.element_cache is None:
+                raise
+            self.logger.debug("缓存的元素已失效，重新定位: %s", locator)
+            self.element_cache.invalidate(locator)
+            return action()
 
     def find_elements(self, locator):
         """查找多个元素"""
         try:
             self.logger.log_action("查找多个元素", locator)
-            elements = self.wait.until(EC.presence_of_all_elements_located(locator))
-            self.logger.debug(f"找到 {len(elements)} 个元素: {locator}")
+            elements = self.wait.wait_for("presence_all", locator)
+            self.logger.debug("找到 %s 个元素: %s", len(elements), locator)
             return elements
         except TimeoutException:
-            self.logger.error(f"元素查找超时: {locator}")
+            self.logger.error("元素查找超时: %s", locator)
             raise
 
     def click(self, locator):
         """点击元素"""
+        if self.element_cache is not None:
+            element = self.element_cache.lookup(locator)
+            if element is not None:
+                try:
+                    element.click()
+                    self.logger.info("点击成功（缓存的元素）: %s", locator)
+                    return
+                except (
+                    StaleElementReferenceException,
+                    ElementNotInteractableException,
+                    ElementClickInterceptedException,
+                ):
+                    # 元素失效或暂不可点击，回到常规的等待可点击流程
+                    self.element_cache.invalidate(locator)
         try:
             self.logger.log_action("点击", locator)
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = self.wait.wait_for("clickable", locator)
             element.click()
-            self.logger.info(f"点击成功: {locator}")
+            self.logger.info("点击成功: %s", locator)
         except TimeoutException:
-            self.logger.error(f"元素不可点击或超时: {locator}")
+            self.logger.error("元素不可点击或超时: %s", locator)
             raise
+        if self.element_cache is not None:
+            self.element_cache.store(locator, element)
 
     def input_text(self, locator, text):
         """输入文本"""
         try:
             self.logger.log_action("输入文本", locator, f"内容: {text}")
-            element = self.find_element(locator)
-            element.clear()
-            element.send_keys(text)
-            self.logger.debug(f"文本输入完成: {locator}")
+
+            def type_text():
+                element = self.find_element(locator)
+                element.clear()
+                element.send_keys(text)
+
+            self._retry_stale(locator, type_text)
+            self.logger.debug("文本输入完成: %s", locator)
         except Exception as e:
-            self.logger.error(f"文本输入失败: {locator} - 错误: {str(e)}")
+            self.logger.error("文本输入失败: %s - 错误: %s", locator, str(e))
             raise
 
     def get_text(self, locator):
         """获取元素文本"""
         try:
             self.logger.log_action("获取文本", locator)
-            element = self.find_element(locator)
-            text = element.text
-            self.logger.debug(f"获取到文本: {text}")
+            text = self._retry_stale(locator, lambda: self.find_element(locator).text)
+            self.logger.debug("获取到文本: %s", text)
             return text
         except Exception as e:
-            self.logger.error(f"获取文本失败: {locator} - 错误: {str(e)}")
+            self.logger.error("获取文本失败: %s - 错误: %s", locator, str(e))
             raise
 
     def is_displayed(self, locator):
-        """检查元素是否可见"""
+        """检查元素是否可见（元素不存在时会等满超时，预期不存在时用 is_displayed_now）"""
         try:
             self.logger.log_action("检查元素可见性", locator)
-            element = self.find_element(locator)
-            result = element.is_displayed()
-            self.logger.debug(f"元素可见性: {locator} = {result}")
+            result = self._retry_stale(
+                locator, lambda: self.find_element(locator).is_displayed()
+            )
+            self.logger.debug("元素可见性: %s = %s", locator, result)
             return result
         except (TimeoutException, NoSuchElementException):
-            self.logger.warning(f"元素不可见或不存在: {locator}")
+            self.logger.warning("元素不可见或不存在: %s", locator)
             return False
 
     def wait_for_element(self, locator, timeout=10):
         """等待元素出现"""
         try:
             self.logger.log_action("等待元素", locator, f"超时: {timeout}s")
-            wait = WebDriverWait(self.driver, timeout)
-            element = wait.until(EC.presence_of_element_located(locator))
-            self.logger.debug(f"元素等待成功: {locator}")
+            element = self.wait.wait_for("presence", locator, timeout=timeout)
+            self.logger.debug("元素等待成功: %s", locator)
             return element
         except TimeoutException:
-            self.logger.error(f"元素等待超时: {locator} - 超时设置: {timeout}s")
+            self.logger.error("元素等待超时: %s - 超时设置: %ss", locator, timeout)
+            raise
+
+    # 零等待探测：一次注入查询立即返回，不受隐式等待与显式等待影响，
+    # 用于“预期不存在/不可见”的检查（如确认错误提示没有出现）
+    def _probe(self, locator):
+        return self.driver.execute_script(PROBE_JS, *js_locator(locator))
+
+    def exists_now(self, locator):
+        """元素当前是否存在（不等待）"""
+        count = self._probe(locator)["count"]
+        self.logger.debug("元素存在探测: %s = %s", locator, count)
+        return count > 0
+
+    def is_displayed_now(self, locator):
+        """元素当前是否存在且可见（不等待，任一匹配元素可见即为True）"""
+        displayed = self._probe(locator)["displayed"]
+        self.logger.debug("元素可见探测: %s = %s", locator, displayed)
+        return displayed > 0
+
+    def wait_until_absent(self, locator, timeout=None, hidden=False):
+        """
+        等待元素消失，元素本来就不存在时立即返回
+        :param timeout: 超时（秒），默认使用 webdriver.timeout
+        :param hidden: 为True时元素仍在DOM中但不可见也视为消失
+        """
+        timeout = self.wait.timeout if timeout is None else timeout
+        key = "displayed" if hidden else "count"
+        try:
+            self.logger.log_action("等待元素消失", locator)
+            self.wait.until(lambda d: self._probe(locator)[key] == 0, timeout=timeout)
+            self.logger.debug("元素已消失: %s", locator)
+            return True
+        except TimeoutException:
+            self.logger.error("元素未消失: %s - 超时设置: %ss", locator, timeout)
             raise
 
     # def scroll_to_element(self, locator):
@@ -127,52 +250,106 @@ class BasePage:
     #         raise
 
     def take_screenshot(self, name=None):
-        """截图并记录日志"""
+        """
+        截图并记录日志
+        只在当前线程执行截图命令，编码与写盘由截图服务在后台完成
+        :return: 截图文件路径（文件可能尚未写完），失败时返回None
+        """
         try:
             if not name:
                 name = f"screenshot_{self.__class__.__name__}"
 
             self.logger.log_action("截图", details=f"文件名: {name}")
-            screenshot_dir = Path(SCREENSHOTS_DIR)
-            screenshot_dir.mkdir(exist_ok=True)
-
-            filepath = screenshot_dir / f"{name}.png"
-            self.driver.save_screenshot(str(filepath))
-            self.logger.debug(f"截图保存到: {filepath}")
-            return filepath
+            return get_screenshot_service().capture(self.driver, name)
         except Exception as e:
-            self.logger.error(f"截图失败: {str(e)}")
+            self.logger.error("截图失败: %s", str(e))
             return None
 
     def navigate_to(self, url):
-        """导航到URL"""
+        """导航到URL，并等待页面就绪条件"""
         self.logger.log_action("页面跳转", details=f"URL: {url}")
         self.driver.get(url)
-        self.logger.info(f"已跳转到: {url}")
+        self._forget_elements()
+        self.logger.info("已跳转到: %s", url)
+        self.wait_until_ready()
+        # HAR录制中时顺带读取积累的网络事件
+        drain_capture(self.driver)
+        capture = self.capture_performance
+        if capture is None:
+            capture = config.get("perf.enabled", False)
+        if capture:
+            self.collect_performance()
+
+    def collect_performance(self):
+        """采集当前页面性能并检查预算，记录归属当前页面对象"""
+        record = collect_page_perf(self.driver, page=self.__class__.__name__)
+        if record is None:
+            return None
+        self.logger.debug(
+            "页面性能: %s TTFB %s ms，LCP %s ms，CLS %s",
+            record["page"],
+            (record.get("navigation") or {}).get("ttfb"),
+            record["vitals"]["lcp"],
+            record["vitals"]["cls"],
+        )
+        return record_page_perf(record)
+
+    def wait_until_ready(
+        self, timeout=None, ready_locator=None, network_idle=None, strategy=None
+    ):
+        """
+        等待页面就绪，参数为空时使用页面类上的设置
+        会话的页面加载策略已经等到的程度不再检查，没有需要等待的条件时直接返回
+        :return: 是否在超时内就绪
+        """
+        session = session_strategy(self.driver)
+        predicates = ready_predicates(
+            strategy or self.page_load_strategy or session,
+            session,
+            ready_locator or self.ready_locator,
+            self.network_idle if network_idle is None else network_idle,
+        )
+        if not predicates:
+            return True
+        return wait_until_ready(
+            self.driver, predicates, timeout, label=self.__class__.__name__
+        )
 
     def get_current_url(self):
         """获取当前URL"""
         url = self.driver.current_url
-        self.logger.debug(f"当前URL: {url}")
+        self.logger.debug("当前URL: %s", url)
         return url
 
+    def get_title(self):
+        """获取页面标题"""
+        return self.driver.title
+
     def refresh_page(self):
         """刷新页面"""
         self.logger.log_action("刷新页面")
         self.driver.refresh()
+        self._forget_elements()
         self.logger.info("页面刷新完成")
         self.logger.info("页面刷新完成")
 
     def wait_for_page_load(self, timeout: int = 30):
-        """等待页面加载完成"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+        """等待页面加载完成（document.readyState为complete，与会话的加载策略无关）"""
+        if wait_until_ready(self.driver, [DomReady("complete")], timeout, "页面加载"):
             self.logger.info("页面加载完成")
-        except TimeoutException:
+        else:
             self.logger.warning("页面加载超时")
 
+    def wait_for_settle(self, element=None, baseline=0.0, label="", **kwargs):
+        """
+        等待界面稳定（滚动结束、动画完成、布局静止），稳定后立即返回
+        :param baseline: 被替代的固定等待时长，用于统计节省的时间
+        其余参数见 settle.wait_for_settle
+        """
+        return wait_for_settle(
+            self.driver, element, baseline=baseline, label=label, **kwargs
+        )
+
     def get_element_bytes(self, element: WebElement):
         """将WebElement截图转换为字节"""
         screenshot_bytes = element.screenshot_as_png
@@ -180,13 +357,15 @@ class BasePage:
 
     def wait_for_title_contains(self, title_part: str, timeout: int = 10):
         """等待页面标题包含指定文本"""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.title_contains(title_part))
+        return self.wait.wait_for(
+            "title_contains", expected=title_part, timeout=timeout
+        )
 
     def wait_for_title_is(self, expected_title: str, timeout: int = 10):
         """等待页面标题完全匹配"""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.title_is(expected_title))
+        return self.wait.wait_for(
+            "title_is", expected=expected_title, timeout=timeout
+        )
 
     # * 新增一些方法
     # ========== 1. 增强点击与截图 ==========
@@ -199,14 +378,14 @@ class BasePage:
         """
         try:
             self.logger.log_action("带截图点击", locator)
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = self.wait.wait_for("clickable", locator)
 
             # 点击前截图
             if screenshot_name:
                 self.take_screenshot(f"before_click_{screenshot_name}")
 
             element.click()
-            self.logger.info(f"点击成功: {locator}")
+            self.logger.info("点击成功: %s", locator)
 
             # 点击后截图
             if screenshot_name:
@@ -215,7 +394,7 @@ class BasePage:
             return element
 
         except Exception as e:
-            self.logger.error(f"带截图点击失败: {locator} - {e}")
+            self.logger.error("带截图点击失败: %s - %s", locator, e)
             # 失败时截图
             self.take_screenshot(f"click_failed_{screenshot_name or 'unknown'}")
             raise
@@ -229,74 +408,85 @@ class BasePage:
             )
 
             # 悬停到第一个元素
-            hover_element = self.wait.until(
-                EC.presence_of_element_located(hover_locator)
-            )
+            hover_element = self.wait.wait_for("presence", hover_locator)
             self.actions.move_to_element(hover_element).perform()
-            self.logger.debug(f"悬停完成: {hover_locator}")
-            time.sleep(0.5)  # 等待悬停效果
+            self.logger.debug("悬停完成: %s", hover_locator)
+            # 等待悬停效果（菜单展开动画）结束
+            self.wait_for_settle(hover_element, baseline=0.5, label="悬停")
 
             # 点击第二个元素
-            click_element = self.wait.until(EC.element_to_be_clickable(click_locator))
+            click_element = self.wait.wait_for("clickable", click_locator)
             click_element.click()
             self.logger.info("悬停点击完成")
 
         except Exception as e:
-            self.logger.error(f"悬停点击失败: {e}")
+            self.logger.error("悬停点击失败: %s", e)
             raise
 
     def double_click(self, locator):
         """双击元素"""
         try:
             self.logger.log_action("双击", locator)
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = self.wait.wait_for("presence", locator)
             self.actions.double_click(element).perform()
-            self.logger.info(f"双击完成: {locator}")
+            self.logger.info("双击完成: %s", locator)
         except Exception as e:
-            self.logger.error(f"双击失败: {locator} - {e}")
+            self.logger.error("双击失败: %s - %s", locator, e)
             raise
 
     def right_click(self, locator):
         """右键点击元素"""
         try:
             self.logger.log_action("右键点击", locator)
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = self.wait.wait_for("presence", locator)
             self.actions.context_click(element).perform()
-            self.logger.info(f"右键点击完成: {locator}")
+            self.logger.info("右键点击完成: %s", locator)
         except Exception as e:
-            self.logger.error(f"右键点击失败: {locator} - {e}")
+            self.logger.error("右键点击失败: %s - %s", locator, e)
             raise
 
     def drag_and_drop(self, source_locator, target_locator):
         """拖放元素"""
         try:
             self.logger.log_action("拖放元素", source_locator, f"到: {target_locator}")
-            source = self.wait.until(EC.presence_of_element_located(source_locator))
-            target = self.wait.until(EC.presence_of_element_located(target_locator))
+            source = self.wait.wait_for("presence", source_locator)
+            target = self.wait.wait_for("presence", target_locator)
             self.actions.drag_and_drop(source, target).perform()
             self.logger.info("拖放完成")
         except Exception as e:
-            self.logger.error(f"拖放失败: {e}")
+            self.logger.error("拖放失败: %s", e)
             raise
 
-    def send_keys_with_actions(self, locator, text, clear_first=True):
-        """使用ActionChains发送文本（更模拟人工输入）"""
+    def send_keys_with_actions(
+        self, locator, text, clear_first=True, delay=0.05, jitter=0.0, hold=0.0
+    ):
+        """
+        使用键盘动作输入文本（更模拟人工输入）
+        整段文本编译为一个W3C Actions请求，按键间隔由浏览器执行，只需一次命令
+        :param delay: 按键间平均间隔（秒）
+        :param jitter: 间隔抖动比例（0~1）
+        :param hold: 每个按键按下的时长（秒）
+        """
         try:
             self.logger.log_action("模拟输入文本", locator, f"内容: {text}")
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = self.wait.wait_for("presence", locator)
 
             if clear_first:
                 element.clear()
 
-            # 逐个字符输入，更接近人工
-            self.actions.click(element).perform()
-            for char in text:
-                self.actions.send_keys(char).perform()
-                time.sleep(0.05)  # 模拟输入间隔
+            chain, duration = compile_typing(
+                self.driver, text, element, delay=delay, jitter=jitter, hold=hold
+            )
+            chain.perform()
 
-            self.logger.debug(f"模拟输入完成: {locator}")
+            self.logger.debug(
+                "模拟输入完成: %s，按键 %d 次，预计耗时 %.2fs",
+                locator,
+                len(text),
+                duration,
+            )
         except Exception as e:
-            self.logger.error(f"模拟输入失败: {locator} - {e}")
+            self.logger.error("模拟输入失败: %s - %s", locator, e)
             raise
 
     # ========== 3. 文件上传处理 ==========
@@ -316,18 +506,16 @@ class BasePage:
             self.logger.log_action("上传文件", file_input_locator, f"文件: {file_path}")
 
             # 找到文件输入元素
-            file_input = self.wait.until(
-                EC.presence_of_element_located(file_input_locator)
-            )
+            file_input = self.wait.wait_for("presence", file_input_locator)
 
             # 直接发送文件路径（适用于大多数<input type="file">）
             file_input.send_keys(str(file_path_obj.absolute()))
 
-            self.logger.info(f"文件上传成功: {file_path_obj.name}")
+            self.logger.info("文件上传成功: %s", file_path_obj.name)
             return True
 
         except Exception as e:
-            self.logger.error(f"文件上传失败: {e}")
+            self.logger.error("文件上传失败: %s", e)
 
             # 备选方案：使用pyautogui处理弹窗式上传（需单独安装）
             try:
@@ -338,22 +526,43 @@ class BasePage:
                 # 先点击文件输入框触发系统弹窗
                 file_input = self.find_element(file_input_locator)
                 file_input.click()
-                time.sleep(1)  # 等待弹窗出现
+                # 等待弹窗出现（系统对话框打开后页面失去焦点）
+                self._wait_browser_condition(
+                    "return !document.hasFocus();", baseline=1, label="文件对话框打开"
+                )
 
                 # 输入文件路径并确认（需根据系统调整）
                 pyautogui.write(str(file_path_obj.absolute()))
                 pyautogui.press("enter")
-                time.sleep(1)
+                # 等待文件被选中
+                self._wait_browser_condition(
+                    "return arguments[0].files && arguments[0].files.length > 0;",
+                    file_input,
+                    baseline=1,
+                    label="文件选中",
+                )
 
                 self.logger.info("通过pyautogui上传成功")
                 return True
             except ImportError:
                 self.logger.error("pyautogui未安装，无法使用弹窗上传方案")
             except Exception as fallback_e:
-                self.logger.error(f"pyautogui上传也失败: {fallback_e}")
+                self.logger.error("pyautogui上传也失败: %s", fallback_e)
 
             raise
 
+    def _wait_browser_condition(self, script, *args, baseline=0.0, label="", timeout=5):
+        """等待页面内条件成立（超时不报错，与原固定等待的行为一致），计入稳定检测统计"""
+        start = time.perf_counter()
+        settled = True
+        try:
+            self.wait.until(lambda d: d.execute_script(script, *args), timeout=timeout)
+        except TimeoutException:
+            settled = False
+            self.logger.warning("等待超时: %s", label)
+        record_settle(label, time.perf_counter() - start, baseline, settled)
+        return settled
+
     # ========== 4. 伪元素处理 ==========
     def get_pseudo_element_content(self, locator, pseudo_type="before"):
         """
@@ -375,11 +584,11 @@ class BasePage:
             element = self.find_element(locator)
             content = self.driver.execute_script(script, element, pseudo_type)
 
-            self.logger.debug(f"伪元素内容: {content}")
+            self.logger.debug("伪元素内容: %s", content)
             return content
 
         except Exception as e:
-            self.logger.error(f"获取伪元素内容失败: {e}")
+            self.logger.error("获取伪元素内容失败: %s", e)
             return None
 
     # ========== 5. JavaScript操作 ==========
@@ -388,10 +597,10 @@ class BasePage:
         try:
             self.logger.log_action("执行JS脚本", details=f"脚本: {script[:50]}...")
             result = self.driver.execute_script(script, *args)
-            self.logger.debug(f"JS执行结果: {result}")
+            self.logger.debug("JS执行结果: %s", result)
             return result
         except JavascriptException as e:
-            self.logger.error(f"JS执行失败: {e}")
+            self.logger.error("JS执行失败: %s", e)
             raise
 
     def js_click(self, locator):
@@ -400,9 +609,9 @@ class BasePage:
             self.logger.log_action("JS强制点击", locator)
             element = self.find_element(locator)
             self.driver.execute_script("arguments[0].click();", element)
-            self.logger.info(f"JS点击完成: {locator}")
+            self.logger.info("JS点击完成: %s", locator)
         except Exception as e:
-            self.logger.error(f"JS点击失败: {locator} - {e}")
+            self.logger.error("JS点击失败: %s - %s", locator, e)
             raise
 
     def scroll_to_element(self, locator):
@@ -416,11 +625,12 @@ class BasePage:
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 element,
             )
-            time.sleep(0.5)  # 等待滚动完成
-            self.logger.debug(f"滚动完成: {locator}")
+            # 等待平滑滚动结束、元素位置静止
+            self.wait_for_settle(element, layout=True, baseline=0.5, label="滚动到元素")
+            self.logger.debug("滚动完成: %s", locator)
 
         except Exception as e:
-            self.logger.error(f"滚动到元素失败: {locator} - {e}")
+            self.logger.error("滚动到元素失败: %s - %s", locator, e)
             raise
 
     def scroll_by_pixels(self, x_pixels=0, y_pixels=0):
@@ -428,10 +638,10 @@ class BasePage:
         try:
             self.logger.log_action("按像素滚动", details=f"X:{x_pixels}, Y:{y_pixels}")
             self.driver.execute_script(f"window.scrollBy({x_pixels}, {y_pixels});")
-            time.sleep(0.3)
+            self.wait_for_settle(baseline=0.3, label="按像素滚动")
             self.logger.debug("像素滚动完成")
         except Exception as e:
-            self.logger.error(f"像素滚动失败: {e}")
+            self.logger.error("像素滚动失败: %s", e)
             raise
 
     def scroll_to_bottom(self):
@@ -441,10 +651,10 @@ class BasePage:
             self.driver.execute_script(
                 "window.scrollTo(0, document.body.scrollHeight);"
             )
-            time.sleep(0.5)
+            self.wait_for_settle(baseline=0.5, label="滚动到底部")
             self.logger.debug("已滚动到底部")
         except Exception as e:
-            self.logger.error(f"滚动到底部失败: {e}")
+            self.logger.error("滚动到底部失败: %s", e)
             raise
 
     def scroll_to_top(self):
@@ -452,20 +662,21 @@ class BasePage:
         try:
             self.logger.log_action("滚动到页面顶部")
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
+            self.wait_for_settle(baseline=0.5, label="滚动到顶部")
             self.logger.debug("已滚动到顶部")
         except Exception as e:
-            self.logger.error(f"滚动到顶部失败: {e}")
+            self.logger.error("滚动到顶部失败: %s", e)
             raise
 
     # ========== 6. 其他实用操作 ==========
     def switch_to_new_window(self, close_current=False):
         """切换到最新打开的窗口"""
         try:
-            window_handles = self.driver.window_handles
+            window_handles = context_window_handles(self.driver)
             if len(window_handles) > 1:
+                self._forget_elements()
                 self.driver.switch_to.window(window_handles[-1])
-                self.logger.info(f"切换到新窗口，共 {len(window_handles)} 个窗口")
+                self.logger.info("切换到新窗口，共 %s 个窗口", len(window_handles))
 
                 if close_current:
                     # 关闭原窗口
@@ -477,24 +688,23 @@ class BasePage:
             else:
                 self.logger.warning("没有新窗口可切换")
         except Exception as e:
-            self.logger.error(f"切换窗口失败: {e}")
+            self.logger.error("切换窗口失败: %s", e)
             raise
 
     def accept_alert(self, timeout=5):
         """接受/确认alert弹窗"""
         try:
             self.logger.log_action("接受Alert弹窗")
-            wait = WebDriverWait(self.driver, timeout)
-            alert = wait.until(EC.alert_is_present())
+            alert = self.wait.until(EC.alert_is_present(), timeout=timeout)
             alert_text = alert.text
             alert.accept()
-            self.logger.info(f"Alert已接受，内容: {alert_text}")
+            self.logger.info("Alert已接受，内容: %s", alert_text)
             return alert_text
         except TimeoutException:
-            self.logger.warning(f"{timeout}秒内未检测到Alert")
+            self.logger.warning("%s秒内未检测到Alert", timeout)
             return None
         except Exception as e:
-            self.logger.error(f"处理Alert失败: {e}")
+            self.logger.error("处理Alert失败: %s", e)
             raise
 
     def get_page_metrics(self):
@@ -512,8 +722,109 @@ class BasePage:
             };
             """
             metrics = self.execute_js(metrics_script)
-            self.logger.debug(f"页面指标: {metrics}")
+            self.logger.debug("页面指标: %s", metrics)
             return metrics
         except Exception as e:
-            self.logger.error(f"获取页面指标失败: {e}")
+            self.logger.error("获取页面指标失败: %s", e)
             return {}
+
+    # ========== 7. 批量读写 ==========
+    def read_many(self, spec, timeout=0):
+        """
+        一次注入脚本读取多个元素的文本、值、属性、可见性或位置
+        :param spec: {名称: 读取项}，读取项可以是：
+                     定位器（读取文本）、(定位器, 属性) 或 (定位器, "attribute", 属性名)；
+                     属性: text, value, attribute, displayed, rect, count（匹配数量）,
+                     texts（全部匹配元素的文本列表，适合表格断言）
+        :param timeout: 大于0时等待所有元素出现，超时后返回已读取到的结果
+        :return: ReadResult，元素不存在的字段值为None并记录在missing中
+        """
+        fields = []
+        for field_name, item in spec.items():
+            if isinstance(item[0], str):
+                locator, prop, arg = item, "text", None
+            else:
+                locator, prop = item[0], item[1]
+                arg = item[2] if len(item) > 2 else None
+            if prop not in READ_PROPERTIES:
+                raise ValueError(f"不支持的读取属性: {field_name} - {prop}")
+            if prop == "attribute" and not arg:
+                raise ValueError(f"读取属性需要指定属性名: {field_name}")
+            fields.append([field_name, *js_locator(locator), prop, arg])
+
+        self.logger.log_action("批量读取", details=f"{len(fields)} 个字段")
+
+        def read(driver):
+            raw = driver.execute_script(READ_MANY_JS, fields)
+            return ReadResult(raw["values"], raw["missing"])
+
+        def read_complete(driver):
+            result = read(driver)
+            return result if result.complete else None
+
+        result = read(self.driver)
+        if result.missing and timeout > 0:
+            try:
+                result = self.wait.until(read_complete, timeout=timeout)
+            except TimeoutException:
+                result = read(self.driver)
+        if result.missing:
+            self.logger.warning("批量读取时元素不存在: %s", result.missing)
+        self.logger.debug("批量读取结果: %s", dict(result))
+        return result
+
+    def fill_form(self, fields, type_keys=()):
+        """
+        一次注入脚本填写多个字段，并派发input/change事件
+        :param fields: {定位器: 值}，复选框/单选框的值为bool，可编辑区域按粘贴处理
+        :param type_keys: 需要真实键盘事件的字段定位器，这些字段用send_keys输入
+        :return: 各字段的填写方式 {定位器: "script" 或 "keys"}
+        """
+        type_keys = set(type_keys)
+        scripted = [locator for locator in fields if locator not in type_keys]
+        self.logger.log_action(
+            "批量填写", details=f"脚本 {len(scripted)} 个，键盘 {len(fields) - len(scripted)} 个"
+        )
+
+        statuses = []
+        if scripted:
+            payload = []
+            for locator in scripted:
+                value = fields[locator]
+                payload.append(
+                    [*js_locator(locator), value if isinstance(value, bool) else str(value)]
+                )
+            statuses = self.driver.execute_script(FILL_FORM_JS, payload)
+
+        methods = {}
+        for locator, status in zip(scripted, statuses):
+            if status == "ok":
+                methods[locator] = "script"
+            else:
+                self.logger.debug("脚本填写未生效（%s），改用键盘输入: %s", status, locator)
+        # 键盘输入的字段与脚本未生效的字段按原顺序逐个输入（会等待元素出现）
+        for locator, value in fields.items():
+            if locator in methods:
+                continue
+            if isinstance(value, bool):
+                element = self.find_element(locator)
+                if element.is_selected() != value:
+                    element.click()
+            else:
+                self.input_text(locator, value)
+            methods[locator] = "keys"
+        return methods
+
+    def paste_text(self, locator, text):
+        """
+        把大段文本一次性写入输入框或富文本编辑器（替代逐字符send_keys）
+        富文本优先交给编辑器的paste处理，否则用insertText插入，都会触发input事件
+        """
+        self.logger.log_action("粘贴文本", locator, f"长度: {len(text)}")
+        element = self.find_element(locator)
+        status = self.driver.execute_script(FILL_ELEMENT_JS, element, text)
+        if status != "ok":
+            self.logger.debug("粘贴未生效（%s），改用键盘输入: %s", status, locator)
+            element.clear()
+            element.send_keys(text)
+        self.logger.debug("文本粘贴完成: %s", locator)
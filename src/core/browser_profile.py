@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  browser_profile.py
+@Time    :  2026/10/16 16:35:12
+@Author  :  owl
+@Desp    :  浏览器配置模板：预热的user-data-dir + 性能参数组 + headless shell
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from configs.path import CACHE_DIR
+
+from .logger import logger
+
+# 性能参数组（仅Chromium内核）
+PERFORMANCE_FLAGS = {
+    "default": [],
+    "fast": [
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-domain-reliability",
+        "--disable-client-side-phishing-detection",
+        "--disable-features=Translate,OptimizationHints,MediaRouter",
+        "--metrics-recording-only",
+        "--password-store=basic",
+    ],
+    "ci": [
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-domain-reliability",
+        "--disable-client-side-phishing-detection",
+        "--disable-features=Translate,OptimizationHints,MediaRouter",
+        "--metrics-recording-only",
+        "--password-store=basic",
+        "--disable-renderer-backgrounding",
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--mute-audio",
+    ],
+}
+
+# Linux FICLONE ioctl（btrfs/xfs等支持写时复制的文件系统）
+_FICLONE = 0x40049409
+
+PROFILES_DIR = CACHE_DIR / "profiles"
+
+# 超过该时间（秒）的模板与克隆视为以前运行的残留
+_STALE_AFTER = 6 * 3600
+
+
+def performance_flags(name):
+    """获取指定名称的性能参数组"""
+    if name not in PERFORMANCE_FLAGS:
+        raise ValueError(f"不支持的性能参数组: {name}")
+    return list(PERFORMANCE_FLAGS[name])
+
+
+def find_headless_shell():
+    """查找本地的chrome-headless-shell（PATH或Selenium Manager缓存目录）"""
+    executable = "chrome-headless-shell.exe" if sys.platform == "win32" else "chrome-headless-shell"
+    found = shutil.which(executable)
+    if found:
+        return found
+    selenium_cache = Path.home() / ".cache" / "selenium" / "chrome-headless-shell"
+    if selenium_cache.is_dir():
+        candidates = sorted(selenium_cache.rglob(executable), reverse=True)
+        if candidates:
+            return str(candidates[0])
+    return None
+
+
+class ProfileTemplate:
+    """
+    预热的浏览器配置模板
+
+    每次运行只构建一次模板（xdist多个worker之间用锁文件协调）：启动浏览器访问
+    base_url，把首次运行的初始化和静态资源HTTP缓存留在模板目录中。之后每个会话
+    克隆一份模板，优先写时复制（reflink），不支持时完整复制。不使用硬链接：
+    Chrome的缓存后端会原地改写缓存条目文件，硬链接会让并行会话与模板互相写坏。
+    构建失败时写入失败标记，其他worker不必等到超时。
+    """
+
+    def __init__(self, browser_type, run_id=None, warm_timeout=60):
+        """
+        :param browser_type: chrome 或 edge
+        :param run_id: 运行ID，同一次运行的所有worker共享一个模板（默认取xdist的运行ID）
+        :param warm_timeout: 等待其他worker构建模板的超时时间（秒）
+        """
+        self.browser_type = browser_type
+        self.run_id = run_id or os.getenv("PYTEST_XDIST_TESTRUNUID") or str(os.getpid())
+        self.name = f"{browser_type}-{self.run_id}"
+        self.template_dir = PROFILES_DIR / f"template-{self.name}"
+        self.warm_timeout = warm_timeout
+        self._ready_file = self.template_dir / ".ready"
+        self._failed_file = PROFILES_DIR / f"template-{self.name}.failed"
+        self._lock_file = PROFILES_DIR / f"template-{self.name}.lock"
+        self._lock = threading.Lock()
+        self._clones = []
+        self._reflink_supported = sys.platform.startswith("linux")
+        self.available = None
+
+    def ensure(self, warm):
+        """
+        确保模板可用
+        :param warm: 预热回调，参数为模板目录（启动浏览器并访问页面）
+        :return: 模板是否可用
+        """
+        with self._lock:
+            if self.available is not None:
+                return self.available
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+            try:
+                fd = os.open(self._lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                # 其他worker正在构建，等待其完成
+                self.available = self._wait_ready()
+                return self.available
+            os.close(fd)
+            self._prune_stale()
+            start = time.perf_counter()
+            try:
+                warm(self.template_dir)
+                self._ready_file.touch()
+                self.available = True
+                logger.info(
+                    "浏览器配置模板已预热: %s，耗时 %.2fs",
+                    self.template_dir,
+                    time.perf_counter() - start,
+                )
+            except Exception as e:
+                logger.warning("浏览器配置模板预热失败，使用空白配置: %s", e)
+                # 通知等待中的worker不再等待
+                self._failed_file.touch()
+                self.available = False
+            return self.available
+
+    def clone(self):
+        """克隆一份模板作为新会话的user-data-dir"""
+        target = PROFILES_DIR / f"session-{self.name}-{uuid.uuid4().hex[:8]}"
+        start = time.perf_counter()
+        shutil.copytree(
+            self.template_dir,
+            target,
+            copy_function=self._clone_file,
+            ignore=shutil.ignore_patterns(
+                ".ready", "Singleton*", "*.lock", "lockfile", "LOCK"
+            ),
+        )
+        with self._lock:
+            self._clones.append(target)
+        logger.debug("克隆浏览器配置: %s，耗时 %.3fs", target, time.perf_counter() - start)
+        return target
+
+    def cleanup(self):
+        """删除本进程的克隆目录（模板由构建它的进程删除）"""
+        with self._lock:
+            clones, self._clones = self._clones, []
+        for clone in clones:
+            shutil.rmtree(clone, ignore_errors=True)
+        if self._lock_file.exists() and self._owns_template():
+            shutil.rmtree(self.template_dir, ignore_errors=True)
+            self._failed_file.unlink(missing_ok=True)
+            self._lock_file.unlink(missing_ok=True)
+
+    def _owns_template(self):
+        # 非xdist运行时每个进程独占模板；xdist下模板随运行ID保留，由下次运行覆盖
+        return not os.getenv("PYTEST_XDIST_TESTRUNUID")
+
+    def _prune_stale(self):
+        """删除以前运行残留的模板与克隆（异常退出或xdist运行保留的）"""
+        deadline = time.time() - _STALE_AFTER
+        for entry in PROFILES_DIR.iterdir():
+            if self.name in entry.name:
+                continue
+            try:
+                if entry.stat().st_mtime >= deadline:
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+                else:
+                    entry.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + self.warm_timeout
+        while time.monotonic() < deadline:
+            if self._ready_file.exists():
+                return True
+            if self._failed_file.exists():
+                logger.warning("其他worker预热浏览器配置模板失败，使用空白配置")
+                return False
+            time.sleep(0.2)
+        logger.warning("等待浏览器配置模板超时，使用空白配置")
+        return False
+
+    def _clone_file(self, src, dst):
+        """写时复制克隆文件，文件系统不支持时退化为普通复制"""
+        if self._reflink_supported:
+            try:
+                import fcntl
+
+                with open(src, "rb") as s, open(dst, "wb") as d:
+                    fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+                shutil.copystat(src, dst)
+                return dst
+            except OSError:
+                self._reflink_supported = False
+                Path(dst).unlink(missing_ok=True)
+        return shutil.copy2(src, dst)
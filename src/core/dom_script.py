@@ -0,0 +1,473 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  dom_script.py
+@Time    :  2026/10/16 18:40:31
+@Author  :  owl
+@Desp    :  注入脚本：在浏览器内按定位器批量解析元素，一次命令完成多次读写
+"""
+
+from selenium.webdriver.common.by import By
+
+# 浏览器内的元素查找函数，支持selenium全部定位方式
+FIND_ELEMENTS_JS = r"""
+function __findAll(by, value, root) {
+    root = root || document;
+    switch (by) {
+        case 'id':
+            return Array.from(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'name':
+            return Array.from(root.querySelectorAll('[name="' + value.replace(/(["\\])/g, '\\$1') + '"]'));
+        case 'class name':
+            return Array.from(root.querySelectorAll('.' + CSS.escape(value)));
+        case 'tag name':
+        case 'css selector':
+            return Array.from(root.querySelectorAll(value));
+        case 'xpath': {
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                var node = snapshot.snapshotItem(i);
+                if (node.nodeType === 1) nodes.push(node);
+            }
+            return nodes;
+        }
+        case 'link text':
+            return Array.from(root.querySelectorAll('a')).filter(function (a) {
+                return a.innerText.trim() === value;
+            });
+        case 'partial link text':
+            return Array.from(root.querySelectorAll('a')).filter(function (a) {
+                return a.innerText.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('不支持的定位方式: ' + by);
+}
+function __isDisplayed(el) {
+    if (typeof el.checkVisibility === 'function') {
+        return el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true});
+    }
+    var style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+}
+"""
+
+# 批量读取：arguments[0] 为 [[名称, by, value, 属性, 参数], ...]
+READ_MANY_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var result = {}, missing = [];
+arguments[0].forEach(function (field) {
+    var name = field[0], prop = field[3], arg = field[4];
+    var els = __findAll(field[1], field[2]);
+    if (prop === 'count') { result[name] = els.length; return; }
+    if (prop === 'texts') {
+        result[name] = els.map(function (el) { return el.innerText.trim(); });
+        return;
+    }
+    var el = els[0];
+    if (!el) { result[name] = null; missing.push(name); return; }
+    switch (prop) {
+        case 'text': result[name] = el.innerText.trim(); break;
+        case 'value': result[name] = el.value === undefined ? null : el.value; break;
+        case 'attribute': result[name] = el.getAttribute(arg); break;
+        case 'displayed': result[name] = __isDisplayed(el); break;
+        case 'rect': {
+            var r = el.getBoundingClientRect();
+            result[name] = {x: r.left + window.scrollX, y: r.top + window.scrollY,
+                            width: r.width, height: r.height};
+            break;
+        }
+        default: throw new Error('不支持的属性: ' + prop);
+    }
+});
+return {values: result, missing: missing};
+"""
+)
+
+# 粘贴文本到可编辑区域：编辑器处理了paste事件就交给编辑器，否则用insertText（会触发input事件）
+PASTE_FN_JS = r"""
+function __paste(el, text) {
+    el.focus();
+    var range = document.createRange();
+    range.selectNodeContents(el);
+    var selection = window.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+    var data = new DataTransfer();
+    data.setData('text/plain', text);
+    var event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+    if (!el.dispatchEvent(event)) return 'ok';
+    if (document.execCommand('insertText', false, text)) return 'ok';
+    el.textContent = text;
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    return 'ok';
+}
+"""
+
+# 填写单个元素：通过原生value setter赋值，再派发input/change事件，前端框架才能感知变化
+FILL_FN_JS = r"""
+function __fill(el, value) {
+    if (el.disabled || el.readOnly) return 'readonly';
+    if (el.isContentEditable) return __paste(el, String(value));
+    var tag = el.tagName.toLowerCase();
+    if (tag === 'input' && (el.type === 'checkbox' || el.type === 'radio')) {
+        var checked = value === true || value === 'true' || value === el.value;
+        // click会原生触发input/change事件
+        if (el.checked !== checked) el.click();
+        return 'ok';
+    }
+    if (tag === 'input' || tag === 'textarea') {
+        var proto = tag === 'input' ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+        el.focus();
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, String(value));
+    } else if (tag === 'select') {
+        el.value = String(value);
+        if (el.value !== String(value)) return 'no-option';
+    } else {
+        return 'unsupported';
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return 'ok';
+}
+"""
+
+# 填写已定位的元素：arguments[0] 为元素，arguments[1] 为内容
+FILL_ELEMENT_JS = PASTE_FN_JS + FILL_FN_JS + "return __fill(arguments[0], arguments[1]);"
+
+# 批量填写：arguments[0] 为 [[by, value, 内容], ...]，返回每个字段的状态
+FILL_FORM_JS = (
+    FIND_ELEMENTS_JS
+    + PASTE_FN_JS
+    + FILL_FN_JS
+    + r"""
+return arguments[0].map(function (field) {
+    var el = __findAll(field[0], field[1])[0];
+    return el ? __fill(el, field[2]) : 'missing';
+});
+"""
+)
+
+# 零等待探测：arguments[0], arguments[1] 为 by, value；返回匹配数量与可见的数量
+PROBE_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var els = __findAll(arguments[0], arguments[1]);
+return {count: els.length, displayed: els.filter(__isDisplayed).length};
+"""
+)
+
+# 界面稳定检测（execute_async_script）：arguments[0] 为选项，arguments[1] 为关注的元素（可为null）
+# 每帧采样滚动位置、元素位置尺寸、未完成的有限动画与元素可见性，连续若干帧不变即视为稳定
+SETTLE_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var opts = arguments[0], el = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), last = null, stable = 0;
+// 后台标签页不触发requestAnimationFrame，退化为定时器
+var schedule = document.hidden
+    ? function (f) { setTimeout(f, 16); }
+    : function (f) { requestAnimationFrame(f); };
+function snapshot() {
+    var parts = opts.scroll ? [window.scrollX, window.scrollY] : [];
+    if (el && opts.layout) {
+        var r = el.getBoundingClientRect();
+        parts.push(r.x, r.y, r.width, r.height);
+    }
+    return parts.join(',');
+}
+function animating() {
+    if (!opts.animations || !document.getAnimations) return false;
+    return document.getAnimations().some(function (a) {
+        if (a.playState !== 'running') return false;
+        // 无限循环的动画（如加载图标）不会结束，不参与判断
+        var timing = a.effect && a.effect.getComputedTiming ? a.effect.getComputedTiming() : {};
+        return timing.iterations !== Infinity;
+    });
+}
+function tick() {
+    var elapsed = performance.now() - start;
+    var current = snapshot();
+    var quiet = current === last && !animating() && (!opts.visible || !el || __isDisplayed(el));
+    stable = quiet ? stable + 1 : 0;
+    last = current;
+    if (stable >= opts.frames) return done({settled: true, elapsed: elapsed});
+    if (elapsed >= opts.max_ms) return done({settled: false, elapsed: elapsed});
+    schedule(tick);
+}
+schedule(tick);
+"""
+)
+
+# 网络请求计数：包装fetch与XMLHttpRequest，记录进行中的请求数与最后一次变化的时间
+NETWORK_SHIM_FN_JS = r"""
+function __installNetShim() {
+    if (window.__waNet) return window.__waNet;
+    var net = window.__waNet = {inflight: 0, last: performance.now()};
+    function begin() { net.inflight++; net.last = performance.now(); }
+    function end() { net.inflight = Math.max(net.inflight - 1, 0); net.last = performance.now(); }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return fetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; }
+            );
+        };
+    }
+    if (window.XMLHttpRequest) {
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            begin();
+            this.addEventListener('loadend', end, {once: true});
+            try {
+                return send.apply(this, arguments);
+            } catch (e) {
+                end();
+                throw e;
+            }
+        };
+    }
+    return net;
+}
+"""
+
+# 通过CDP在每个新文档的脚本执行前注入
+NETWORK_SHIM_JS = NETWORK_SHIM_FN_JS + "__installNetShim();"
+
+# 页面就绪条件：__pending(条件列表) 返回尚未满足的条件名
+# 条件: {type: 'dom', state} / {type: 'network_idle', idle_ms} / {type: 'selector', by, value, visible}
+# 网络计数没有预先注入时当场注入，之前发出的请求无法统计，从注入时刻起计算空闲时间
+READY_FN_JS = (
+    NETWORK_SHIM_FN_JS
+    + r"""
+function __pending(preds) {
+    return preds.filter(function (p) {
+        switch (p.type) {
+            case 'dom':
+                return p.state === 'complete'
+                    ? document.readyState !== 'complete'
+                    : document.readyState === 'loading';
+            case 'network_idle': {
+                var net = __installNetShim();
+                return net.inflight > 0 || performance.now() - net.last < p.idle_ms;
+            }
+            case 'selector': {
+                var el = __findAll(p.by, p.value)[0];
+                return !el || (p.visible && !__isDisplayed(el));
+            }
+        }
+        throw new Error('不支持的就绪条件: ' + p.type);
+    }).map(function (p) { return p.name; });
+}
+"""
+)
+
+# 立即检查就绪条件：arguments[0] 为条件列表，返回未满足的条件名
+READY_CHECK_JS = FIND_ELEMENTS_JS + READY_FN_JS + "return __pending(arguments[0]);"
+
+# 浏览器内等待（execute_async_script）：arguments[0] 为 {type, by, value, expected, max_ms}
+# DOM变化（MutationObserver）与每一帧（requestAnimationFrame）都重新判断，条件满足立即返回；
+# 元素条件与selenium的expected_conditions一致，只看第一个匹配的元素；ready 的期望值为就绪条件列表
+# 开始时在document上留下标记，脚本报错后据此区分页面跳转与脚本自身的错误
+WAIT_FOR_JS = (
+    FIND_ELEMENTS_JS
+    + READY_FN_JS
+    + r"""
+document.__waWaiting = true;
+var cond = arguments[0], done = arguments[arguments.length - 1];
+var start = performance.now(), finished = false, observer = null;
+var schedule = document.hidden
+    ? function (f) { setTimeout(f, 50); }
+    : function (f) { requestAnimationFrame(f); };
+function evaluate() {
+    if (cond.type === 'title_is') return document.title === cond.expected;
+    if (cond.type === 'title_contains') return document.title.indexOf(cond.expected) !== -1;
+    if (cond.type === 'ready') return __pending(cond.expected).length === 0;
+    var els = __findAll(cond.by, cond.value), el = els[0];
+    switch (cond.type) {
+        case 'presence': return el || null;
+        case 'presence_all': return els.length ? els : null;
+        case 'visible': return el && __isDisplayed(el) ? el : null;
+        case 'clickable': return el && __isDisplayed(el) && !el.disabled ? el : null;
+        case 'text': return el && el.innerText.indexOf(cond.expected) !== -1;
+        case 'count': return els.length === cond.expected ? els : null;
+    }
+    throw new Error('不支持的等待条件: ' + cond.type);
+}
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    done(result);
+}
+function check() {
+    if (finished) return;
+    try {
+        var value = evaluate();
+        if (value) return finish({ok: true, value: value});
+    } catch (e) {
+        return finish({ok: false, error: String(e.message || e)});
+    }
+    if (performance.now() - start >= cond.max_ms) finish({ok: false});
+}
+function frame() {
+    check();
+    if (!finished) schedule(frame);
+}
+observer = new MutationObserver(check);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+frame();
+"""
+)
+
+# 当前文档是否运行过浏览器内等待（没有标记说明已跳转到新文档）
+WAIT_MARKER_JS = "return document.__waWaiting === true;"
+
+# 支持的等待条件（元素条件需要定位器，text/count/title_*/ready 需要期望值）
+WAIT_CONDITIONS = {
+    "presence",
+    "presence_all",
+    "visible",
+    "clickable",
+    "text",
+    "count",
+    "title_is",
+    "title_contains",
+    "ready",
+}
+
+# 批量检查定位器：arguments[0] 为 [[名称, by, value], ...]
+# 返回 {名称: {count, displayed}}，选择器无效时为 {error}
+CHECK_LOCATORS_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var result = {};
+arguments[0].forEach(function (item) {
+    try {
+        var els = __findAll(item[1], item[2]);
+        result[item[0]] = {count: els.length, displayed: els.filter(__isDisplayed).length};
+    } catch (e) {
+        result[item[0]] = {error: String(e.message || e)};
+    }
+});
+return result;
+"""
+)
+
+# 定位器候选：arguments[0] 为 [by, value]，arguments[1] 为锚点路径的最大层数
+# 为原定位器匹配到的元素生成ID、name、属性、类、锚定ID祖先的短CSS等候选，
+# 只返回匹配结果与原定位器完全相同（同样的元素、同样的顺序）的候选
+LOCATOR_CANDIDATES_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var targets = __findAll(arguments[0][0], arguments[0][1]), maxDepth = arguments[1];
+if (!targets.length) return {count: 0, candidates: []};
+var first = targets[0], tag = first.tagName.toLowerCase(), single = targets.length === 1;
+var candidates = [], seen = {};
+// 自动生成的ID/类名（长数字、哈希、框架前缀）不稳定，不作为候选
+function stable(token) {
+    return !!token && !/\d{3,}|[0-9a-f]{8,}|^(ember|react|ng-|mui-|css-|jsx-|sc-|v-)/i.test(token);
+}
+function quote(value) { return '"' + value.replace(/(["\\])/g, '\\$1') + '"'; }
+function sameAll(attr, value) {
+    return targets.every(function (el) { return el.getAttribute(attr) === value; });
+}
+function verify(strategy, by, value) {
+    var key = by + '|' + value;
+    if (seen[key]) return;
+    seen[key] = true;
+    var els;
+    try { els = __findAll(by, value); } catch (e) { return; }
+    if (els.length !== targets.length) return;
+    for (var i = 0; i < els.length; i++) if (els[i] !== targets[i]) return;
+    candidates.push({strategy: strategy, by: by, value: value});
+}
+if (single && stable(first.id)) verify('id', 'id', first.id);
+var name = first.getAttribute('name');
+if (stable(name) && sameAll('name', name)) verify('name', 'name', name);
+['data-testid', 'data-test', 'data-qa', 'aria-label', 'placeholder', 'title', 'type', 'href']
+    .forEach(function (attr) {
+        var value = first.getAttribute(attr);
+        if (value && value.length <= 60 && sameAll(attr, value)) {
+            verify('attribute', 'css selector', tag + '[' + attr + '=' + quote(value) + ']');
+        }
+    });
+var classes = Array.from(first.classList).filter(function (c) {
+    return stable(c) && targets.every(function (el) { return el.classList.contains(c); });
+});
+classes.forEach(function (c) { verify('class', 'css selector', tag + '.' + CSS.escape(c)); });
+for (var i = 0; i < classes.length; i++) {
+    for (var j = i + 1; j < classes.length; j++) {
+        verify('class', 'css selector', tag + '.' + CSS.escape(classes[i]) + '.' + CSS.escape(classes[j]));
+    }
+}
+// 锚定到最近的有稳定ID的祖先：先试后代选择器，再试逐层子选择器（必要时加 :nth-of-type）
+if (single) {
+    var steps = [], el = first, anchor = null;
+    while (el.parentElement && steps.length < maxDepth) {
+        var step = el.tagName.toLowerCase(), parent = el.parentElement;
+        var sameTag = Array.from(parent.children).filter(function (c) { return c.tagName === el.tagName; });
+        if (sameTag.length > 1) step += ':nth-of-type(' + (sameTag.indexOf(el) + 1) + ')';
+        steps.unshift(step);
+        el = parent;
+        if (stable(el.id) && document.querySelectorAll('#' + CSS.escape(el.id)).length === 1) {
+            anchor = '#' + CSS.escape(el.id);
+            break;
+        }
+    }
+    if (anchor) {
+        verify('anchored', 'css selector', anchor + ' ' + tag);
+        classes.forEach(function (c) { verify('anchored', 'css selector', anchor + ' ' + tag + '.' + CSS.escape(c)); });
+        verify('anchored', 'css selector', anchor + ' > ' + steps.join(' > '));
+    }
+}
+return {count: targets.length, candidates: candidates};
+"""
+)
+
+# 定位耗时：arguments[0] 为 [[by, value], ...]，arguments[1] 为每个定位器的查找次数
+# 在浏览器内重复查找并计时（不含WebDriver命令往返），返回每次查找的微秒数
+LOCATOR_BENCH_JS = (
+    FIND_ELEMENTS_JS
+    + r"""
+var iterations = arguments[1];
+return arguments[0].map(function (locator) {
+    var by = locator[0], value = locator[1], i;
+    try {
+        for (i = 0; i < 5; i++) __findAll(by, value);
+        var start = performance.now();
+        for (i = 0; i < iterations; i++) __findAll(by, value);
+        return (performance.now() - start) * 1000 / iterations;
+    } catch (e) {
+        return null;
+    }
+});
+"""
+)
+
+# read_many支持的属性
+READ_PROPERTIES = {"text", "texts", "value", "attribute", "displayed", "rect", "count"}
+
+
+def js_locator(locator):
+    """把 (By, 选择器) 定位器转换为注入脚本使用的 [by, value]"""
+    by_type, selector = locator
+    if by_type not in vars(By).values():
+        raise ValueError(f"不支持的定位方式: {by_type}")
+    return [by_type, selector]
+
+
+class ReadResult(dict):
+    """批量读取结果，missing 为元素不存在的字段名"""
+
+    def __init__(self, values, missing=()):
+        super().__init__(values)
+        self.missing = list(missing)
+
+    @property
+    def complete(self):
+        """是否所有字段的元素都存在"""
+        return not self.missing
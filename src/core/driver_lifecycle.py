@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  driver_lifecycle.py
+@Time    :  2026/10/16 10:20:41
+@Author  :  owl
+@Desp    :  浏览器会话的后台预创建与异步回收
+"""
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .logger import logger
+
+
+def _safe_quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error("关闭浏览器时发生错误: %s", e)
+
+
+def _child_pids(pid):
+    """获取子进程PID（优先读取/proc，其次使用pgrep）"""
+    children_file = Path(f"/proc/{pid}/task/{pid}/children")
+    try:
+        return [int(p) for p in children_file.read_text().split()]
+    except (OSError, ValueError):
+        pass
+    try:
+        result = subprocess.run(
+            ["pgrep", "-P", str(pid)], capture_output=True, text=True, timeout=5
+        )
+        return [int(p) for p in result.stdout.split()]
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return []
+
+
+def kill_process_tree(pid):
+    """强制结束进程及其子进程（驱动进程及其拉起的浏览器）"""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True, timeout=10
+        )
+        return
+    for child in _child_pids(pid):
+        kill_process_tree(child)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class DriverReaper:
+    """
+    浏览器会话回收器
+
+    quit()交给后台线程执行，队列有界，队列满时退化为同步关闭；
+    本地驱动的进程会被登记，测试会话结束时仍存活的进程树会被强制结束。
+    """
+
+    def __init__(self, async_quit=True, max_queue=4, quit_timeout=15):
+        self.async_quit = async_quit
+        self.quit_timeout = quit_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._processes = {}  # id(driver) -> subprocess.Popen
+
+    def track(self, driver):
+        """登记本地驱动进程，用于结束时清理孤儿进程"""
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is not None:
+            with self._lock:
+                self._processes[id(driver)] = process
+
+    def submit(self, driver):
+        """提交一个待关闭的会话"""
+        if not self.async_quit:
+            self.quit(driver)
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(driver)
+            logger.info("浏览器会话已交给回收线程关闭")
+        except queue.Full:
+            logger.warning("回收队列已满，同步关闭浏览器")
+            self.quit(driver)
+
+    def quit(self, driver):
+        """带超时地关闭会话，超时的进程留到结束时强制清理"""
+        worker = threading.Thread(
+            target=_safe_quit, args=(driver,), name="driver-quit", daemon=True
+        )
+        worker.start()
+        worker.join(self.quit_timeout)
+        if worker.is_alive():
+            logger.warning("关闭浏览器超时（%ss），结束时强制清理", self.quit_timeout)
+            return
+        with self._lock:
+            self._processes.pop(id(driver), None)
+
+    def shutdown(self, timeout=30):
+        """等待队列中的会话关闭完成，并清理孤儿进程"""
+        if self._thread is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                logger.warning("回收队列未能及时清空")
+            self._thread.join(timeout)
+            self._thread = None
+        self.reap_orphans()
+
+    def reap_orphans(self):
+        """强制结束仍存活的驱动进程树"""
+        with self._lock:
+            processes = list(self._processes.values())
+            self._processes.clear()
+        reaped = 0
+        for process in processes:
+            if process.poll() is None:
+                kill_process_tree(process.pid)
+                reaped += 1
+        if reaped:
+            logger.warning("已清理 %s 个残留的驱动进程", reaped)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="driver-reaper", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            driver = self._queue.get()
+            try:
+                if driver is None:
+                    return
+                self.quit(driver)
+            finally:
+                self._queue.task_done()
+
+
+class DriverPrefetcher:
+    """在后台线程中预创建下一个浏览器会话"""
+
+    def __init__(self, factory):
+        """
+        :param factory: 创建驱动的可调用对象
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> Future
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="driver-prefetch"
+        )
+
+    def prefetch(self, key, *args):
+        """为指定键预创建一个会话（已有在途任务时忽略）"""
+        with self._lock:
+            if key in self._pending:
+                return
+            logger.info("后台预创建浏览器会话: %s", key)
+            self._pending[key] = self._executor.submit(self._factory, *args)
+
+    def take(self, key, timeout=None):
+        """取出预创建的会话，没有或创建失败时返回None"""
+        with self._lock:
+            future = self._pending.pop(key, None)
+        if future is None:
+            return None
+        try:
+            driver = future.result(timeout)
+            logger.info("使用预创建的浏览器会话: %s", key)
+            return driver
+        except Exception as e:
+            logger.warning("预创建浏览器会话失败: %s", e)
+            return None
+
+    def shutdown(self, on_discard, timeout=60):
+        """丢弃尚未使用的预创建会话"""
+        with self._lock:
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            try:
+                on_discard(future.result(timeout))
+            except Exception as e:
+                logger.warning("丢弃预创建会话失败: %s", e)
+        self._executor.shutdown(wait=False)
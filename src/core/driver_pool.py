@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  driver_pool.py
+@Time    :  2026/10/16 09:12:30
+@Author  :  owl
+@Desp    :  浏览器会话池，类之间复用会话，仅重置浏览器状态
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.command import Command
+
+from .logger import logger
+
+# 清理当前源的本地存储与IndexedDB（跨域页面可能抛出SecurityError，忽略即可）
+_CLEAR_STORAGE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+try {
+  indexedDB.databases().then(function (dbs) {
+    return Promise.all(dbs.map(function (db) {
+      return new Promise(function (resolve) {
+        var request = indexedDB.deleteDatabase(db.name);
+        request.onsuccess = request.onerror = request.onblocked = resolve;
+      });
+    }));
+  }).then(function () { done(true); }, function () { done(false); });
+} catch (e) { done(false); }
+"""
+
+
+def url_origin(url):
+    """URL的源（scheme://host:port），非http(s)页面返回None"""
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _quit_driver(driver):
+    """默认的会话丢弃方式：直接退出浏览器"""
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error("关闭浏览器时发生错误: %s", e)
+
+
+class PooledDriver:
+    """会话池中的单个浏览器会话"""
+
+    def __init__(self, driver, key):
+        self.driver = driver
+        self.key = key
+        self.created_at = time.monotonic()
+        self.use_count = 0
+        self.window_size = None
+        # 本次借出期间访问过的源，归还时逐个清理其存储
+        self.origins = set()
+        try:
+            self.window_size = driver.get_window_size()
+        except Exception as e:
+            logger.debug("获取初始窗口尺寸失败: %s", e)
+        self._track_navigation()
+
+    def visit(self, url):
+        """记录访问过的源"""
+        origin = url_origin(url)
+        if origin:
+            self.origins.add(origin)
+
+    def _track_navigation(self):
+        """接管driver.execute，记录每次页面跳转的源（本地解析URL，不增加请求）"""
+        execute = getattr(self.driver, "execute", None)
+        if execute is None:
+            return
+
+        def tracked(driver_command, params=None):
+            if driver_command == Command.GET and params:
+                self.visit(params.get("url"))
+            return execute(driver_command, params)
+
+        self.driver.execute = tracked
+
+    @property
+    def age(self):
+        """会话已存活时间（秒）"""
+        return time.monotonic() - self.created_at
+
+
+class DriverPool:
+    """
+    每个worker进程内的浏览器会话池
+
+    会话在类结束时归还到池中并重置状态（cookies、访问过的各个源的存储、
+    多余标签页、about:blank、窗口尺寸），下一个类直接复用，省去浏览器启动耗时。
+    不支持CDP的会话只能清理当前源的存储，访问过其他源时不再复用。
+    """
+
+    def __init__(
+        self, size=2, max_reuse=20, max_age=600, on_discard=None, probe=None
+    ):
+        """
+        :param size: 每个会话键最多缓存的空闲会话数
+        :param max_reuse: 单个会话最多复用次数，超过后丢弃
+        :param max_age: 单个会话最长存活时间（秒），超过后丢弃
+        :param on_discard: 丢弃会话时的回调，默认直接quit
+        :param probe: 取出会话前的存活探测，返回False时丢弃该会话
+        """
+        self.size = size
+        self.max_reuse = max_reuse
+        self.max_age = max_age
+        self.on_discard = on_discard or _quit_driver
+        self.probe = probe
+        self._lock = threading.Lock()
+        self._idle = {}  # key -> [PooledDriver]
+        self._in_use = {}  # id(driver) -> PooledDriver
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+        self.reset_failures = 0
+        self.reset_time = 0.0
+        self.discarded = 0
+
+    def acquire(self, key):
+        """从池中取出一个可用会话，没有则返回None"""
+        while True:
+            with self._lock:
+                idle = self._idle.get(key, [])
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            if self._is_expired(entry):
+                self._discard(entry, "超过最长存活时间")
+                continue
+            # 空闲期间会话可能已失效（如Grid节点会话超时）
+            if self.probe is not None and not self.probe(entry.driver):
+                self._discard(entry, "会话已失效")
+                continue
+            with self._lock:
+                self.hits += 1
+                self._in_use[id(entry.driver)] = entry
+            logger.info("会话池命中: %s，已复用 %s 次", key, entry.use_count)
+            return entry.driver
+
+        with self._lock:
+            self.misses += 1
+        logger.info("会话池未命中: %s", key)
+        return None
+
+    def register(self, driver, key):
+        """登记一个新创建的会话，归还时才会进入池"""
+        entry = PooledDriver(driver, key)
+        with self._lock:
+            self._in_use[id(driver)] = entry
+        return entry
+
+    def release(self, driver):
+        """
+        归还会话
+        :return: True表示会话已被池接管（复用或丢弃），False表示不属于本池
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            return False
+
+        entry.use_count += 1
+        if entry.use_count >= self.max_reuse:
+            self._discard(entry, f"复用次数达到上限 {self.max_reuse}")
+            return True
+        if self._is_expired(entry):
+            self._discard(entry, "超过最长存活时间")
+            return True
+        with self._lock:
+            full = len(self._idle.get(entry.key, [])) >= self.size
+        if full:
+            self._discard(entry, "会话池已满")
+            return True
+
+        if not self._reset(entry):
+            self._discard(entry, "状态重置失败")
+            return True
+
+        with self._lock:
+            self._idle.setdefault(entry.key, []).append(entry)
+        logger.info("浏览器会话已归还会话池: %s", entry.key)
+        return True
+
+    def will_retire(self, driver):
+        """会话本次归还后是否会被丢弃（用于提前预创建替代会话）"""
+        with self._lock:
+            entry = self._in_use.get(id(driver))
+        if entry is None:
+            return True
+        return entry.use_count + 1 >= self.max_reuse or self._is_expired(entry)
+
+    def idle_count(self, key=None):
+        """空闲会话数量"""
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, []))
+            return sum(len(items) for items in self._idle.values())
+
+    def close(self):
+        """关闭池中所有空闲会话"""
+        with self._lock:
+            entries = [entry for items in self._idle.values() for entry in items]
+            self._idle.clear()
+        for entry in entries:
+            self._discard(entry, "会话池关闭")
+
+    def stats(self):
+        """会话池统计数据"""
+        avg_reset = self.reset_time / self.resets if self.resets else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "resets": self.resets,
+            "reset_failures": self.reset_failures,
+            "reset_time": round(self.reset_time, 3),
+            "avg_reset_time": round(avg_reset, 3),
+            "discarded": self.discarded,
+        }
+
+    def report(self):
+        """会话池统计报告"""
+        s = self.stats()
+        return (
+            f"会话池统计: 命中 {s['hits']} 次，未命中 {s['misses']} 次，"
+            f"重置 {s['resets']} 次（失败 {s['reset_failures']} 次），"
+            f"重置总耗时 {s['reset_time']}s，平均 {s['avg_reset_time']}s，"
+            f"丢弃 {s['discarded']} 个会话"
+        )
+
+    def _is_expired(self, entry):
+        return self.max_age and entry.age >= self.max_age
+
+    def _reset(self, entry):
+        """重置浏览器状态，返回是否成功"""
+        driver = entry.driver
+        start = time.perf_counter()
+        try:
+            # 关闭多余标签页（记录其所在的源），回到第一个标签页
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                entry.visit(driver.current_url)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            current = url_origin(driver.current_url)
+            entry.visit(driver.current_url)
+
+            # 清理cookies和访问过的各个源的存储
+            driver.delete_all_cookies()
+            driver.execute_async_script(_CLEAR_STORAGE_SCRIPT)
+            if not self._clear_origins(driver, entry.origins - {current}):
+                logger.info("无法清理其他源的存储: %s", sorted(entry.origins))
+                self.reset_failures += 1
+                return False
+            entry.origins.clear()
+
+            driver.get("about:blank")
+            if entry.window_size:
+                driver.set_window_size(
+                    entry.window_size["width"], entry.window_size["height"]
+                )
+            return True
+        except Exception as e:
+            logger.warning("会话状态重置失败: %s", e)
+            self.reset_failures += 1
+            return False
+        finally:
+            self.resets += 1
+            self.reset_time += time.perf_counter() - start
+
+    def _clear_origins(self, driver, origins):
+        """
+        通过CDP清理各个源的存储（localStorage、IndexedDB、Cache Storage、Service Worker等）
+        :return: 是否全部清理；不支持CDP时只有没有其他源才算成功
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return not origins
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "all"},
+                )
+            return True
+        except Exception as e:
+            logger.warning("通过CDP清理存储失败: %s", e)
+            return False
+
+    def _discard(self, entry, reason):
+        logger.info("丢弃浏览器会话: %s，原因: %s", entry.key, reason)
+        self.discarded += 1
+        self.on_discard(entry.driver)
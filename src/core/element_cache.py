@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  element_cache.py
+@Time    :  2026/10/16 20:47:14
+@Author  :  owl
+@Desp    :  页面级元素引用缓存：复用已定位的元素，失效时再重新定位
+"""
+
+
+class ElementCache:
+    """
+    元素引用缓存（按定位器）
+
+    取用时不做任何校验，不额外发出命令：缓存的元素一直可信，直到使用时抛出
+    StaleElementReferenceException（节点被移除、页面跳转），由调用方invalidate
+    后重新定位。页面导航、刷新、切换窗口时由页面对象整体清空。
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, locator):
+        """查找缓存的元素，没有时返回None"""
+        element = self._entries.get(locator)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def store(self, locator, element):
+        """缓存新定位到的元素"""
+        self._entries[locator] = element
+
+    def invalidate(self, locator=None):
+        """使指定定位器（不指定时全部）的缓存失效"""
+        if locator is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(locator, None)
@@ -6,6 +6,7 @@
 @Author  :  owl
 @Desp    :
 '''
+import re
 from typing import Tuple
 
 from selenium.webdriver.common.by import By
@@ -133,12 +134,10 @@ class ElementLocator:
         """
         by_type, selector = locator
         if by_type == By.XPATH:
-            return (By.XPATH, f"{selector}/..")
-        elif by_type == By.CSS_SELECTOR:
-            return (By.CSS_SELECTOR, f"{selector} > *")
+            return (By.XPATH, f"{_xpath_base(selector)}/..")
         else:
-            # 其他定位方式转换为XPath获取父元素
-            return (By.XPATH, f"({selector_to_xpath(locator)})/..")
+            # CSS无法选择父元素，与其他定位方式一样转换为XPath（选择器组整体取父元素）
+            return (By.XPATH, f"({_unwrap_xpath(selector_to_xpath(locator))})/..")
 
     @staticmethod
     def get_child_locator(parent_locator: Tuple[str, str], child_locator: Tuple[str, str]) -> Tuple[str, str]:
@@ -156,16 +155,23 @@ class ElementLocator:
         child_by, child_selector = child_locator
 
         if parent_by == By.XPATH and child_by == By.XPATH:
-            return (By.XPATH, f"{parent_selector}{child_selector}")
+            parent_xpath = parent_selector
+            child_paths = _xpath_branches(child_selector)
         elif parent_by == By.CSS_SELECTOR and child_by == By.CSS_SELECTOR:
-            return (By.CSS_SELECTOR, f"{parent_selector} {child_selector}")
+            # 选择器组按分支两两组合
+            parents = _split_selector_group(parent_selector)
+            children = _split_selector_group(child_selector)
+            return (By.CSS_SELECTOR, ", ".join(f"{p} {c}" for p in parents for c in children))
         else:
             # 混合定位方式，统一使用XPath
             parent_xpath = selector_to_xpath(parent_locator)
-            child_xpath = selector_to_xpath(child_locator)
-            if child_xpath.startswith('//'):
-                child_xpath = child_xpath[1:]  # 去掉开头的//
-            return (By.XPATH, f"{parent_xpath}{child_xpath}")
+            child_paths = [
+                path[1:] if path.startswith('//') else path  # 去掉开头的//
+                for path in _xpath_branches(selector_to_xpath(child_locator))
+            ]
+        # 子定位器是并集时，每个分支分别接在父定位器后面
+        base = _xpath_base(parent_xpath)
+        return (By.XPATH, _xpath_union([f"{base}{path}" for path in child_paths]))
 
     @staticmethod
     def get_sibling_locator(locator: Tuple[str, str], sibling_offset: int = 1) -> Tuple[str, str]:
@@ -181,13 +187,14 @@ class ElementLocator:
         """
         by_type, selector = locator
         if by_type == By.XPATH:
+            selector = _xpath_base(selector)
             if sibling_offset >= 0:
                 return (By.XPATH, f"{selector}/following-sibling::*[{sibling_offset}]")
             else:
                 return (By.XPATH, f"{selector}/preceding-sibling::*[{-sibling_offset}]")
         else:
             # 转换为XPath处理
-            xpath = selector_to_xpath(locator)
+            xpath = _xpath_base(selector_to_xpath(locator))
             if sibling_offset >= 0:
                 return (By.XPATH, f"{xpath}/following-sibling::*[{sibling_offset}]")
             else:
@@ -210,26 +217,28 @@ class ElementLocator:
         # 使用format方法格式化选择器
         try:
             formatted_selector = selector.format(*args, **kwargs)
-            logger.debug(f"定位器格式化: {selector} -> {formatted_selector}")
+            logger.debug("定位器格式化: %s -> %s", selector, formatted_selector)
             return (by_type, formatted_selector)
         except (KeyError, IndexError) as e:
-            logger.error(f"定位器格式化失败: {selector}, 错误: {e}")
+            logger.error("定位器格式化失败: %s, 错误: %s", selector, e)
             return locator
 
 
 class DynamicLocator:
     """动态定位器类"""
 
-    def __init__(self, by_type: str, selector_template: str):
+    def __init__(self, by_type: str, selector_template: str, sample=None):
         """
         初始化动态定位器
 
         Args:
             by_type: 定位方式
             selector_template: 选择器模板，可以包含{}
+            sample: 样例参数（元组按位置、字典按名称），供定位器健康检查生成实际定位器
         """
         self.by_type = by_type
         self.selector_template = selector_template
+        self.sample = sample
 
     def format(self, *args, **kwargs) -> Tuple[str, str]:
         """格式化动态定位器"""
@@ -240,8 +249,221 @@ class DynamicLocator:
         """使对象可调用"""
         return self.format(*args, **kwargs)
 
+    def sample_locator(self):
+        """用样例参数格式化的定位器，未设置样例时返回None"""
+        if self.sample is None:
+            return None
+        if isinstance(self.sample, dict):
+            return self.format(**self.sample)
+        if isinstance(self.sample, (tuple, list)):
+            return self.format(*self.sample)
+        return self.format(self.sample)
+
 
 # 工具函数
+def xpath_literal(value: str) -> str:
+    """
+    把字符串转换为XPath字面量（同时包含单双引号时使用concat）
+
+    Args:
+        value: 字符串
+
+    Returns:
+        XPath字面量
+    """
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _class_condition(class_name: str) -> str:
+    """class属性包含完整的类名（不会把 btn 匹配到 btn-primary）"""
+    return _token_condition("class", class_name)
+
+
+def _token_condition(attr: str, token: str) -> str:
+    """以空格分隔的属性值中包含完整的token"""
+    literal = xpath_literal(f" {token} ")
+    return f"contains(concat(' ', normalize-space(@{attr}), ' '), {literal})"
+
+
+# 复合CSS选择器的组成部分（组合符、标签、ID、类、属性、结构伪类）
+_CSS_TOKEN = re.compile(
+    r"""
+    \s*(?P<combinator>[>+~])\s*
+    | (?P<space>\s+)
+    | (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[~^$*|]?=)\s*(?P<val>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+    | :(?P<pseudo>[\w-]+)(?:\(\s*(?P<arg>\d+)\s*\))?
+    """,
+    re.X,
+)
+
+
+def _attribute_condition(attr: str, op: str, value: str) -> str:
+    if not op:
+        return f"@{attr}"
+    if value[:1] in "'\"" and value[-1:] == value[:1]:
+        value = value[1:-1]
+    literal = xpath_literal(value)
+    if op == "=":
+        return f"@{attr}={literal}"
+    if op == "~=":
+        return _token_condition(attr, value)
+    if op == "^=":
+        return f"starts-with(@{attr}, {literal})"
+    if op == "$=":
+        start = f"string-length(@{attr}) - {len(value) - 1}"
+        return f"substring(@{attr}, {start})={literal}"
+    if op == "*=":
+        return f"contains(@{attr}, {literal})"
+    # |=：等于该值或以“值-”开头
+    return f"(@{attr}={literal} or starts-with(@{attr}, {xpath_literal(value + '-')}))"
+
+
+def _pseudo_condition(pseudo: str, arg, tag: str, selector: str) -> str:
+    if pseudo in ("first-child", "last-child", "only-child"):
+        before, after = "not(preceding-sibling::*)", "not(following-sibling::*)"
+        if pseudo == "first-child":
+            return before
+        return after if pseudo == "last-child" else f"{before} and {after}"
+    if pseudo == "nth-child" and arg:
+        return f"count(preceding-sibling::*)={int(arg) - 1}"
+    if pseudo in ("nth-of-type", "first-of-type", "last-of-type") and tag != "*":
+        if pseudo == "last-of-type":
+            return f"not(following-sibling::{tag})"
+        index = int(arg) if pseudo == "nth-of-type" and arg else 1
+        return f"count(preceding-sibling::{tag})={index - 1}"
+    raise ValueError(f"无法转换为XPath的CSS选择器: {selector}（不支持 :{pseudo}）")
+
+
+def _split_selector_group(selector: str, separator: str = ","):
+    """按顶层逗号拆分选择器组（忽略属性值和括号中的逗号）；separator为 | 时拆分XPath并集"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(selector):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(selector[start:i])
+            start = i + 1
+    parts.append(selector[start:])
+    return [part.strip() for part in parts]
+
+
+def _unwrap_xpath(xpath: str) -> str:
+    """去掉包住整个表达式的括号：(//a | //b) -> //a | //b，(//a)[1] 保持不变"""
+    xpath = xpath.strip()
+    if not (xpath.startswith("(") and xpath.endswith(")")):
+        return xpath
+    depth, quote = 0, None
+    for char in xpath[:-1]:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                # 第一个括号在末尾之前已闭合
+                return xpath
+    return _unwrap_xpath(xpath[1:-1])
+
+
+def _xpath_branches(xpath: str):
+    """拆分XPath并集的各个分支"""
+    return _split_selector_group(_unwrap_xpath(xpath), "|")
+
+
+def _xpath_union(paths) -> str:
+    """合并为XPath并集，多个分支时加括号，后面可以继续接路径"""
+    if len(paths) == 1:
+        return paths[0]
+    return f"({' | '.join(paths)})"
+
+
+def _xpath_base(xpath: str) -> str:
+    """作为路径起点的XPath：顶层并集加括号，接上的步骤才会作用于所有分支"""
+    return _xpath_union(_xpath_branches(xpath))
+
+
+def css_to_xpath(selector: str) -> str:
+    """
+    把CSS选择器转换为等价的XPath
+
+    支持标签、ID、类（可多个，按完整类名匹配）、属性选择器、
+    后代/子/相邻/兄弟组合符、:first-child 等结构伪类以及逗号分组
+
+    Args:
+        selector: CSS选择器
+
+    Returns:
+        XPath字符串
+
+    Raises:
+        ValueError: 选择器包含无法转换的部分（如 :hover、:not()）
+    """
+    paths = []
+    for part in _split_selector_group(selector):
+        path, axis, pos = "", "//", 0
+        step_tag, conditions = None, []
+
+        def close_step():
+            tag = step_tag or "*"
+            conds = "".join(f"[{c}]" for c in conditions)
+            if axis == "+":
+                self_test = f"[self::{tag}]" if tag != "*" else ""
+                return f"/following-sibling::*[1]{self_test}{conds}"
+            if axis == "~":
+                return f"/following-sibling::{tag}{conds}"
+            return f"{axis}{tag}{conds}"
+
+        while pos < len(part):
+            match = _CSS_TOKEN.match(part, pos)
+            if not match or match.end() == pos:
+                raise ValueError(f"无法转换为XPath的CSS选择器: {selector}")
+            pos = match.end()
+            if match["combinator"] or match["space"]:
+                if step_tag is None and not conditions:
+                    raise ValueError(f"无法转换为XPath的CSS选择器: {selector}")
+                path += close_step()
+                axis = {">": "/", "+": "+", "~": "~"}.get(match["combinator"], "//")
+                step_tag, conditions = None, []
+            elif match["tag"]:
+                step_tag = match["tag"].lower() if match["tag"] != "*" else "*"
+            elif match["id"]:
+                conditions.append(f"@id={xpath_literal(match['id'])}")
+            elif match["cls"]:
+                conditions.append(_class_condition(match["cls"]))
+            elif match["attr"]:
+                conditions.append(
+                    _attribute_condition(match["attr"], match["op"], match["val"] or "")
+                )
+            else:
+                pseudo, arg = match["pseudo"], match["arg"]
+                conditions.append(
+                    _pseudo_condition(pseudo, arg, step_tag or "*", selector)
+                )
+        if step_tag is None and not conditions:
+            raise ValueError(f"无法转换为XPath的CSS选择器: {selector}")
+        paths.append(path + close_step())
+    # 选择器组加括号，get_parent_locator等接上的步骤作用于所有分支
+    return _xpath_union(paths)
+
+
 def selector_to_xpath(locator: Tuple[str, str]) -> str:
     """
     将各种定位器转换为XPath
@@ -251,36 +473,27 @@ def selector_to_xpath(locator: Tuple[str, str]) -> str:
 
     Returns:
         XPath字符串
+
+    Raises:
+        ValueError: CSS选择器无法转换时
     """
     by_type, selector = locator
 
     if by_type == By.ID:
-        return f"//*[@id='{selector}']"
+        return f"//*[@id={xpath_literal(selector)}]"
     elif by_type == By.NAME:
-        return f"//*[@name='{selector}']"
+        return f"//*[@name={xpath_literal(selector)}]"
     elif by_type == By.CLASS_NAME:
-        # 注意：class可能有多个，用contains
-        return f"//*[contains(@class, '{selector}')]"
+        # class可能有多个，按完整类名匹配
+        return f"//*[{_class_condition(selector)}]"
     elif by_type == By.TAG_NAME:
         return f"//{selector}"
     elif by_type == By.LINK_TEXT:
-        return f"//a[text()='{selector}']"
+        return f"//a[normalize-space(.)={xpath_literal(selector.strip())}]"
     elif by_type == By.PARTIAL_LINK_TEXT:
-        return f"//a[contains(text(), '{selector}')]"
+        return f"//a[contains(., {xpath_literal(selector)})]"
     elif by_type == By.CSS_SELECTOR:
-        # 简单转换，复杂的CSS选择器转换可能需要更复杂的逻辑
-        # 这里只处理简单情况
-        if selector.startswith('.'):
-            # 类选择器
-            class_name = selector[1:]
-            return f"//*[contains(@class, '{class_name}')]"
-        elif selector.startswith('#'):
-            # ID选择器
-            element_id = selector[1:]
-            return f"//*[@id='{element_id}']"
-        else:
-            # 其他情况，直接作为标签名处理
-            return f"//{selector}"
+        return css_to_xpath(selector)
     elif by_type == By.XPATH:
         return selector
     else:
@@ -306,7 +519,7 @@ def locate_element_by_text(driver, text: str, element_type: str = "*", exact: bo
     else:
         xpath = locator.build_xpath_with_text(element_type, text, partial=True)
 
-    logger.info(f"通过文本定位: {text}, 元素类型: {element_type}, 精确: {exact}")
+    logger.info("通过文本定位: %s, 元素类型: %s, 精确: %s", text, element_type, exact)
     return (By.XPATH, xpath)
 
 # 常用定位器快捷方式
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  grid_admission.py
+@Time    :  2026/10/16 11:05:17
+@Author  :  owl
+@Desp    :  Selenium Grid容量感知的会话准入控制
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from .logger import logger
+
+# 配置中的浏览器类型与Grid stereotype中browserName的对应关系
+_GRID_BROWSER_NAMES = {
+    "chrome": "chrome",
+    "firefox": "firefox",
+    "edge": "microsoftedge",
+}
+
+# 可以重试的会话创建异常（Grid队列超时、连接中断等）
+_RETRYABLE_ERRORS = (
+    SessionNotCreatedException,
+    TimeoutException,
+    ConnectionError,
+    TimeoutError,
+    Urllib3HTTPError,
+)
+
+
+class GridAdmissionController:
+    """
+    Grid会话准入控制器
+
+    创建会话前读取Hub的 /status 槽位信息，本进程内同时发起的会话请求数
+    不超过对应浏览器的空闲槽位数；没有空闲槽位或Grid排队超时时按带抖动的
+    指数退避重试，并记录每个会话的排队耗时。
+    """
+
+    def __init__(
+        self, grid_url, max_wait=300, base_delay=0.5, max_delay=10, status_timeout=5
+    ):
+        """
+        :param grid_url: Grid Hub地址（如 http://localhost:4444/wd/hub）
+        :param max_wait: 等待准入的最长时间（秒）
+        :param base_delay: 退避初始间隔（秒）
+        :param max_delay: 退避最大间隔（秒）
+        :param status_timeout: 查询 /status 的超时时间（秒）
+        """
+        self.status_url = f"{grid_url.rstrip('/')}/status"
+        self.max_wait = max_wait
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.status_timeout = status_timeout
+        self._lock = threading.Lock()
+        self._in_flight = {}  # browser -> 本进程正在创建的会话数
+        self.wait_times = []  # [(browser, 排队耗时, 尝试次数)]
+
+    def free_slots(self):
+        """
+        查询各浏览器的空闲槽位数
+        :return: {browserName: 空闲数}，包含Grid支持的全部浏览器（暂不可用节点上的
+                 浏览器空闲数为0），Hub不可达时返回None
+        """
+        try:
+            with urllib.request.urlopen(
+                self.status_url, timeout=self.status_timeout
+            ) as resp:
+                status = json.loads(resp.read().decode("utf-8"))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.warning("读取Grid状态失败: %s", e)
+            return None
+
+        free = {}
+        for node in status.get("value", {}).get("nodes", []):
+            available = node.get("availability", "UP") == "UP"
+            for slot in node.get("slots", []):
+                browser = slot.get("stereotype", {}).get("browserName", "").lower()
+                free.setdefault(browser, 0)
+                if available and slot.get("session") is None:
+                    free[browser] += 1
+        return free
+
+    def acquire_session(self, browser_type, factory):
+        """
+        在Grid有空闲容量时创建会话
+        :param browser_type: 浏览器类型: chrome, firefox, edge
+        :param factory: 实际创建会话的可调用对象
+        :return: factory的返回值
+        :raises SessionNotCreatedException: Grid中没有任何节点支持该浏览器
+        """
+        browser = _GRID_BROWSER_NAMES.get(browser_type, browser_type)
+        start = time.monotonic()
+        attempt = 0
+        last_error = None
+
+        while True:
+            attempt += 1
+            if self._try_admit(browser):
+                try:
+                    driver = factory()
+                    self._record_wait(browser, time.monotonic() - start, attempt)
+                    return driver
+                except _RETRYABLE_ERRORS as e:
+                    last_error = e
+                    logger.warning("Grid会话创建失败（第%s次），稍后重试: %s", attempt, e)
+                finally:
+                    with self._lock:
+                        self._in_flight[browser] -= 1
+
+            elapsed = time.monotonic() - start
+            if elapsed >= self.max_wait:
+                logger.error("等待Grid空闲槽位超时: %s，已等待 %.1fs", browser, elapsed)
+                if last_error is not None:
+                    raise last_error
+                raise TimeoutException(
+                    f"等待Grid空闲槽位超时: {browser}，已等待 {elapsed:.1f}s"
+                )
+            time.sleep(min(self._backoff(attempt), self.max_wait - elapsed))
+
+    def report(self):
+        """排队耗时统计报告"""
+        if not self.wait_times:
+            return "Grid准入统计: 无会话请求"
+        waits = [wait for _, wait, _ in self.wait_times]
+        retried = sum(1 for _, _, attempts in self.wait_times if attempts > 1)
+        return (
+            f"Grid准入统计: 会话 {len(waits)} 个，重试 {retried} 个，"
+            f"排队总耗时 {sum(waits):.3f}s，最长 {max(waits):.3f}s"
+        )
+
+    def _try_admit(self, browser):
+        """按空闲槽位判断是否放行，放行时占用一个在途名额"""
+        slots = self.free_slots()
+        with self._lock:
+            in_flight = self._in_flight.get(browser, 0)
+            # Hub不可达或未报告槽位时不阻塞，交给Grid自身排队；
+            # 没有任何节点支持该浏览器时等待无意义，直接失败
+            if slots and browser not in slots:
+                raise SessionNotCreatedException(
+                    f"Grid中没有支持 {browser} 的节点，"
+                    f"可用浏览器: {', '.join(sorted(slots))}"
+                )
+            if slots and slots.get(browser, 0) <= in_flight:
+                logger.info(
+                    "Grid无空闲槽位: %s，空闲 %s，本进程在途 %s",
+                    browser,
+                    slots.get(browser, 0),
+                    in_flight,
+                )
+                return False
+            self._in_flight[browser] = in_flight + 1
+            return True
+
+    def _backoff(self, attempt):
+        """带抖动的指数退避间隔"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _record_wait(self, browser, wait, attempts):
+        with self._lock:
+            self.wait_times.append((browser, wait, attempts))
+        logger.info("Grid会话已创建: %s，排队 %.3fs，尝试 %s 次", browser, wait, attempts)
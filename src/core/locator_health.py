@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  locator_health.py
+@Time    :  2026/10/17 15:32:47
+@Author  :  owl
+@Desp    :  定位器健康检查：每个页面一次脚本检查全部定位器，运行用例前发现失效的定位器
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+from .dom_script import CHECK_LOCATORS_JS, js_locator
+from .locator_optimizer import page_locators, unsampled_locators
+
+# 需要处理的结果（其余为 ok / optional / skipped）
+FAILED_STATUSES = ("missing", "error")
+
+
+def locator_groups(page_class):
+    """按所在页面分组的定位器 {路径: {属性名: 定位器}}，没有路径的定位器不参与检查"""
+    groups = {}
+    for attr, locator in page_locators(page_class).items():
+        path = page_class.locator_paths.get(attr, page_class.page_path)
+        if path:
+            groups.setdefault(path, {})[attr] = locator
+    return groups
+
+
+def check_locators(driver, locators):
+    """
+    一次脚本检查多个定位器
+    :param locators: {属性名: 定位器}
+    :return: {属性名: {"count", "displayed"}}，选择器无效时为 {"error"}
+    """
+    payload = [[attr] + js_locator(locator) for attr, locator in locators.items()]
+    return driver.execute_script(CHECK_LOCATORS_JS, payload)
+
+
+def scan_page(driver, page_class, locators, path=""):
+    """检查当前已打开页面上的定位器，返回每个定位器的结果"""
+    try:
+        checked = check_locators(driver, locators)
+    except WebDriverException as e:
+        checked = {attr: {"error": e.msg} for attr in locators}
+    rows = []
+    for attr, locator in locators.items():
+        result = checked.get(attr, {})
+        if "error" in result:
+            status = "error"
+        elif result["count"]:
+            status = "ok"
+        elif attr in page_class.optional_locators:
+            status = "optional"
+        else:
+            status = "missing"
+        rows.append(
+            dict(
+                result,
+                page=page_class.__name__,
+                name=attr,
+                path=path,
+                locator=list(locator),
+                status=status,
+            )
+        )
+    return rows
+
+
+def skipped_rows(page_class):
+    """没有样例参数的动态定位器（无法检查，在报告中列出）"""
+    return [
+        {"page": page_class.__name__, "name": attr, "status": "skipped"}
+        for attr in unsampled_locators(page_class)
+    ]
+
+
+def failures(rows):
+    """需要处理的定位器（不存在或选择器无效）"""
+    return [row for row in rows if row["status"] in FAILED_STATUSES]
+
+
+def format_health(rows, elapsed=None):
+    """把检查结果整理为文本报告"""
+    labels = {
+        "ok": "正常",
+        "optional": "可选",
+        "missing": "未找到",
+        "error": "无效",
+        "skipped": "跳过",
+    }
+    lines = []
+    for row in rows:
+        title = f"{row['page']}.{row['name']}"
+        status = row["status"]
+        if status == "skipped":
+            lines.append(f"[{labels[status]}] {title}（动态定位器没有样例参数）")
+            continue
+        locator = f"{row['locator'][0]}={row['locator'][1]}"
+        if status == "error":
+            detail = row["error"]
+        else:
+            detail = f"匹配 {row['count']} 个，可见 {row['displayed']} 个"
+        lines.append(f"[{labels[status]}] {title} {row['path']} {locator}（{detail}）")
+    summary = f"共 {len(rows)} 个定位器，{len(failures(rows))} 个需要处理"
+    if elapsed is not None:
+        summary += f"，耗时 {elapsed:.2f}s"
+    lines.append(summary)
+    return "\n".join(lines)
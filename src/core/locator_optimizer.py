@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  locator_optimizer.py
+@Time    :  2026/10/17 13:48:20
+@Author  :  owl
+@Desp    :  定位器优化：在真实页面上寻找更快、更稳定的等价定位器，并测量各定位方式的查找耗时
+"""
+
+import importlib
+import inspect
+import pkgutil
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from .dom_script import LOCATOR_BENCH_JS, LOCATOR_CANDIDATES_JS, js_locator
+from .element_locator import DynamicLocator
+from .logger import logger
+
+# 候选的优先级：查找最快、最不易随页面结构变化的在前
+STRATEGY_RANK = {"id": 0, "name": 1, "attribute": 2, "class": 3, "anchored": 4}
+
+LOCATOR_TYPES = set(vars(By).values())
+
+
+def is_locator(value):
+    """是否为 (By, 选择器) 形式的定位器"""
+    return (
+        isinstance(value, tuple)
+        and len(value) == 2
+        and value[0] in LOCATOR_TYPES
+        and isinstance(value[1], str)
+    )
+
+
+def page_locators(page_class):
+    """
+    页面类（含父类）中定义的定位器 {属性名: 定位器}
+    动态定位器按样例参数展开（没有样例的跳过）；
+    同一定位器的别名（如ready_locator）只保留首次定义的名称
+    """
+    locators = {}
+    for klass in reversed(page_class.__mro__):
+        for attr, value in vars(klass).items():
+            if isinstance(value, DynamicLocator):
+                value = value.sample_locator()
+            if is_locator(value) and value not in locators.values():
+                locators[attr] = value
+    return locators
+
+
+def unsampled_locators(page_class):
+    """页面类中没有样例参数、无法检查的动态定位器名称"""
+    return sorted(
+        attr
+        for klass in page_class.__mro__
+        for attr, value in vars(klass).items()
+        if isinstance(value, DynamicLocator) and value.sample is None
+    )
+
+
+def discover_pages(package="src.pages"):
+    """导入页面包下的全部模块，返回其中定义的BasePage子类（按名称排序）"""
+    from .base_page import BasePage
+
+    module = importlib.import_module(package)
+    pages = {}
+    for info in pkgutil.iter_modules(module.__path__, f"{package}."):
+        for _, value in inspect.getmembers(importlib.import_module(info.name)):
+            if (
+                inspect.isclass(value)
+                and issubclass(value, BasePage)
+                and value is not BasePage
+                and value.__module__ == info.name
+            ):
+                pages[value.__name__] = value
+    return [pages[name] for name in sorted(pages)]
+
+
+class LocatorOptimizer:
+    """
+    定位器优化器
+
+    每个定位器一次脚本生成并验证候选（匹配到的元素与原定位器完全一致），
+    再一次脚本在浏览器内测量原定位器和各候选的查找耗时。
+    """
+
+    def __init__(self, driver, iterations=200, max_depth=4, min_gain=0.2):
+        """
+        :param iterations: 每个定位器的查找次数（取平均）
+        :param max_depth: 锚定ID祖先时最多向上的层数
+        :param min_gain: 原定位器不是XPath时，候选至少快多少才建议替换
+        """
+        self.driver = driver
+        self.iterations = iterations
+        self.max_depth = max_depth
+        self.min_gain = min_gain
+
+    def candidates(self, locator):
+        """
+        生成并验证等价候选
+        :return: (原定位器匹配数量, [{"strategy", "by", "value"}, ...])，候选按优先级与长度排序
+        """
+        result = self.driver.execute_script(
+            LOCATOR_CANDIDATES_JS, js_locator(locator), self.max_depth
+        )
+        candidates = [
+            c for c in result["candidates"] if (c["by"], c["value"]) != locator
+        ]
+        candidates.sort(key=lambda c: (STRATEGY_RANK[c["strategy"]], len(c["value"])))
+        return result["count"], candidates
+
+    def benchmark(self, locators):
+        """在浏览器内测量每个定位器单次查找的耗时（微秒），无法执行的为None"""
+        return self.driver.execute_script(
+            LOCATOR_BENCH_JS, [js_locator(loc) for loc in locators], self.iterations
+        )
+
+    def optimize(self, locator, name=""):
+        """
+        为一个定位器寻找更优的等价定位器
+        :return: 结果字典，suggested 为建议替换成的定位器（无需替换时为None）
+        """
+        result = {"name": name, "original": list(locator), "suggested": None}
+        try:
+            count, candidates = self.candidates(locator)
+        except WebDriverException as e:
+            result.update(status="error", error=e.msg)
+            return result
+        result["matches"] = count
+        if not count:
+            # 当前页面上找不到原定位器的元素，无法验证候选是否等价
+            result["status"] = "missing"
+            return result
+
+        locators = [locator] + [(c["by"], c["value"]) for c in candidates]
+        timings = self.benchmark(locators)
+        result["original_us"] = timings[0]
+        for candidate, timing in zip(candidates, timings[1:]):
+            candidate["us"] = timing
+        result["candidates"] = candidates
+
+        best = self._best(locator, timings[0], candidates)
+        if best is None:
+            result["status"] = "ok"
+            return result
+        result.update(
+            status="rewrite",
+            suggested=[best["by"], best["value"]],
+            strategy=best["strategy"],
+            suggested_us=best["us"],
+            speedup=timings[0] / best["us"] if timings[0] and best["us"] else None,
+        )
+        return result
+
+    def _best(self, locator, original_us, candidates):
+        """
+        选择建议的候选：优先级最高的两档中最快的一个
+        原定位器是XPath时总是建议替换（绝对路径随布局变化即失效）；否则要求足够快
+        """
+        measured = [c for c in candidates if c.get("us") is not None]
+        if not measured:
+            return None
+        top_ranks = sorted({STRATEGY_RANK[c["strategy"]] for c in measured})[:2]
+        best = min(
+            (c for c in measured if STRATEGY_RANK[c["strategy"]] in top_ranks),
+            key=lambda c: c["us"],
+        )
+        if locator[0] == By.XPATH:
+            return best
+        if original_us and best["us"] <= original_us * (1 - self.min_gain):
+            return best
+        return None
+
+    def optimize_page(self, page_class, locators=None):
+        """优化页面类的全部定位器（当前页面需已打开到该页面）"""
+        locators = locators or page_locators(page_class)
+        results = []
+        for attr, locator in locators.items():
+            result = self.optimize(locator, name=attr)
+            result["page"] = page_class.__name__
+            results.append(result)
+            if result["status"] == "rewrite":
+                logger.info(
+                    "定位器可优化: %s.%s %s -> %s",
+                    page_class.__name__,
+                    attr,
+                    locator,
+                    tuple(result["suggested"]),
+                )
+        return results
+
+
+def format_report(results):
+    """把优化结果整理为文本报告"""
+    lines = []
+    rewrites = 0
+    for r in results:
+        title = f"{r.get('page', '')}.{r['name']}"
+        original = f"{r['original'][0]}={r['original'][1]}"
+        if r["status"] == "rewrite":
+            rewrites += 1
+            speedup = f"{r['speedup']:.1f}x" if r.get("speedup") else "-"
+            lines.append(f"[替换] {title}")
+            lines.append(f"    原定位器: {original}（{r['original_us']:.1f}µs）")
+            lines.append(
+                f"    建议改为: {r['suggested'][0]}={r['suggested'][1]}"
+                f"（{r['suggested_us']:.1f}µs，{r['strategy']}，快 {speedup}）"
+            )
+        elif r["status"] == "ok":
+            lines.append(f"[保持] {title} {original}")
+        elif r["status"] == "missing":
+            lines.append(f"[未找到] {title} {original}（当前页面无匹配元素，无法验证）")
+        else:
+            lines.append(f"[出错] {title} {original}: {r.get('error')}")
+    lines.append(f"共 {len(results)} 个定位器，建议替换 {rewrites} 个")
+    return "\n".join(lines)
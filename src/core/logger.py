@@ -7,26 +7,59 @@
 @Desp    : 日志管理器
 """
 
+import atexit
+import copy
 import logging
+import os
+import queue
 import sys
 import threading
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from configs.path import LOGS_DIR
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """
+    入队时只拼接消息
+
+    标准QueueHandler在调用线程里按格式器生成整行文本；这里只把 msg % args
+    定格为消息（参数可能是之后会被修改的可变对象），时间、位置等格式化与
+    异常堆栈、控制台/文件写入都交给监听线程。
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 class Logger:
-    """日志管理器"""
+    """
+    日志管理器
+
+    支持 %-style 延迟参数：logger.debug("元素: %s", locator)，级别未开启时不会格式化；
+    记录经队列交给后台线程写控制台与文件。
+    """
 
-    def __init__(self, name="selenium_automation"):
+    def __init__(self, name="selenium_automation", level=None):
         self.name = name
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
+        self.set_level(level or os.getenv("LOG_LEVEL", "DEBUG"))
+        self._listener = None
 
         # 避免重复添加handler
         if not self.logger.handlers:
             self._setup_handlers()
 
+    def set_level(self, level):
+        """设置日志级别（低于该级别的日志不会格式化也不会入队）"""
+        self.logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+    def is_enabled(self, level):
+        return self.logger.isEnabledFor(level)
+
     def _setup_handlers(self):
         """配置日志处理器"""
         # 控制台输出
@@ -55,35 +88,54 @@ class Logger:
         )
         file_handler.setFormatter(file_format)
 
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+        # 控制台与文件写入放到后台线程
+        log_queue = queue.SimpleQueue()
+        self._listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.stop)
+        self.logger.addHandler(_DeferredQueueHandler(log_queue))
+
+    def stop(self):
+        """停止后台写入线程（会先写完队列中剩余的记录）"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
 
-    def debug(self, message):
-        self.logger.debug(message)
+    # stacklevel=2：文件日志中的文件名与行号指向调用方，而不是本模块
+    def debug(self, message, *args):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, stacklevel=2)
 
-    def info(self, message):
-        self.logger.info(message)
+    def info(self, message, *args):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, stacklevel=2)
 
-    def warning(self, message):
-        self.logger.warning(message)
+    def warning(self, message, *args):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, stacklevel=2)
 
-    def error(self, message):
-        self.logger.error(message)
+    def error(self, message, *args):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, stacklevel=2)
 
-    def critical(self, message):
-        self.logger.critical(message)
+    def critical(self, message, *args):
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, stacklevel=2)
 
     def log_action(self, action, locator=None, details=""):
-        """记录页面操作"""
-        if locator:
-            message = f"{action}: {locator}"
+        """记录页面操作（INFO未开启时不拼接消息）"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if locator and details:
+            self.logger.info("%s: %s - %s", action, locator, details, stacklevel=2)
+        elif locator:
+            self.logger.info("%s: %s", action, locator, stacklevel=2)
+        elif details:
+            self.logger.info("%s - %s", action, details, stacklevel=2)
         else:
-            message = f"{action}"
-
-        if details:
-            message += f" - {details}"
-
-        self.info(message)
+            self.logger.info("%s", action, stacklevel=2)
 
     def setup_exception_logging(self):
         """设置全局异常处理器，捕获未处理的异常"""
@@ -100,7 +152,8 @@ class Logger:
 
         def handle_thread_exception(args):
             self.logger.critical(
-                f"线程 {args.thread.name} 中未捕获的异常",
+                "线程 %s 中未捕获的异常",
+                args.thread.name,
                 exc_info=(args.exc_type, args.exc_value, args.exc_traceback),
             )
 
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  network_capture.py
+@Time    :  2026/10/17 10:26:53
+@Author  :  owl
+@Desp    :  网络请求录制：读取CDP Network事件，按用例流式写入HAR文件
+"""
+
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+
+from selenium.common.exceptions import WebDriverException
+
+from configs import config
+from configs.path import REPORTS_DIR
+
+from .logger import logger
+
+HAR_DIR = REPORTS_DIR / "har"
+
+# 可以保存响应体的文本类MIME
+TEXT_MIME = re.compile(r"json|text|xml|javascript|x-www-form-urlencoded", re.I)
+
+
+class PerformanceLog:
+    """
+    驱动性能日志的共享读取器
+
+    get_log("performance") 每次读取都会清空浏览器端的缓冲，多个使用方各自读取会互相吞掉事件；
+    这里每个驱动只保留一个读取器，读取到的事件分发给全部订阅者（资源屏蔽统计、HAR录制）。
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """驱动的读取器（驱动不支持CDP性能日志时返回None）"""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return None
+        log = getattr(driver, "_performance_log", None)
+        if log is None:
+            log = driver._performance_log = cls(driver)
+        return log
+
+    def subscribe(self, callback):
+        """订阅事件，callback(method, params)"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def poll(self):
+        """读取积累的日志并分发，返回事件数量"""
+        with self._lock:
+            try:
+                entries = self.driver.get_log("performance")
+            except Exception as e:
+                logger.debug("读取性能日志失败: %s", e)
+                return 0
+            subscribers = list(self._subscribers)
+            for entry in entries:
+                message = json.loads(entry["message"])["message"]
+                method = message.get("method", "")
+                if not method.startswith("Network."):
+                    continue
+                params = message.get("params", {})
+                for callback in subscribers:
+                    callback(method, params)
+            return len(entries)
+
+
+def _headers(headers):
+    return [{"name": k, "value": str(v)} for k, v in (headers or {}).items()]
+
+
+def _query_string(url):
+    query = url.split("?", 1)[1].split("#", 1)[0] if "?" in url else ""
+    pairs = [p.split("=", 1) for p in query.split("&") if p]
+    return [{"name": p[0], "value": p[1] if len(p) > 1 else ""} for p in pairs]
+
+
+def _timings(timing, total):
+    """CDP ResourceTiming（相对requestTime的毫秒）转为HAR timings，不可用的阶段为-1"""
+    if not timing:
+        return {"send": 0, "wait": max(total, 0), "receive": 0}
+
+    def span(start, end):
+        start, end = timing.get(start, -1), timing.get(end, -1)
+        return end - start if start >= 0 and end >= 0 else -1
+
+    first = [timing.get(k, -1) for k in ("dnsStart", "connectStart", "sendStart")]
+    headers_end = timing.get("receiveHeadersEnd", 0)
+    return {
+        "blocked": next((t for t in first if t >= 0), -1),
+        "dns": span("dnsStart", "dnsEnd"),
+        "connect": span("connectStart", "connectEnd"),
+        "ssl": span("sslStart", "sslEnd"),
+        "send": max(span("sendStart", "sendEnd"), 0),
+        "wait": max(headers_end - timing.get("sendEnd", 0), 0),
+        "receive": max(total - headers_end, 0),
+    }
+
+
+class HarRecorder:
+    """
+    单个用例的HAR录制
+
+    请求完成（loadingFinished/loadingFailed）后立即追加到文件，内存中只保留进行中的请求
+    和耗时最长的若干条摘要；进行中的请求超过上限时最早的一条按未完成写出。
+    性能日志只在测试线程上读取（页面导航后由drain_capture读取，用例结束时由stop读取），
+    不从其他线程向驱动发命令；需要保存响应体的条目留到stop时统一读取响应体后写出。
+    """
+
+    def __init__(
+        self,
+        driver,
+        path,
+        capture_bodies=False,
+        max_body_kb=64,
+        top=5,
+        max_pending=500,
+    ):
+        self.driver = driver
+        self.path = path
+        self.capture_bodies = capture_bodies
+        self.max_body_bytes = max_body_kb * 1024
+        self.top = top
+        self.max_pending = max_pending
+        self.entries = 0
+        self.failed = 0
+        self.transfer_bytes = 0
+        self.skipped_bodies = 0
+        self._pending = {}  # requestId -> 进行中的请求
+        self._slowest = []  # (耗时, 序号, 摘要) 小顶堆
+        self._awaiting_bodies = []  # (requestId, 条目)，stop时读取响应体后写出
+        self._written = 0
+        self._file = None
+        self._log = None
+
+    def start(self):
+        """开始录制，丢弃开始前积累的事件；驱动不支持时返回False"""
+        self._log = PerformanceLog.for_driver(self.driver)
+        if self._log is None:
+            return False
+        self._log.poll()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        header = {
+            "version": "1.2",
+            "creator": {"name": "webautotest", "version": "1.0"},
+            "pages": [],
+        }
+        # 流式写出：先写entries之前的部分，结束时补上结尾
+        self._file.write(json.dumps({"log": header}, ensure_ascii=False)[:-2])
+        self._file.write(', "entries": [\n')
+        self._log.subscribe(self._on_event)
+        self.driver._har_recorder = self
+        return True
+
+    def stop(self):
+        """停止录制，写出未完成的请求，读取待保存的响应体后关闭文件，返回摘要"""
+        if self._log is not None:
+            self._log.poll()
+            self._log.unsubscribe(self._on_event)
+            self.driver._har_recorder = None
+        for request_id in list(self._pending):
+            self._finish(request_id, None, error="录制结束时未完成")
+        awaiting, self._awaiting_bodies = self._awaiting_bodies, []
+        for request_id, entry in awaiting:
+            content = entry["response"]["content"]
+            content.update(self._body(request_id))
+            self._write(entry)
+        if self._file is not None:
+            self._file.write("\n]}}\n")
+            self._file.close()
+            self._file = None
+        return self.summary()
+
+    def summary(self):
+        """请求数、失败数、传输量与耗时最长的请求"""
+        return {
+            "har": str(self.path),
+            "requests": self.entries,
+            "failed": self.failed,
+            "transfer_kb": round(self.transfer_bytes / 1024, 1),
+            "skipped_bodies": self.skipped_bodies,
+            "slowest": [item for _, _, item in sorted(self._slowest, reverse=True)],
+        }
+
+    def _on_event(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            redirect = params.get("redirectResponse")
+            if redirect and request_id in self._pending:
+                # 重定向沿用同一个requestId，前一跳作为单独的条目写出
+                self._pending[request_id]["response"] = redirect
+                self._finish(request_id, params["timestamp"])
+            self._pending[request_id] = {
+                "request": params["request"],
+                "start": params["timestamp"],
+                "wall_time": params.get("wallTime"),
+                "type": params.get("type", ""),
+            }
+            if len(self._pending) > self.max_pending:
+                oldest = next(iter(self._pending))
+                self._finish(oldest, None, error="进行中的请求过多，提前写出")
+        elif request_id not in self._pending:
+            return
+        elif method == "Network.responseReceived":
+            self._pending[request_id]["response"] = params["response"]
+        elif method == "Network.loadingFinished":
+            size = params.get("encodedDataLength", 0)
+            self._pending[request_id]["size"] = size
+            self._finish(request_id, params["timestamp"])
+        elif method == "Network.loadingFailed":
+            error = params.get("blockedReason") or params.get("errorText", "")
+            self._finish(request_id, params["timestamp"], error=error)
+
+    def _finish(self, request_id, end, error=None):
+        pending = self._pending.pop(request_id)
+        total = (end - pending["start"]) * 1000 if end is not None else -1
+        entry = self._entry(pending, total, error)
+        if self._wants_body(entry, error):
+            self._awaiting_bodies.append((request_id, entry))
+        else:
+            self._write(entry)
+        self.entries += 1
+        self.transfer_bytes += pending.get("size", 0)
+        if error:
+            self.failed += 1
+        item = (
+            round(total, 1),
+            self.entries,
+            {
+                "method": entry["request"]["method"],
+                "url": entry["request"]["url"],
+                "status": entry["response"]["status"],
+                "type": pending["type"],
+                "time_ms": round(total, 1),
+            },
+        )
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, item)
+        elif self.top:
+            heapq.heappushpop(self._slowest, item)
+
+    def _write(self, entry):
+        if self._written:
+            self._file.write(",\n")
+        self._file.write(json.dumps(entry, ensure_ascii=False))
+        self._written += 1
+
+    def _entry(self, pending, total, error):
+        request = pending["request"]
+        response = pending.get("response") or {}
+        size = pending.get("size", response.get("encodedDataLength", -1))
+        wall_time = pending["wall_time"]
+        started = (
+            datetime.fromtimestamp(wall_time, timezone.utc).isoformat()
+            if wall_time
+            else datetime.now(timezone.utc).isoformat()
+        )
+        post_data = request.get("postData")
+        content = {"size": size, "mimeType": response.get("mimeType", "")}
+        entry = {
+            "startedDateTime": started,
+            "time": total,
+            "request": {
+                "method": request["method"],
+                "url": request["url"],
+                "httpVersion": response.get("protocol", ""),
+                "headers": _headers(request.get("headers")),
+                "queryString": _query_string(request["url"]),
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(post_data) if post_data else 0,
+            },
+            "response": {
+                "status": response.get("status", 0),
+                "statusText": response.get("statusText", ""),
+                "httpVersion": response.get("protocol", ""),
+                "headers": _headers(response.get("headers")),
+                "cookies": [],
+                "content": content,
+                "redirectURL": (response.get("headers") or {}).get("location", ""),
+                "headersSize": -1,
+                "bodySize": size,
+            },
+            "cache": {},
+            "timings": _timings(response.get("timing"), total),
+            "_resourceType": pending["type"],
+        }
+        if post_data and len(post_data) <= self.max_body_bytes:
+            entry["request"]["postData"] = {
+                "mimeType": (request.get("headers") or {}).get("Content-Type", ""),
+                "text": post_data,
+            }
+        if response.get("remoteIPAddress"):
+            entry["serverIPAddress"] = response["remoteIPAddress"]
+        if error:
+            entry["_error"] = error
+        return entry
+
+    def _wants_body(self, entry, error):
+        """是否需要保存响应体（只保存文本类响应），超过大小上限的记为跳过"""
+        content = entry["response"]["content"]
+        if not self.capture_bodies or error or not entry["response"]["status"]:
+            return False
+        if not TEXT_MIME.search(content["mimeType"]):
+            return False
+        if content["size"] > self.max_body_bytes:
+            self.skipped_bodies += 1
+            content["comment"] = f"响应体超过 {self.max_body_bytes // 1024}KB，未保存"
+            return False
+        return True
+
+    def _body(self, request_id):
+        """读取响应体（浏览器已释放时返回空）"""
+        try:
+            body = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except WebDriverException:
+            return {}
+        result = {"text": body.get("body", "")}
+        if body.get("base64Encoded"):
+            result["encoding"] = "base64"
+        return result
+
+
+def har_path(test_name):
+    """用例的HAR文件路径，并行worker之间不会重名"""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    name = re.sub(r"[^\w.-]+", "_", test_name).strip("_")[:80]
+    return HAR_DIR / f"{worker}-{name}.har"
+
+
+def start_capture(driver, test_name):
+    """按 webdriver.har 配置开始录制当前用例，未启用或驱动不支持时返回None"""
+    if not config.get("webdriver.har.enabled", False):
+        return None
+    recorder = HarRecorder(
+        driver,
+        har_path(test_name),
+        capture_bodies=config.get("webdriver.har.capture_bodies", False),
+        max_body_kb=config.get("webdriver.har.max_body_kb", 64),
+        top=config.get("webdriver.har.top", 5),
+    )
+    return recorder if recorder.start() else None
+
+
+def drain_capture(driver):
+    """
+    在测试线程上读取录制中积累的性能日志（页面导航后调用），
+    避免浏览器端的日志缓冲在长用例中无限增长；没有录制时不发出命令
+    """
+    recorder = getattr(driver, "_har_recorder", None)
+    if recorder is not None and recorder._log is not None:
+        recorder._log.poll()
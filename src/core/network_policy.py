@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  network_policy.py
+@Time    :  2026/10/16 15:52:40
+@Author  :  owl
+@Desp    :  网络资源屏蔽策略：跳过功能测试不关心的图片、字体、统计脚本等
+"""
+
+import re
+import threading
+
+from .logger import logger
+from .network_capture import PerformanceLog
+
+# 资源类型对应的文件扩展名
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav"],
+    "stylesheet": ["css"],
+    "script": ["js"],
+}
+
+
+def extension_patterns(extension):
+    """
+    扩展名对应的URL通配符（Network.setBlockedURLs只支持*通配符）
+    扩展名必须位于路径末尾：其后是URL结尾或查询串，
+    避免 *.js* 命中 .json 接口、*.png* 命中查询参数中带 .png 的页面
+    """
+    return [f"*.{extension}", f"*.{extension}?*"]
+
+
+def pattern_regex(pattern):
+    """URL通配符对应的正则（*匹配任意字符，其余字符按原样匹配）"""
+    return re.compile(".*".join(map(re.escape, pattern.split("*"))))
+
+
+# 性能日志能力（用于统计被屏蔽的请求）
+LOGGING_PREFS_CAPABILITY = {
+    "chrome": "goog:loggingPrefs",
+    "edge": "ms:loggingPrefs",
+}
+
+
+class BlockingPolicy:
+    """资源屏蔽策略"""
+
+    def __init__(self, url_patterns=None, resource_types=None, count_bytes=False):
+        """
+        :param url_patterns: URL通配符列表
+        :param resource_types: 资源类型列表: image, font, media, stylesheet, script
+        :param count_bytes: 是否统计被屏蔽资源的体积：体积取同一URL未被屏蔽时
+                            （如关闭屏蔽的用例）在性能日志中记录的encodedDataLength，
+                            不额外发起请求，从未加载过的资源计为体积未知
+        """
+        self.patterns = list(url_patterns or [])
+        for resource_type in resource_types or []:
+            if resource_type not in RESOURCE_TYPE_EXTENSIONS:
+                raise ValueError(f"不支持的资源类型: {resource_type}")
+            for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                self.patterns.extend(extension_patterns(extension))
+        self.count_bytes = count_bytes
+        self._regexes = [pattern_regex(pattern) for pattern in self.patterns]
+        self._size_cache = {}  # 匹配屏蔽规则的URL -> 未屏蔽时的传输体积
+        self._size_lock = threading.Lock()
+        self.total_blocked = 0
+        self._blocked_bytes = 0
+
+    @classmethod
+    def from_config(cls, cfg):
+        """从配置创建策略，未启用时返回None"""
+        if not cfg.get("webdriver.network_block.enabled", False):
+            return None
+        resource_types = cfg.get("webdriver.network_block.resource_types", [])
+        if resource_types and cfg.get("perf.enabled", False):
+            # 屏蔽图片、字体后LCP与传输量预算失真，采集页面性能时只屏蔽URL规则
+            logger.info("已开启页面性能采集，不按资源类型屏蔽: %s", resource_types)
+            resource_types = []
+        return cls(
+            url_patterns=cfg.get("webdriver.network_block.url_patterns", []),
+            resource_types=resource_types,
+            count_bytes=cfg.get("webdriver.network_block.count_bytes", False),
+        )
+
+    @staticmethod
+    def supported(driver):
+        """只有支持CDP的本地Chromium驱动可以屏蔽资源"""
+        return hasattr(driver, "execute_cdp_cmd")
+
+    def apply(self, driver, enabled=True, force=False):
+        """对当前标签页开启/关闭屏蔽（force用于新会话，忽略已记录的状态）"""
+        if not self.supported(driver):
+            logger.debug("当前浏览器不支持CDP，跳过资源屏蔽")
+            return False
+        if not force and getattr(driver, "_resource_blocking", None) == enabled:
+            return True
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": self.patterns if enabled else []}
+        )
+        driver._resource_blocking = enabled
+        logger.info("资源屏蔽已%s: %s 条规则", "开启" if enabled else "关闭", len(self.patterns))
+        return True
+
+    def drain(self, driver):
+        """丢弃已积累的屏蔽记录（用例开始前调用）"""
+        self._read_blocked(driver)
+
+    def collect(self, driver):
+        """
+        统计自上次调用以来被屏蔽的请求
+        :return: {"requests": 数量, "bytes": 已知体积, "unknown": 体积未知的数量}
+        """
+        urls = self._read_blocked(driver)
+        known = 0
+        unknown = 0
+        with self._size_lock:
+            for url in urls:
+                size = self._size_cache.get(url)
+                if size is None:
+                    unknown += 1
+                else:
+                    known += size
+            self.total_blocked += len(urls)
+            self._blocked_bytes += known
+        return {"requests": len(urls), "bytes": known, "unknown": unknown}
+
+    def total_bytes(self):
+        """全部被屏蔽资源中体积已知部分的总和"""
+        with self._size_lock:
+            return self._blocked_bytes
+
+    def _read_blocked(self, driver):
+        """读取自上次调用以来被屏蔽的请求URL（与HAR录制共用性能日志读取器）"""
+        log = PerformanceLog.for_driver(driver)
+        if log is None:
+            return []
+        counter = getattr(driver, "_blocked_counter", None)
+        if counter is None:
+            on_loaded = self._remember_size if self.count_bytes else None
+            counter = driver._blocked_counter = _BlockedCounter(on_loaded)
+            log.subscribe(counter)
+        log.poll()
+        return counter.take()
+
+    def _remember_size(self, url, size):
+        """记录匹配屏蔽规则、但本次未被屏蔽的资源的传输体积"""
+        if any(regex.fullmatch(url) for regex in self._regexes):
+            with self._size_lock:
+                self._size_cache[url] = size
+
+
+class _BlockedCounter:
+    """性能日志订阅者：记录被屏蔽（blockedReason为inspector）的请求"""
+
+    def __init__(self, on_loaded=None):
+        """
+        :param on_loaded: 请求加载完成的回调on_loaded(url, encodedDataLength)
+        """
+        self._requests = {}  # requestId -> URL，只保留进行中的请求
+        self._blocked = []
+        self._on_loaded = on_loaded
+        self._lock = threading.Lock()
+
+    def __call__(self, method, params):
+        with self._lock:
+            if method == "Network.requestWillBeSent":
+                self._requests[params["requestId"]] = params["request"]["url"]
+            elif method == "Network.loadingFinished":
+                url = self._requests.pop(params["requestId"], None)
+                if url and self._on_loaded is not None:
+                    self._on_loaded(url, int(params.get("encodedDataLength", 0)))
+            elif method == "Network.loadingFailed":
+                url = self._requests.pop(params["requestId"], "")
+                if params.get("blockedReason") == "inspector":
+                    self._blocked.append(url)
+
+    def take(self):
+        with self._lock:
+            blocked, self._blocked = self._blocked, []
+        return blocked
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  page_perf.py
+@Time    :  2026/10/16 23:05:12
+@Author  :  owl
+@Desp    :  页面性能采集：导航/资源计时、LCP/CLS/长任务、CDP运行时指标，按预算检查并按运行落盘
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from configs import config
+from configs.path import REPORTS_DIR
+
+from .logger import logger
+
+PERF_DIR = REPORTS_DIR / "perf"
+
+# 采集页面性能（execute_async_script）：arguments[0] 为 {top, timeout, lcp_settle}
+# LCP、布局偏移、长任务通过 buffered 观察者取回已发生的记录，浏览器不支持的类型跳过
+# eager/none 加载策略下导航在 DOMContentLoaded 前后就返回：先等到 load 事件结束，
+# 且 load 与最后一个 LCP 候选之后静置 lcp_settle 毫秒再采集；timeout 内没有加载完成时
+# LCP、load 与资源传输量仍在变化，置为 null（不参与预算检查与跨运行对比），
+# 并标记 complete: false
+PAGE_PERF_JS = r"""
+var opts = arguments[0], done = arguments[arguments.length - 1];
+var supported = (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+var vitals = {fcp: null, lcp: null, cls: 0, long_tasks: 0, long_task_ms: 0};
+var lastLcp = 0;
+var handlers = {
+    'largest-contentful-paint': function (e) {
+        vitals.lcp = e.renderTime || e.loadTime || e.startTime;
+        lastLcp = Math.max(lastLcp, e.startTime);
+    },
+    'layout-shift': function (e) { if (!e.hadRecentInput) vitals.cls += e.value; },
+    'longtask': function (e) { vitals.long_tasks++; vitals.long_task_ms += e.duration; }
+};
+var observers = [];
+Object.keys(handlers).forEach(function (type) {
+    if (supported.indexOf(type) === -1) return;
+    var observer = new PerformanceObserver(function (list) { list.getEntries().forEach(handlers[type]); });
+    observer.observe({type: type, buffered: true});
+    observers.push([observer, handlers[type]]);
+});
+var started = performance.now();
+
+// 加载完成的时间，未完成时返回null
+function loadedAt() {
+    if (document.readyState !== 'complete') return null;
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return 0;
+    return nav.loadEventEnd > 0 ? nav.loadEventEnd : null;
+}
+
+function finish(complete) {
+    observers.forEach(function (pair) {
+        pair[0].takeRecords().forEach(pair[1]);
+        pair[0].disconnect();
+    });
+    var paint = performance.getEntriesByName('first-contentful-paint')[0];
+    if (paint) vitals.fcp = paint.startTime;
+
+    var nav = performance.getEntriesByType('navigation')[0];
+    var navigation = nav ? {
+        type: nav.type,
+        ttfb: nav.responseStart,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd || null,
+        transfer_kb: nav.transferSize / 1024
+    } : null;
+
+    var entries = performance.getEntriesByType('resource');
+    var resources = {
+        count: entries.length,
+        transfer_kb: entries.reduce(function (sum, e) { return sum + (e.transferSize || 0); }, 0) / 1024,
+        slowest: entries.slice().sort(function (a, b) { return b.duration - a.duration; })
+            .slice(0, opts.top).map(function (e) {
+                return {name: e.name, type: e.initiatorType, duration: e.duration};
+            })
+    };
+    if (!complete) {
+        vitals.lcp = null;
+        if (navigation) navigation.load = null;
+        resources.transfer_kb = null;
+    }
+    done({url: location.href, navigation: navigation, resources: resources, vitals: vitals,
+          complete: complete});
+}
+
+function settle() {
+    var now = performance.now(), loadEnd = loadedAt();
+    // load之后仍可能出现新的LCP候选（如延迟加载的主图），load与最后一个候选之后都要静置
+    if (loadEnd !== null && now - Math.max(loadEnd, lastLcp) >= opts.lcp_settle) {
+        return finish(true);
+    }
+    if (now - started >= opts.timeout) return finish(false);
+    setTimeout(settle, 50);
+}
+
+// buffered 记录在下一个任务前投递，之后再判断是否加载完成
+setTimeout(settle, 0);
+"""
+
+# CDP Performance.getMetrics 中关心的指标（耗时类单位为秒，计数类为页面启动以来累计值）
+CDP_METRICS = {
+    "JSHeapUsedSize": "js_heap_mb",
+    "Nodes": "nodes",
+    "LayoutCount": "layout_count",
+    "RecalcStyleCount": "recalc_style_count",
+    "ScriptDuration": "script_s",
+    "TaskDuration": "task_s",
+}
+
+_local = threading.local()
+_store = None
+_store_lock = threading.Lock()
+
+
+def collect_page_perf(driver, page="", top=None):
+    """
+    采集当前页面的性能数据
+    :param page: 页面对象名称
+    :param top: 记录耗时最长的资源数量
+    :return: 性能记录，采集失败时返回None
+    """
+    if top is None:
+        top = config.get("perf.top_resources", 5)
+    options = {
+        "top": top,
+        "timeout": config.get("perf.load_timeout", 10000),
+        "lcp_settle": config.get("perf.lcp_settle", 500),
+    }
+    try:
+        record = driver.execute_async_script(PAGE_PERF_JS, options)
+    except WebDriverException as e:
+        logger.debug("页面性能采集失败: %s - %s", page, e.msg)
+        return None
+    if not record.get("complete", True):
+        logger.warning(
+            "页面未在 %sms 内加载完成，LCP、load与资源传输量不计入: %s",
+            options["timeout"],
+            page,
+        )
+    record["page"] = page
+    record["time"] = time.time()
+    cdp = _cdp_metrics(driver)
+    if cdp:
+        record["cdp"] = cdp
+    return record
+
+
+def _cdp_metrics(driver):
+    """读取CDP运行时指标（仅支持CDP的Chrome/Edge），首次读取前开启Performance域"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    try:
+        if not getattr(driver, "_perf_metrics", False):
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver._perf_metrics = True
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except WebDriverException as e:
+        logger.debug("CDP性能指标读取失败: %s", e.msg)
+        return None
+    result = {}
+    for metric in metrics:
+        key = CDP_METRICS.get(metric["name"])
+        if key:
+            value = metric["value"]
+            result[key] = value / 1024 / 1024 if key == "js_heap_mb" else value
+    return result
+
+
+def flatten(record):
+    """把性能记录展开为 {"navigation.ttfb": 值} 形式的数值指标"""
+    metrics = {}
+    for section in ("navigation", "resources", "vitals", "cdp"):
+        for key, value in (record.get(section) or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                metrics[f"{section}.{key}"] = value
+    return metrics
+
+
+def _as_dict(value):
+    """配置对象（AttrDict）转为普通字典"""
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return {k: _as_dict(v) for k, v in vars(value).items()}
+    return value
+
+
+def budgets_for(page):
+    """页面的性能预算：default 与页面类名下的配置合并，展开为 {"vitals.lcp": 上限}"""
+    budgets = _as_dict(config.get("perf.budgets", None)) or {}
+    merged = {}
+    for name in ("default", page):
+        for section, limits in (budgets.get(name) or {}).items():
+            for key, limit in (limits or {}).items():
+                merged[f"{section}.{key}"] = limit
+    return merged
+
+
+def check_budgets(record, budgets):
+    """检查性能记录是否超出预算，返回超出项列表"""
+    metrics = flatten(record)
+    return [
+        {"metric": metric, "value": round(metrics[metric], 3), "budget": limit}
+        for metric, limit in budgets.items()
+        if metric in metrics and metrics[metric] > limit
+    ]
+
+
+class PerfStore:
+    """
+    按运行保存性能记录（JSON Lines）
+    同一次运行的xdist worker写入同一个文件，每条记录一行、一次写入
+    """
+
+    def __init__(self, run_id=None, directory=None):
+        self.run_id = run_id or os.getenv("PYTEST_XDIST_TESTRUNUID") or (
+            time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        )
+        self.directory = directory or PERF_DIR
+        self.path = self.directory / f"{self.run_id}.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        line = json.dumps(dict(record, run=self.run_id), ensure_ascii=False) + "\n"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    @classmethod
+    def runs(cls, directory=None):
+        """已保存的运行ID，按时间从旧到新"""
+        directory = directory or PERF_DIR
+        if not directory.exists():
+            return []
+        files = sorted(
+            directory.glob("*.jsonl"), key=lambda p: (p.stat().st_mtime, p.name)
+        )
+        return [p.stem for p in files]
+
+    @classmethod
+    def load(cls, run_id, directory=None):
+        path = (directory or PERF_DIR) / f"{run_id}.jsonl"
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def _get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PerfStore()
+        return _store
+
+
+def begin_test_capture():
+    """开始收集当前线程（用例）内的性能记录"""
+    _local.records = []
+
+
+def end_test_capture():
+    """结束收集，返回当前用例的性能记录"""
+    return _local.__dict__.pop("records", [])
+
+
+def record_page_perf(record):
+    """检查预算、写入本次运行的记录，并加入当前用例的收集"""
+    record["violations"] = check_budgets(record, budgets_for(record["page"]))
+    for violation in record["violations"]:
+        logger.warning(
+            "性能预算超出: %s %s = %s（预算 %s）",
+            record["page"],
+            violation["metric"],
+            violation["value"],
+            violation["budget"],
+        )
+    if config.get("perf.store", True):
+        _get_store().append(record)
+    records = getattr(_local, "records", None)
+    if records is not None:
+        records.append(record)
+    return record
+
+
+def summarize(records):
+    """按页面汇总各指标的中位数 {页面: {指标: 中位数}}"""
+    values = {}
+    for record in records:
+        page_values = values.setdefault(record.get("page", ""), {})
+        for metric, value in flatten(record).items():
+            page_values.setdefault(metric, []).append(value)
+    return {
+        page: {metric: statistics.median(v) for metric, v in metrics.items()}
+        for page, metrics in values.items()
+    }
+
+
+def compare_runs(baseline, current):
+    """
+    对比两次运行的页面指标中位数
+    :return: [(页面, 指标, 基线值, 当前值, 变化比例)]，只包含两次都有的指标
+    """
+    before = summarize(baseline)
+    after = summarize(current)
+    rows = []
+    for page in sorted(set(before) & set(after)):
+        for metric in sorted(set(before[page]) & set(after[page])):
+            old, new = before[page][metric], after[page][metric]
+            change = (new - old) / old if old else None
+            rows.append((page, metric, old, new, change))
+    return rows
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  readiness.py
+@Time    :  2026/10/16 22:18:40
+@Author  :  owl
+@Desp    :  页面就绪判断：页面加载策略 + 可组合的就绪条件（文档就绪、网络空闲、关键元素）
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from configs import config
+
+from .dom_script import NETWORK_SHIM_JS, READY_CHECK_JS, js_locator
+from .logger import logger
+from .wait_engine import WaitEngine
+
+# 页面加载策略（W3C pageLoadStrategy）及各自对应的文档状态
+PAGE_LOAD_STRATEGIES = ("none", "eager", "normal")
+_STRATEGY_STATES = {"none": None, "eager": "interactive", "normal": "complete"}
+
+
+def page_load_strategy(name):
+    """校验页面加载策略名称"""
+    if name not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(
+            f"未知的页面加载策略: {name}，可选: {', '.join(PAGE_LOAD_STRATEGIES)}"
+        )
+    return name
+
+
+def session_strategy(driver):
+    """会话使用的页面加载策略（从会话能力中读取，读不到时按normal处理）"""
+    capabilities = getattr(driver, "capabilities", None) or {}
+    return capabilities.get("pageLoadStrategy", "normal")
+
+
+class DomReady:
+    """文档就绪：interactive（DOMContentLoaded）或 complete（load）"""
+
+    def __init__(self, state="interactive"):
+        if state not in ("interactive", "complete"):
+            raise ValueError(f"未知的文档状态: {state}")
+        self.state = state
+        self.name = f"dom:{state}"
+
+    def payload(self):
+        return {"type": "dom", "name": self.name, "state": self.state}
+
+
+class NetworkIdle:
+    """网络空闲：没有进行中的fetch/XHR，且已持续 idle_ms 毫秒"""
+
+    def __init__(self, idle_ms=None):
+        if idle_ms is None:
+            idle_ms = config.get("webdriver.page_load.network_idle_ms", 500)
+        self.idle_ms = idle_ms
+        self.name = f"network_idle:{idle_ms}ms"
+
+    def payload(self):
+        return {"type": "network_idle", "name": self.name, "idle_ms": self.idle_ms}
+
+
+class ReadySelector:
+    """页面关键元素已出现（默认要求可见）"""
+
+    def __init__(self, locator, visible=True):
+        self.by, self.value = js_locator(locator)
+        self.visible = visible
+        self.name = f"selector:{self.value}"
+
+    def payload(self):
+        return {
+            "type": "selector",
+            "name": self.name,
+            "by": self.by,
+            "value": self.value,
+            "visible": self.visible,
+        }
+
+
+def install_network_shim(driver):
+    """
+    在每个新文档的页面脚本执行前注入网络请求计数（仅支持CDP的Chrome/Edge）
+    不支持时网络空闲条件会在检查时当场注入，统计不到注入前已发出的请求
+    :return: 是否已注入
+    """
+    if getattr(driver, "_network_shim", False):
+        return True
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    try:
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_SHIM_JS}
+        )
+    except WebDriverException as e:
+        logger.debug("网络请求计数注入失败: %s", e.msg)
+        return False
+    driver._network_shim = True
+    return True
+
+
+def ready_predicates(strategy, session="normal", ready_locator=None, network_idle=False):
+    """
+    按页面需要的加载程度组合就绪条件
+    :param strategy: 页面需要的加载策略；会话策略已经等到的程度不再重复检查
+    :param session: 会话的页面加载策略
+    :param ready_locator: 页面关键元素，出现（可见）即可操作
+    :param network_idle: 是否等待网络空闲，可传空闲毫秒数
+    """
+    predicates = []
+    page_load_strategy(strategy)
+    if PAGE_LOAD_STRATEGIES.index(strategy) > PAGE_LOAD_STRATEGIES.index(session):
+        predicates.append(DomReady(_STRATEGY_STATES[strategy]))
+    if network_idle:
+        predicates.append(NetworkIdle(None if network_idle is True else network_idle))
+    if ready_locator is not None:
+        predicates.append(ReadySelector(ready_locator))
+    return predicates
+
+
+def wait_until_ready(driver, predicates, timeout=None, label=""):
+    """
+    等待全部就绪条件满足
+    条件对象（DomReady等）合并为一次浏览器内等待；可调用对象 f(driver) 在之后由客户端轮询
+    :return: 是否在超时内就绪（未就绪时记录未满足的条件，不抛异常）
+    """
+    if timeout is None:
+        timeout = config.get("webdriver.page_load.timeout", 30)
+    in_browser = [p.payload() for p in predicates if not callable(p)]
+    checks = [p for p in predicates if callable(p)]
+    wait = WaitEngine(driver)
+    start = time.perf_counter()
+    try:
+        if in_browser:
+            wait.wait_for("ready", expected=in_browser, timeout=timeout)
+        for check in checks:
+            remaining = max(timeout - (time.perf_counter() - start), 0)
+            wait.until(check, f"就绪条件 {check}", timeout=remaining)
+    except TimeoutException as e:
+        pending = _pending(driver, in_browser) or [e.msg]
+        logger.warning("页面在 %ss 内未就绪: %s，未满足: %s", timeout, label, pending)
+        return False
+    logger.debug("页面就绪: %s，耗时 %.3fs", label, time.perf_counter() - start)
+    return True
+
+
+def _pending(driver, in_browser):
+    """超时后读取未满足的浏览器内条件"""
+    if not in_browser:
+        return []
+    try:
+        return driver.execute_script(READY_CHECK_JS, in_browser)
+    except WebDriverException:
+        return [p["name"] for p in in_browser]
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  screenshot_service.py
+@Time    :  2026/10/17 09:12:36
+@Author  :  owl
+@Desp    :  异步截图：测试线程只取PNG字节，缩放、编码和写盘交给后台线程池
+"""
+
+import itertools
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import cv2
+import numpy as np
+
+from configs import config
+from configs.path import SCREENSHOTS_DIR
+
+from .logger import logger
+
+FORMATS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+_local = threading.local()
+_service = None
+_service_lock = threading.Lock()
+
+
+def _slug(text, limit=60):
+    """文件名中只保留字母数字、下划线、点和短横线"""
+    return re.sub(r"[^\w.-]+", "_", text).strip("_")[:limit] or "unknown"
+
+
+def set_current_test(name):
+    """设置当前线程的用例名（非pytest调度的线程使用，None表示清除）"""
+    _local.test = name
+
+
+def current_test():
+    """当前用例名：优先线程内设置的名称，其次 PYTEST_CURRENT_TEST"""
+    name = getattr(_local, "test", None)
+    if name:
+        return name
+    # 形如 tests/test_login.py::TestLogin::test_ok[chrome] (call)
+    current = os.getenv("PYTEST_CURRENT_TEST", "")
+    return current.split(" ")[0].split("::")[-1] or "session"
+
+
+def encode(png, fmt="png", quality=80, max_width=0):
+    """
+    把PNG截图转换为目标格式
+    :param png: PNG字节
+    :param fmt: png / jpeg / webp
+    :param quality: JPEG/WebP质量（1-100）
+    :param max_width: 宽度上限，超过时等比缩小，0表示不缩放
+    :return: 编码后的字节
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的截图格式: {fmt}（可选: {', '.join(FORMATS)}）")
+    if fmt == "png" and not max_width:
+        return png
+    image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("截图数据不是有效的图片")
+    height, width = image.shape[:2]
+    if max_width and width > max_width:
+        size = (max_width, max(1, round(height * max_width / width)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    if fmt == "jpeg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    elif fmt == "webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+    else:
+        params = []
+    ok, data = cv2.imencode(FORMATS[fmt], image, params)
+    if not ok:
+        raise ValueError(f"截图编码失败: {fmt}")
+    return data.tobytes()
+
+
+class ScreenshotService:
+    """
+    截图流水线
+
+    capture() 在调用线程上只执行截图命令，立即返回最终文件路径；
+    编码与写盘在有界线程池中完成，排队数达到上限时在调用线程同步完成。
+    文件名为 {worker}-{用例}-{序号:03d}-{名称}.{扩展名}，并行worker之间不会互相覆盖。
+    """
+
+    def __init__(
+        self,
+        directory=None,
+        fmt="png",
+        quality=80,
+        max_width=0,
+        workers=2,
+        queue_size=16,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"不支持的截图格式: {fmt}（可选: {', '.join(FORMATS)}）")
+        self.directory = directory or SCREENSHOTS_DIR
+        self.fmt = fmt
+        self.quality = quality
+        self.max_width = max_width
+        self.workers = workers
+        self.worker = _slug(os.getenv("PYTEST_XDIST_WORKER", "main"))
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._sequences = {}  # 用例名 -> 序号计数器
+        self.saved = 0
+        self.failed = 0
+        self.sync_writes = 0
+
+    def path_for(self, name, test=None):
+        """为本次截图分配文件路径（同一用例内序号递增）"""
+        test = _slug(test or current_test())
+        with self._lock:
+            counter = self._sequences.setdefault(test, itertools.count(1))
+            seq = next(counter)
+        filename = f"{self.worker}-{test}-{seq:03d}-{_slug(name)}{FORMATS[self.fmt]}"
+        return self.directory / filename
+
+    def capture(self, driver, name="screenshot", test=None):
+        """
+        截图并异步保存
+        :return: 文件路径（写盘可能尚未完成，需要读取文件时先调用flush()）
+        """
+        png = driver.get_screenshot_as_png()
+        return self.save(png, name, test)
+
+    def save(self, png, name="screenshot", test=None):
+        """保存已获取的PNG字节，返回文件路径"""
+        path = self.path_for(name, test)
+        if not self._slots.acquire(blocking=False):
+            logger.warning("截图队列已满，同步写入: %s", path.name)
+            self.sync_writes += 1
+            self._write(png, path)
+            return path
+        try:
+            future = self._get_executor().submit(self._write, png, path)
+        except RuntimeError:
+            # 线程池已关闭（会话结束后仍有截图）
+            self._slots.release()
+            self._write(png, path)
+            return path
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return path
+
+    def flush(self, timeout=30):
+        """等待已提交的截图全部写盘，返回是否全部完成"""
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning("仍有 %d 张截图未写完", len(not_done))
+        return not not_done
+
+    def shutdown(self, timeout=30):
+        """写完剩余截图并关闭线程池"""
+        self.flush(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def report(self):
+        return (
+            f"截图统计: 保存 {self.saved} 张，失败 {self.failed} 张，"
+            f"队列满同步写入 {self.sync_writes} 张（格式 {self.fmt}）"
+        )
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="screenshot"
+                )
+            return self._executor
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def _write(self, png, path):
+        try:
+            data = encode(png, self.fmt, self.quality, self.max_width)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再改名，读取方不会看到写了一半的图片
+            partial = path.with_name(path.name + ".part")
+            partial.write_bytes(data)
+            os.replace(partial, path)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.error("截图保存失败: %s - %s", path.name, e)
+            return None
+        with self._lock:
+            self.saved += 1
+        logger.debug("截图保存到: %s", path)
+        return path
+
+
+def get_screenshot_service():
+    """进程内共享的截图服务（按 screenshot 配置创建）"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScreenshotService(
+                fmt=config.get("screenshot.format", "png"),
+                quality=config.get("screenshot.quality", 80),
+                max_width=config.get("screenshot.max_width", 0),
+                workers=config.get("screenshot.workers", 2),
+                queue_size=config.get("screenshot.queue_size", 16),
+            )
+        return _service
+
+
+def shutdown_screenshot_service():
+    """测试会话结束时调用：写完剩余截图并输出统计"""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.shutdown()
+        logger.info(service.report())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  session_recovery.py
+@Time    :  2026/10/16 14:05:09
+@Author  :  owl
+@Desp    :  浏览器会话健康检查与原地恢复
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from selenium.webdriver.remote.command import Command
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from .logger import logger
+
+# 会话已失效的错误特征（标签页崩溃、浏览器断开、Grid节点丢失会话）
+_DEAD_SESSION_MARKERS = (
+    "invalid session id",
+    "no such session",
+    "session deleted",
+    "tab crashed",
+    "chrome not reachable",
+    "not connected to devtools",
+    "browsing context has been discarded",
+    "session timed out or not found",
+    "unable to find session",
+)
+
+# 可以在恢复后安全重试一次的命令（不依赖旧会话中的元素ID，重复执行无副作用）
+IDEMPOTENT_COMMANDS = {
+    Command.GET,
+    Command.GET_CURRENT_URL,
+    Command.GET_TITLE,
+    Command.GET_PAGE_SOURCE,
+    Command.FIND_ELEMENT,
+    Command.FIND_ELEMENTS,
+    Command.GET_ALL_COOKIES,
+    Command.W3C_GET_WINDOW_HANDLES,
+    Command.W3C_GET_CURRENT_WINDOW_HANDLE,
+    Command.GET_WINDOW_RECT,
+    Command.SCREENSHOT,
+    Command.REFRESH,
+}
+
+# 可能改变URL或cookies的命令（点击、输入回车提交表单、动作链等），执行后恢复点需要更新
+STATE_CHANGING_COMMANDS = {
+    Command.GET,
+    Command.REFRESH,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.CLICK_ELEMENT,
+    Command.SEND_KEYS_TO_ELEMENT,
+    Command.W3C_ACTIONS,
+    Command.ADD_COOKIE,
+    Command.DELETE_COOKIE,
+    Command.DELETE_ALL_COOKIES,
+}
+
+# 会话恢复记录（每个worker进程内）
+_events_lock = threading.Lock()
+recovery_events = []
+
+
+def is_dead_session_error(error):
+    """判断异常是否表示会话已失效"""
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    if isinstance(error, (ConnectionError, Urllib3HTTPError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or "").lower()
+        return any(marker in message for marker in _DEAD_SESSION_MARKERS)
+    return False
+
+
+def probe_session(driver):
+    """低成本存活探测（一次获取窗口句柄），不触发自动恢复"""
+    guard = getattr(driver, "_session_guard", None)
+    execute = guard.raw_execute if guard else driver.execute
+    try:
+        execute(Command.W3C_GET_WINDOW_HANDLES)
+        return True
+    except Exception as e:
+        if is_dead_session_error(e):
+            logger.warning("会话存活探测失败: %s", e)
+            return False
+        raise
+
+
+def recovery_report():
+    """会话恢复统计报告"""
+    with _events_lock:
+        events = list(recovery_events)
+    if not events:
+        return "会话恢复统计: 无"
+    succeeded = [e for e in events if e["success"]]
+    total_time = sum(e["duration"] for e in events)
+    return (
+        f"会话恢复统计: 恢复 {len(events)} 次，成功 {len(succeeded)} 次，"
+        f"重试命令 {sum(1 for e in events if e['retried'])} 次，总耗时 {total_time:.3f}s"
+    )
+
+
+class SessionGuard:
+    """
+    会话守卫
+
+    接管driver.execute：命令因会话失效而失败时，在同一个driver对象上重新创建
+    会话，恢复最近记录的URL和cookies，并对幂等命令重试一次。页面对象持有的
+    driver引用保持不变，因此对用例透明。
+
+    恢复点延迟记录：跳转、点击、输入等可能改变URL或cookies的命令只把会话标记为
+    “已变化”，等下一条其他命令（通常是随后的查找或等待，此时页面与cookies已经
+    稳定）执行前才记录一次。记录需要两次请求（当前URL + 全部cookies），连续的
+    多个操作只记录一次，且两次记录至少间隔 snapshot_interval 秒；因此恢复出的
+    状态最多落后于崩溃前 snapshot_interval 秒内的变化。
+    """
+
+    def __init__(self, driver, capabilities, on_recover=None, snapshot_interval=2.0):
+        """
+        :param driver: WebDriver实例
+        :param capabilities: 创建会话时使用的能力（用于重新创建会话）
+        :param on_recover: 新会话创建后的回调（如重新应用驱动配置）
+        :param snapshot_interval: 两次记录恢复点的最小间隔（秒），None表示不记录cookies
+        """
+        self.driver = driver
+        self.capabilities = capabilities
+        self.on_recover = on_recover
+        self.snapshot_interval = snapshot_interval
+        self.raw_execute = driver.execute
+        self.last_url = None
+        self.cookies = []
+        self.snapshots = 0
+        self._changed = False
+        self._last_snapshot = None
+        self._recovering = False
+        driver.execute = self.execute
+        driver._session_guard = self
+
+    def execute(self, driver_command, params=None):
+        """带自动恢复的命令执行"""
+        if (
+            self._changed
+            and not self._recovering
+            and driver_command not in STATE_CHANGING_COMMANDS
+        ):
+            self._checkpoint()
+        try:
+            response = self.raw_execute(driver_command, params)
+        except Exception as e:
+            if self._recovering or not is_dead_session_error(e):
+                raise
+            retry = driver_command in IDEMPOTENT_COMMANDS
+            self.recover(e, driver_command, retry)
+            if not retry:
+                raise
+            logger.info("会话恢复后重试命令: %s", driver_command)
+            response = self.raw_execute(driver_command, params)
+
+        if driver_command in STATE_CHANGING_COMMANDS and not self._recovering:
+            if driver_command == Command.GET:
+                # 跳转目标已知，不需要额外请求
+                self.last_url = params["url"]
+            self._changed = self.snapshot_interval is not None
+        return response
+
+    def _checkpoint(self):
+        """状态变化后的首条其他命令前记录恢复点（受最小间隔限制）"""
+        now = time.monotonic()
+        if (
+            self._last_snapshot is not None
+            and now - self._last_snapshot < self.snapshot_interval
+        ):
+            return
+        self._changed = False
+        self._last_snapshot = now
+        self.snapshot()
+
+    def snapshot(self, url=None):
+        """记录当前URL和cookies，作为恢复点"""
+        try:
+            self.last_url = url or self.raw_execute(Command.GET_CURRENT_URL)["value"]
+            self.cookies = self.raw_execute(Command.GET_ALL_COOKIES)["value"] or []
+            self.snapshots += 1
+        except Exception as e:
+            logger.debug("记录会话恢复点失败: %s", e)
+
+    def recover(self, error, driver_command, retried):
+        """重新创建会话并恢复URL与cookies"""
+        logger.warning("检测到会话失效（命令: %s）: %s", driver_command, error)
+        self._recovering = True
+        start = time.perf_counter()
+        success = False
+        try:
+            try:
+                # 尽量释放旧会话（Grid上可以腾出槽位）
+                self.raw_execute(Command.QUIT)
+            except Exception:
+                pass
+            self.driver.start_session(self.capabilities)
+            if self.on_recover:
+                self.on_recover(self.driver)
+            self._restore()
+            success = True
+            logger.info("会话已恢复: %s，URL: %s", self.driver.session_id, self.last_url)
+        except Exception as e:
+            logger.error("会话恢复失败: %s", e)
+            raise error from e
+        finally:
+            self._recovering = False
+            duration = time.perf_counter() - start
+            with _events_lock:
+                recovery_events.append(
+                    {
+                        "command": driver_command,
+                        "error": str(error).splitlines()[0] if str(error) else "",
+                        "duration": duration,
+                        "retried": retried and success,
+                        "success": success,
+                        "url": self.last_url,
+                    }
+                )
+
+    def _restore(self):
+        if not self.last_url or not self.last_url.startswith("http"):
+            return
+        self.raw_execute(Command.GET, {"url": self.last_url})
+        for cookie in self.cookies:
+            try:
+                self.raw_execute(Command.ADD_COOKIE, {"cookie": cookie})
+            except Exception as e:
+                logger.debug("恢复cookie失败: %s - %s", cookie.get("name"), e)
+        if self.cookies:
+            self.raw_execute(Command.GET, {"url": self.last_url})
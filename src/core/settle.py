@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  settle.py
+@Time    :  2026/10/16 19:31:18
+@Author  :  owl
+@Desp    :  界面稳定检测：滚动结束、动画完成、布局静止后立即返回，替代固定sleep
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from configs import config
+
+from .dom_script import SETTLE_JS
+from .logger import logger
+
+# 稳定检测累计统计（每个worker进程内），只保留汇总值，长时间运行也不会增长
+_stats_lock = threading.Lock()
+settle_stats = {"count": 0, "unsettled": 0, "spent": 0.0, "baseline": 0.0}
+
+
+def _record(elapsed, baseline, settled):
+    with _stats_lock:
+        settle_stats["count"] += 1
+        settle_stats["unsettled"] += 0 if settled else 1
+        settle_stats["spent"] += elapsed
+        settle_stats["baseline"] += baseline
+
+
+def wait_for_settle(
+    driver,
+    element=None,
+    scroll=True,
+    animations=True,
+    layout=False,
+    visible=False,
+    max_wait=None,
+    baseline=0.0,
+    label="",
+):
+    """
+    等待界面稳定
+    :param element: 关注的元素（layout/visible检测需要）
+    :param scroll: 检测页面滚动是否结束
+    :param animations: 检测CSS过渡/动画是否完成
+    :param layout: 检测元素位置尺寸是否静止
+    :param visible: 要求元素可见（如悬停菜单）
+    :param max_wait: 最长等待时间（秒），默认取 webdriver.settle.max_wait
+    :param baseline: 被替代的固定等待时长（秒），用于统计节省的时间
+    :param label: 日志与统计中的名称
+    :return: 是否在最长等待时间内稳定
+    """
+    if max_wait is None:
+        max_wait = config.get("webdriver.settle.max_wait", 2)
+    options = {
+        "scroll": scroll,
+        "animations": animations,
+        "layout": layout and element is not None,
+        "visible": visible and element is not None,
+        "frames": config.get("webdriver.settle.stable_frames", 3),
+        "max_ms": max_wait * 1000,
+    }
+    start = time.perf_counter()
+    settled = False
+    while True:
+        remaining = max_wait - (time.perf_counter() - start)
+        options["max_ms"] = max(remaining, 0) * 1000
+        try:
+            settled = driver.execute_async_script(SETTLE_JS, options, element)["settled"]
+            break
+        except WebDriverException as e:
+            # 页面跳转中脚本会被中断，稍后重试直到超出上限
+            if time.perf_counter() - start >= max_wait:
+                logger.debug("界面稳定检测失败: %s - %s", label, e.msg)
+                break
+            time.sleep(0.05)
+
+    elapsed = time.perf_counter() - start
+    _record(elapsed, baseline, settled)
+    if not settled:
+        logger.debug("界面在 %ss 内未稳定: %s", max_wait, label)
+    logger.debug("界面稳定检测: %s，耗时 %.3fs（原固定等待 %ss）", label, elapsed, baseline)
+    return settled
+
+
+def record_settle(label, elapsed, baseline, settled=True):
+    """记录一次不经过注入脚本的稳定等待（如系统文件对话框）"""
+    _record(elapsed, baseline, settled)
+
+
+def settle_report():
+    """稳定检测统计报告"""
+    with _stats_lock:
+        stats = dict(settle_stats)
+    if not stats["count"]:
+        return "界面稳定检测统计: 无"
+    spent, baseline = stats["spent"], stats["baseline"]
+    return (
+        f"界面稳定检测统计: {stats['count']} 次（{stats['unsettled']} 次达到上限），"
+        f"实际等待 {spent:.3f}s，原固定等待 {baseline:.3f}s，节省 {baseline - spent:.3f}s"
+    )
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  startup_cache.py
+@Time    :  2026/10/16 12:10:33
+@Author  :  owl
+@Desp    :  浏览器启动缓存：驱动路径与浏览器路径持久化，跳过Selenium Manager
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+from pathlib import Path
+
+from configs.path import CACHE_DIR
+
+from .logger import logger
+
+
+def current_platform():
+    """当前平台标识，如 linux-x86_64、win32-AMD64"""
+    return f"{sys.platform}-{platform.machine()}"
+
+
+def _fingerprint(path):
+    """文件指纹（修改时间+大小），浏览器升级后指纹变化，缓存随之失效"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class DriverStartupCache:
+    """
+    浏览器启动缓存
+
+    以 平台/浏览器/浏览器版本 为键，保存Selenium Manager解析出的驱动路径和
+    浏览器路径。命中后直接用缓存路径创建Service，不再调用Selenium Manager，
+    离线环境也能启动。浏览器选项模板只在进程内缓存（DriverManager）。
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file or CACHE_DIR / "driver_startup.json")
+        self._lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def make_key(browser_type, version):
+        return f"{current_platform()}/{browser_type}/{version}"
+
+    def lookup(self, browser_type):
+        """
+        查找当前平台下可用的缓存项
+        :return: 缓存项字典，没有或已失效时返回None
+        """
+        prefix = f"{current_platform()}/{browser_type}/"
+        for key, entry in self._load().items():
+            if not key.startswith(prefix):
+                continue
+            if not Path(entry["driver_path"]).is_file():
+                continue
+            browser_path = entry.get("browser_path")
+            if browser_path and _fingerprint(browser_path) != entry.get(
+                "browser_fingerprint"
+            ):
+                continue
+            return entry
+        return None
+
+    def store(self, browser_type, version, driver_path, browser_path):
+        """保存一次成功启动的解析结果"""
+        key = self.make_key(browser_type, version)
+        entry = {
+            "browser": browser_type,
+            "version": version,
+            "platform": current_platform(),
+            "driver_path": str(driver_path),
+            "browser_path": str(browser_path) if browser_path else None,
+            "browser_fingerprint": _fingerprint(browser_path) if browser_path else None,
+        }
+        with self._lock:
+            entries = self._load()
+            # 同一浏览器只保留当前版本
+            prefix = f"{current_platform()}/{browser_type}/"
+            for stale in [k for k in entries if k.startswith(prefix) and k != key]:
+                del entries[stale]
+            entries[key] = entry
+            self._save(entries)
+        logger.info("已缓存浏览器启动信息: %s -> %s", key, driver_path)
+
+    def invalidate(self, browser_type=None):
+        """清除缓存（不指定浏览器时全部清除）"""
+        with self._lock:
+            entries = self._load()
+            if browser_type is None:
+                entries.clear()
+            else:
+                prefix = f"{current_platform()}/{browser_type}/"
+                for key in [k for k in entries if k.startswith(prefix)]:
+                    del entries[key]
+            self._save(entries)
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries):
+        """原子写入，避免多个worker同时写坏文件"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  tab_isolation.py
+@Time    :  2026/10/16 15:10:22
+@Author  :  owl
+@Desp    :  标签页级隔离：多个逻辑会话共享一个浏览器进程
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+
+from configs.path import CACHE_DIR
+
+from .logger import logger
+
+# xdist多个worker共享宿主浏览器时的协调文件目录
+SHARED_BROWSER_DIR = CACHE_DIR / "shared_browser"
+
+# 驱动能力中记录调试地址的字段
+_DEBUGGER_CAPABILITY = {
+    "chrome": "goog:chromeOptions",
+    "edge": "ms:edgeOptions",
+}
+
+
+def context_window_handles(driver):
+    """
+    当前会话可见的窗口句柄
+
+    共享浏览器中window_handles会列出所有上下文的标签页，
+    隔离会话只返回属于自己浏览器上下文的句柄。
+    """
+    context = getattr(driver, "_browser_context", None)
+    if context is None:
+        return driver.window_handles
+    targets = driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+    own = {
+        t["targetId"]
+        for t in targets
+        if t.get("browserContextId") == context and t.get("type") == "page"
+    }
+    return [handle for handle in driver.window_handles if handle in own]
+
+
+class SharedBrowser:
+    """
+    共享浏览器进程（仅Chromium内核：Chrome/Edge）
+
+    宿主会话负责拉起浏览器；每个逻辑会话是一个附加到同一浏览器的轻量驱动会话，
+    通过CDP Target.createBrowserContext获得独立的cookie与存储，
+    并在自己的上下文中打开一个标签页。
+
+    xdist运行时同一台机器上的worker共享一个宿主：第一个worker用锁文件抢到启动权，
+    启动后把调试地址写入地址文件，其他worker读取后直接附加。每个worker使用期间
+    登记一个使用者标记，启动宿主的worker退出前等待其他worker全部注销再关闭宿主。
+    """
+
+    def __init__(
+        self,
+        browser_type,
+        launcher,
+        attacher,
+        configure=None,
+        debugger_address=None,
+        run_id=None,
+        state_dir=None,
+        start_timeout=60,
+        linger_timeout=1800,
+    ):
+        """
+        :param browser_type: chrome 或 edge
+        :param launcher: 启动宿主浏览器的可调用对象，返回宿主驱动
+        :param attacher: 附加到调试地址的可调用对象，返回新的驱动会话
+        :param configure: 逻辑会话切换到自己的标签页后的配置回调（与普通会话一致的驱动设置）
+        :param debugger_address: 外部已启动浏览器的调试地址（host:port），
+                                 指定后不再自行启动宿主
+        :param run_id: 运行ID，同一次运行的worker共享一个宿主（默认取xdist的运行ID，
+                       非xdist运行时每个进程自行启动宿主）
+        :param state_dir: 协调文件目录
+        :param start_timeout: 等待其他worker启动宿主的超时时间（秒）
+        :param linger_timeout: 关闭宿主前等待其他worker注销的最长时间（秒）
+        """
+        if browser_type not in _DEBUGGER_CAPABILITY:
+            raise ValueError(f"标签页隔离模式不支持的浏览器类型: {browser_type}")
+        self.browser_type = browser_type
+        self.debugger_address = debugger_address
+        self._launcher = launcher
+        self._attacher = attacher
+        self._configure = configure
+        self._host_driver = None
+        self._lock = threading.Lock()
+        self.contexts = 0
+        self.run_id = None if debugger_address else (
+            run_id or os.getenv("PYTEST_XDIST_TESTRUNUID")
+        )
+        self.start_timeout = start_timeout
+        self.linger_timeout = linger_timeout
+        state_dir = state_dir or SHARED_BROWSER_DIR
+        name = f"{browser_type}-{self.run_id}"
+        self._lock_file = state_dir / f"{name}.lock"
+        self._address_file = state_dir / f"{name}.address"
+        self._failed_file = state_dir / f"{name}.failed"
+        self._users_dir = state_dir / f"{name}.users"
+        self._user_file = None
+        self._owns_shared_host = False
+
+    def open_context(self):
+        """创建一个隔离的逻辑会话"""
+        self._ensure_started()
+        driver = self._attacher(self.browser_type, self.debugger_address)
+        driver._shared_browser = self
+        try:
+            self.isolate(driver)
+            # 按标签页生效的设置（资源屏蔽、网络计数等）需要在新标签页上执行
+            if self._configure is not None:
+                self._configure(driver)
+        except Exception:
+            driver.quit()
+            raise
+        with self._lock:
+            self.contexts += 1
+        logger.info(
+            "已创建隔离浏览器上下文: %s，共享浏览器: %s",
+            driver._browser_context,
+            self.debugger_address,
+        )
+        return driver
+
+    def isolate(self, driver):
+        """
+        为驱动会话创建独立的浏览器上下文，并切换到该上下文中的新标签页
+        （会话恢复重建附加会话后也会再次调用）
+        """
+        context_id = driver.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": True}
+        )["browserContextId"]
+        target_id = driver.execute_cdp_cmd(
+            "Target.createTarget",
+            {"url": "about:blank", "browserContextId": context_id},
+        )["targetId"]
+        driver.switch_to.window(target_id)
+        driver._browser_context = context_id
+        return context_id
+
+    def close_context(self, driver):
+        """销毁逻辑会话的浏览器上下文（附加会话退出不会关闭共享浏览器）"""
+        context_id = getattr(driver, "_browser_context", None)
+        try:
+            if context_id:
+                driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": context_id}
+                )
+                logger.info("已销毁隔离浏览器上下文: %s", context_id)
+        except Exception as e:
+            logger.warning("销毁浏览器上下文失败: %s", e)
+        finally:
+            with self._lock:
+                self.contexts -= 1
+            driver.quit()
+
+    def close(self):
+        """注销本worker的使用者标记，关闭自行启动的宿主浏览器"""
+        with self._lock:
+            host, self._host_driver = self._host_driver, None
+            user_file, self._user_file = self._user_file, None
+            owns_shared_host, self._owns_shared_host = self._owns_shared_host, False
+        if user_file is not None:
+            user_file.unlink(missing_ok=True)
+        if host is None:
+            return
+        if owns_shared_host:
+            self._wait_for_users()
+            # 之后才来的worker不再附加到即将关闭的宿主
+            self._address_file.unlink(missing_ok=True)
+            self._failed_file.touch()
+        logger.info("关闭共享浏览器")
+        host.quit()
+        if owns_shared_host:
+            self._lock_file.unlink(missing_ok=True)
+            self._failed_file.unlink(missing_ok=True)
+            try:
+                self._users_dir.rmdir()
+            except OSError:
+                pass
+
+    def _ensure_started(self):
+        with self._lock:
+            if self.debugger_address:
+                return
+            if self.run_id is None:
+                self._launch()
+                return
+            self._users_dir.mkdir(parents=True, exist_ok=True)
+            # 先登记为使用者，启动宿主的worker不会在附加前关闭宿主
+            self._user_file = self._users_dir / f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            self._user_file.touch()
+            try:
+                fd = os.open(self._lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self.debugger_address = self._wait_address()
+                if self.debugger_address is None:
+                    # 共享宿主不可用时本worker自行启动，不再占用使用者标记
+                    self._user_file.unlink(missing_ok=True)
+                    self._user_file = None
+                    self._launch()
+                return
+            os.close(fd)
+            try:
+                self._launch()
+            except Exception:
+                # 通知等待中的worker不再等待
+                self._failed_file.touch()
+                raise
+            self._owns_shared_host = True
+            tmp_file = self._address_file.with_name(
+                f"{self._address_file.name}.{os.getpid()}.tmp"
+            )
+            tmp_file.write_text(self.debugger_address, encoding="utf-8")
+            os.replace(tmp_file, self._address_file)
+
+    def _launch(self):
+        logger.info("启动共享浏览器: %s", self.browser_type)
+        self._host_driver = self._launcher()
+        capability = _DEBUGGER_CAPABILITY[self.browser_type]
+        self.debugger_address = self._host_driver.capabilities[capability][
+            "debuggerAddress"
+        ]
+
+    def _wait_address(self):
+        """等待其他worker启动宿主，返回调试地址，启动失败或超时返回None"""
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if self._address_file.exists():
+                address = self._address_file.read_text(encoding="utf-8")
+                logger.info("附加到其他worker启动的共享浏览器: %s", address)
+                return address
+            if self._failed_file.exists():
+                logger.warning("其他worker启动的共享浏览器不可用，自行启动")
+                return None
+            time.sleep(0.2)
+        logger.warning("等待其他worker启动共享浏览器超时，自行启动")
+        return None
+
+    def _wait_for_users(self):
+        """等待其他worker注销（进程已退出的标记视为已注销）"""
+        deadline = time.monotonic() + self.linger_timeout
+        while True:
+            users = [
+                user
+                for user in self._users_dir.glob("*")
+                if _process_alive(int(user.name.split("-")[0]))
+            ]
+            if not users:
+                return
+            if time.monotonic() >= deadline:
+                logger.warning("等待其他worker注销共享浏览器超时: %s 个", len(users))
+                return
+            time.sleep(0.5)
+
+
+def _process_alive(pid):
+    """进程是否仍在运行（Windows上无法廉价判断，视为运行中，由超时兜底）"""
+    if sys.platform == "win32":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
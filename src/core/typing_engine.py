@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  typing_engine.py
+@Time    :  2026/10/16 20:08:55
+@Author  :  owl
+@Desp    :  模拟人工输入：整段文本编译为一个W3C Actions请求，按键间隔由浏览器执行
+"""
+
+import random
+
+from selenium.webdriver import ActionChains
+
+
+def keystroke_delays(count, delay=0.05, jitter=0.0, rng=None):
+    """
+    生成按键间隔
+    :param count: 按键数量
+    :param delay: 平均间隔（秒）
+    :param jitter: 抖动比例（0~1），间隔在 delay*(1±jitter) 内均匀分布
+    :return: 每个按键之后的间隔列表（最后一个按键之后为0）
+    """
+    if not 0 <= jitter <= 1:
+        raise ValueError(f"抖动比例应在0~1之间: {jitter}")
+    rng = rng or random.Random()
+    delays = [
+        max(delay * (1 + rng.uniform(-jitter, jitter)), 0.0) for _ in range(count - 1)
+    ]
+    return delays + [0.0] if count else []
+
+
+def compile_typing(driver, text, element=None, delay=0.05, jitter=0.0, hold=0.0, rng=None):
+    """
+    把整段输入编译为一组动作，调用一次perform()即可完成
+    :param element: 先点击聚焦的元素，为空时输入到当前焦点
+    :param delay: 按键间平均间隔（秒）
+    :param jitter: 间隔抖动比例（0~1）
+    :param hold: 每个按键按下的时长（秒）
+    :return: (ActionChains, 预计耗时秒)
+    """
+    chain = ActionChains(driver)
+    if element is not None:
+        chain.click(element)
+    delays = keystroke_delays(len(text), delay, jitter, rng)
+    for char, pause in zip(text, delays):
+        chain.key_down(char)
+        if hold:
+            chain.pause(hold)
+        chain.key_up(char)
+        if pause:
+            chain.pause(pause)
+    return chain, sum(delays) + hold * len(text)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  wait_engine.py
+@Time    :  2026/10/16 13:02:48
+@Author  :  owl
+@Desp    :  统一等待引擎：自适应轮询 + 用例级等待预算
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+
+from configs import config
+
+from .dom_script import (
+    READY_CHECK_JS,
+    WAIT_CONDITIONS,
+    WAIT_FOR_JS,
+    WAIT_MARKER_JS,
+    js_locator,
+)
+from .logger import logger
+
+# 轮询期间忽略的异常（元素尚未出现或刚被替换）
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+# 单次异步脚本的最长等待（秒），低于W3C默认的30s脚本超时，更长的等待分段执行
+BROWSER_WAIT_CHUNK = 25
+
+_local = threading.local()
+
+
+class WaitBudget:
+    """单个用例的等待时间预算，每次等待的耗时都计入其中"""
+
+    def __init__(self, total=0):
+        """
+        :param total: 预算总量（秒），0表示不限制
+        """
+        self.total = total
+        self.spent = 0.0
+        self.waits = 0
+
+    @property
+    def remaining(self):
+        if not self.total:
+            return float("inf")
+        return max(self.total - self.spent, 0.0)
+
+    def charge(self, seconds):
+        self.spent += seconds
+        self.waits += 1
+
+
+def start_wait_budget(total):
+    """为当前线程开启一个新的等待预算"""
+    _local.budget = WaitBudget(total)
+    return _local.budget
+
+
+def finish_wait_budget():
+    """结束当前线程的等待预算"""
+    return _local.__dict__.pop("budget", None)
+
+
+def bind_wait_budget(budget):
+    """让当前线程（如辅助线程）共用指定的等待预算，传None解除"""
+    if budget is None:
+        _local.__dict__.pop("budget", None)
+    else:
+        _local.budget = budget
+
+
+def current_wait_budget():
+    """当前线程的等待预算，没有时返回None"""
+    return getattr(_local, "budget", None)
+
+
+class WaitEngine:
+    """
+    统一等待引擎
+
+    替代隐式等待与固定0.5s轮询的WebDriverWait：前几次轮询间隔很短，之后按倍数
+    退避到上限，条件一满足立即返回；每次等待的超时不超过用例剩余预算。
+    接口与WebDriverWait兼容（until/until_not）。
+
+    wait_for 的常用条件可以交给浏览器判断（backend="browser"）：一次异步脚本
+    在DOM变化与每一帧时检查条件，不再从客户端逐次轮询。
+    """
+
+    def __init__(self, driver, timeout=None, backend=None):
+        self.driver = driver
+        self.timeout = timeout or config.get("webdriver.timeout", 10)
+        self.backend = backend or config.get("webdriver.wait.backend", "client")
+        self.poll_initial = config.get("webdriver.wait.poll_initial", 0.05)
+        self.poll_max = config.get("webdriver.wait.poll_max", 0.5)
+        self.poll_backoff = config.get("webdriver.wait.poll_backoff", 1.5)
+
+    def until(self, method, message="", timeout=None):
+        """等待method返回真值并返回该值"""
+        return self._wait(method, message, timeout, expect=True)
+
+    def until_not(self, method, message="", timeout=None):
+        """等待method返回假值"""
+        return self._wait(method, message, timeout, expect=False)
+
+    def wait_for(self, condition, locator=None, expected=None, timeout=None):
+        """
+        等待常用条件，返回条件满足时的值（元素、元素列表或True）
+        :param condition: presence, presence_all, visible, clickable, text（元素文本包含）,
+                          count（匹配数量等于）, title_is, title_contains, ready（就绪条件全部满足）
+        :param expected: text/count/title_* 的期望值，ready 的就绪条件列表（见 readiness.py）
+        """
+        if condition not in WAIT_CONDITIONS:
+            raise ValueError(f"不支持的等待条件: {condition}")
+        message = f"{condition}: {locator if locator is not None else expected}"
+        if self.backend == "browser":
+            return self._wait_in_browser(condition, locator, expected, timeout, message)
+        return self.until(_client_condition(condition, locator, expected), message, timeout)
+
+    def _wait_in_browser(self, condition, locator, expected, timeout, message):
+        timeout, budget = self._budgeted(timeout, message)
+        payload = {"type": condition, "expected": expected}
+        if locator is not None:
+            payload["by"], payload["value"] = js_locator(locator)
+
+        start = time.monotonic()
+        try:
+            while True:
+                remaining = timeout - (time.monotonic() - start)
+                payload["max_ms"] = max(min(remaining, BROWSER_WAIT_CHUNK), 0) * 1000
+                try:
+                    result = self.driver.execute_async_script(WAIT_FOR_JS, payload)
+                except JavascriptException:
+                    # 页面跳转会中断脚本，在新页面上继续等待；其他脚本错误直接抛出
+                    if not self._document_changed():
+                        raise
+                    result = None
+                    time.sleep(self.poll_initial)
+                if result is not None:
+                    if result.get("error"):
+                        raise InvalidSelectorException(f"{result['error']}（{message}）")
+                    if result["ok"]:
+                        return result["value"]
+                if time.monotonic() - start >= timeout:
+                    break
+        finally:
+            if budget is not None:
+                budget.charge(time.monotonic() - start)
+
+        logger.debug("等待超时（%.2fs，浏览器内）: %s", timeout, message)
+        raise TimeoutException(message)
+
+    def _document_changed(self):
+        """等待脚本报错后，当前文档上没有等待脚本留下的标记即说明页面已跳转"""
+        try:
+            return not self.driver.execute_script(WAIT_MARKER_JS)
+        except WebDriverException:
+            # 新页面仍在加载，探测脚本同样被中断
+            return True
+
+    def _budgeted(self, timeout, message):
+        """按用例剩余预算收紧超时"""
+        timeout = self.timeout if timeout is None else timeout
+        budget = current_wait_budget()
+        if budget is not None:
+            if budget.remaining <= 0:
+                raise TimeoutException(f"用例等待预算已耗尽（{budget.total}s）{message}")
+            timeout = min(timeout, budget.remaining)
+        return timeout, budget
+
+    def _wait(self, method, message, timeout, expect):
+        timeout, budget = self._budgeted(timeout, message)
+
+        start = time.monotonic()
+        delay = self.poll_initial
+        screen = None
+        stacktrace = None
+        try:
+            while True:
+                try:
+                    value = method(self.driver)
+                    if bool(value) == expect:
+                        return value if expect else True
+                except IGNORED_EXCEPTIONS as e:
+                    if not expect:
+                        return True
+                    screen = getattr(e, "screen", None)
+                    stacktrace = getattr(e, "stacktrace", None)
+
+                elapsed = time.monotonic() - start
+                if elapsed >= timeout:
+                    break
+                time.sleep(min(delay, timeout - elapsed))
+                delay = min(delay * self.poll_backoff, self.poll_max)
+        finally:
+            if budget is not None:
+                budget.charge(time.monotonic() - start)
+
+        logger.debug("等待超时（%.2fs）: %s", timeout, message)
+        raise TimeoutException(message, screen, stacktrace)
+
+
+def _client_condition(condition, locator, expected):
+    """wait_for 条件在客户端轮询时对应的expected_conditions"""
+    if condition == "presence":
+        return EC.presence_of_element_located(locator)
+    if condition == "presence_all":
+        return EC.presence_of_all_elements_located(locator)
+    if condition == "visible":
+        return EC.visibility_of_element_located(locator)
+    if condition == "clickable":
+        return EC.element_to_be_clickable(locator)
+    if condition == "text":
+        return EC.text_to_be_present_in_element(locator, expected)
+    if condition == "title_is":
+        return EC.title_is(expected)
+    if condition == "title_contains":
+        return EC.title_contains(expected)
+    if condition == "ready":
+        return lambda driver: not driver.execute_script(READY_CHECK_JS, expected)
+
+    def count_matches(driver):
+        elements = driver.find_elements(*locator)
+        return elements if len(elements) == expected else False
+
+    return count_matches
@@ -7,40 +7,418 @@
 @Desp    :  驱动管理
 """
 
+import copy
+import sys
 import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.selenium_manager import SeleniumManager
 from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
 
 from configs import config
 from configs.path import BASE_DIR, DRIVERS_DIR
 
+from .browser_profile import ProfileTemplate, find_headless_shell, performance_flags
+from .driver_lifecycle import DriverPrefetcher, DriverReaper
+from .driver_pool import DriverPool
+from .grid_admission import GridAdmissionController
 from .logger import logger
+from .network_policy import LOGGING_PREFS_CAPABILITY, BlockingPolicy
+from .readiness import install_network_shim, page_load_strategy
+from .screenshot_service import shutdown_screenshot_service
+from .session_recovery import SessionGuard, probe_session, recovery_report
+from .settle import settle_report
+from .startup_cache import DriverStartupCache
+from .tab_isolation import SharedBrowser, context_window_handles
+from .wait_engine import bind_wait_budget, current_wait_budget
+
+# 各浏览器的Service类与drivers目录下的驱动文件名
+_SERVICE_CLASSES = {
+    "chrome": ChromeService,
+    "firefox": FirefoxService,
+    "edge": EdgeService,
+}
+_OPTIONS_CLASSES = {
+    "chrome": ChromeOptions,
+    "firefox": FirefoxOptions,
+    "edge": EdgeOptions,
+}
+_LOCAL_DRIVER_CLASSES = {
+    "chrome": webdriver.Chrome,
+    "firefox": webdriver.Firefox,
+    "edge": webdriver.Edge,
+}
+_LOCAL_DRIVER_NAMES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+    "edge": "msedgedriver",
+}
+
+# 未指定角色时的默认会话
+DEFAULT_ROLE = "default"
+
+
+class DriverSession:
+    """一个命名的浏览器会话及其元数据"""
+
+    def __init__(self, role, driver, browser_type, test_name=None, record_video=False):
+        self.role = role
+        self.driver = driver
+        self.browser_type = browser_type
+        self.test_name = test_name
+        self.record_video = record_video
+        self.created_at = time.time()
+        self.owner = threading.current_thread().name
+
+    def __repr__(self):
+        return f"DriverSession(role={self.role!r}, browser={self.browser_type!r}, test={self.test_name!r})"
 
 
 class DriverManager:
     """浏览器驱动管理器"""
 
-    # 线程局部存储，每个线程独立驱动实例
+    # 线程局部存储，每个线程独立的命名会话 {角色: DriverSession}
     _local = threading.local()
     _current_config = config
-    _test_name = None
+    # 会话池（每个worker进程一个）
+    _pool = None
+    _pool_lock = threading.RLock()
+    # 后台预创建与异步回收
+    _prefetcher = None
+    _reaper = None
+    # Grid会话准入控制
+    _admission = None
+    # 启动缓存与浏览器选项模板
+    _startup_cache = None
+    _options_templates = {}
+    # 标签页隔离模式下的共享浏览器（按浏览器类型）
+    _shared_browsers = {}
+    # 资源屏蔽策略（False表示尚未加载配置）
+    _network_policy = False
+    # 预热的浏览器配置模板（按浏览器类型）
+    _profile_templates = {}
 
     @classmethod
-    def get_driver(cls, browser_type=None, test_name=None, record_video=False):
-        """获取浏览器驱动"""
-        cls._test_name = test_name
-        if not hasattr(cls._local, "driver"):
-            cls._local.driver = cls._create_driver(browser_type, record_video)
-        return cls._local.driver
+    def get_driver(
+        cls, browser_type=None, test_name=None, record_video=False, role=DEFAULT_ROLE
+    ):
+        """
+        获取浏览器驱动
+        :param role: 会话角色，不同角色是互相独立的浏览器会话（如 admin、reader）
+        """
+        sessions = cls._sessions()
+        session = sessions.get(role)
+        if session is None:
+            if browser_type is None:
+                browser_type = cls._current_config.webdriver.browser
+            driver = cls._acquire_driver(browser_type, record_video, test_name)
+            session = DriverSession(role, driver, browser_type, test_name, record_video)
+            sessions[role] = session
+            if role != DEFAULT_ROLE:
+                logger.info("创建命名会话: %s", session)
+        return session.driver
 
     @classmethod
-    def _create_driver(cls, browser_type, record_video):
+    def _sessions(cls):
+        """当前线程的命名会话"""
+        sessions = getattr(cls._local, "sessions", None)
+        if sessions is None:
+            sessions = cls._local.sessions = {}
+        return sessions
+
+    @classmethod
+    def get_session(cls, role=DEFAULT_ROLE):
+        """获取当前线程指定角色的会话（含元数据），不存在时返回None"""
+        return cls._sessions().get(role)
+
+    @classmethod
+    def run_parallel(cls, tasks, timeout=None):
+        """
+        在辅助线程中并发执行多个角色的操作
+        :param tasks: {角色: 以该角色driver为参数的可调用对象}，角色会话需已创建
+        :param timeout: 等待全部完成的超时时间（秒）
+        :return: {角色: 返回值}，任一操作失败时抛出其异常
+        """
+        sessions = cls._sessions()
+        missing = [role for role in tasks if role not in sessions]
+        if missing:
+            raise ValueError(f"会话尚未创建: {missing}")
+        # 辅助线程的等待同样计入当前用例的等待预算
+        budget = current_wait_budget()
+
+        def run(role, task):
+            bind_wait_budget(budget)
+            try:
+                return task(sessions[role].driver)
+            finally:
+                bind_wait_budget(None)
+
+        with ThreadPoolExecutor(
+            max_workers=len(tasks), thread_name_prefix="session"
+        ) as executor:
+            futures = {
+                role: executor.submit(run, role, task) for role, task in tasks.items()
+            }
+            return {role: future.result(timeout) for role, future in futures.items()}
+
+    @classmethod
+    def create_unmanaged_driver(cls, browser_type=None, cold_start=False):
+        """
+        创建一个本地浏览器驱动，不经过会话池、预创建和标签页隔离，也不登记为命名会话，
+        由调用方负责quit（如启动耗时基准）
+        :param browser_type: 浏览器类型: chrome, firefox, edge，默认取配置
+        :param cold_start: 是否先清除该浏览器的启动缓存，强制重新解析驱动
+        """
+        if browser_type is None:
+            browser_type = cls._current_config.webdriver.browser
+        cache = cls._get_startup_cache()
+        if cold_start and cache is not None:
+            cache.invalidate(browser_type)
+        driver = cls._create_local_driver(browser_type)
+        cls._get_reaper().track(driver)
+        return driver
+
+    @classmethod
+    def _get_pool(cls):
+        """获取会话池，未启用时返回None"""
+        if not cls._current_config.get("webdriver.pool.enabled", False):
+            return None
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = DriverPool(
+                    size=cls._current_config.get("webdriver.pool.size", 2),
+                    max_reuse=cls._current_config.get("webdriver.pool.max_reuse", 20),
+                    max_age=cls._current_config.get("webdriver.pool.max_age", 600),
+                    on_discard=cls._get_reaper().submit,
+                    probe=probe_session,
+                )
+        return cls._pool
+
+    @classmethod
+    def _get_reaper(cls):
+        """获取会话回收器"""
+        with cls._pool_lock:
+            if cls._reaper is None:
+                cls._reaper = DriverReaper(
+                    async_quit=cls._current_config.get(
+                        "webdriver.lifecycle.async_quit", True
+                    ),
+                    max_queue=cls._current_config.get(
+                        "webdriver.lifecycle.reaper_queue_size", 4
+                    ),
+                    quit_timeout=cls._current_config.get(
+                        "webdriver.lifecycle.quit_timeout", 15
+                    ),
+                )
+        return cls._reaper
+
+    @classmethod
+    def _get_prefetcher(cls):
+        """获取会话预创建器，未启用时返回None"""
+        if not cls._current_config.get("webdriver.lifecycle.prefetch", False):
+            return None
+        with cls._pool_lock:
+            if cls._prefetcher is None:
+                cls._prefetcher = DriverPrefetcher(cls._create_driver)
+        return cls._prefetcher
+
+    @classmethod
+    def _get_admission(cls, grid_url):
+        """获取Grid准入控制器，未启用时返回None"""
+        if not cls._current_config.get("webdriver.grid_admission.enabled", False):
+            return None
+        with cls._pool_lock:
+            if cls._admission is None:
+                cls._admission = GridAdmissionController(
+                    grid_url,
+                    max_wait=cls._current_config.get(
+                        "webdriver.grid_admission.max_wait", 300
+                    ),
+                    base_delay=cls._current_config.get(
+                        "webdriver.grid_admission.base_delay", 0.5
+                    ),
+                    max_delay=cls._current_config.get(
+                        "webdriver.grid_admission.max_delay", 10
+                    ),
+                )
+        return cls._admission
+
+    @classmethod
+    def _get_startup_cache(cls):
+        """获取启动缓存，未启用时返回None"""
+        if not cls._current_config.get("webdriver.startup_cache.enabled", False):
+            return None
+        with cls._pool_lock:
+            if cls._startup_cache is None:
+                cls._startup_cache = DriverStartupCache()
+        return cls._startup_cache
+
+    @classmethod
+    def _guard_session(cls, driver, options, browser_type, grid_url=None):
+        """启用会话恢复：会话失效时原地重建并恢复URL与cookies"""
+        if not cls._current_config.get("webdriver.recovery.enabled", False):
+            return
+
+        def on_recover(d):
+            shared = getattr(d, "_shared_browser", None)
+            if shared is not None:
+                # 重建的附加会话位于共享浏览器的默认上下文，需要重新隔离
+                shared.isolate(d)
+            cls._configure_driver(d, browser_type, grid_url)
+
+        SessionGuard(
+            driver,
+            options.to_capabilities(),
+            on_recover=on_recover,
+            snapshot_interval=cls._current_config.get(
+                "webdriver.recovery.snapshot_interval", 2.0
+            ),
+        )
+
+    @classmethod
+    def get_network_policy(cls):
+        """获取资源屏蔽策略，未启用时返回None"""
+        with cls._pool_lock:
+            if cls._network_policy is False:
+                cls._network_policy = BlockingPolicy.from_config(cls._current_config)
+        return cls._network_policy
+
+    @classmethod
+    def _performance_log_enabled(cls):
+        """是否需要性能日志（资源屏蔽统计或HAR录制）"""
+        return cls.get_network_policy() is not None or cls._current_config.get(
+            "webdriver.har.enabled", False
+        )
+
+    @classmethod
+    def _get_shared_browser(cls, browser_type):
+        """标签页隔离模式下获取共享浏览器，未启用或不适用时返回None"""
+        if not cls._current_config.get("webdriver.tab_isolation.enabled", False):
+            return None
+        if cls._current_config.webdriver.mode == "grid" or browser_type not in (
+            "chrome",
+            "edge",
+        ):
+            logger.warning("标签页隔离仅支持本地Chrome/Edge，%s使用独立浏览器", browser_type)
+            return None
+        with cls._pool_lock:
+            shared = cls._shared_browsers.get(browser_type)
+            if shared is None:
+                shared = SharedBrowser(
+                    browser_type,
+                    launcher=lambda: cls._create_driver(browser_type, False),
+                    attacher=cls._attach_browser,
+                    configure=lambda d: cls._configure_driver(d, browser_type),
+                    debugger_address=cls._current_config.get(
+                        "webdriver.tab_isolation.debugger_address", None
+                    ),
+                )
+                cls._shared_browsers[browser_type] = shared
+        return shared
+
+    @classmethod
+    def _get_profile_template(cls, browser_type):
+        """获取预热的配置模板，未启用或不适用时返回None"""
+        if browser_type not in ("chrome", "edge"):
+            return None
+        if not cls._current_config.get("webdriver.profile.template", False):
+            return None
+        with cls._pool_lock:
+            template = cls._profile_templates.get(browser_type)
+            if template is None:
+                template = ProfileTemplate(browser_type)
+                cls._profile_templates[browser_type] = template
+        if not template.ensure(lambda path: cls._warm_profile(browser_type, path)):
+            return None
+        return template
+
+    @classmethod
+    def _warm_profile(cls, browser_type, profile_dir):
+        """用模板目录启动一次浏览器并访问被测站点，预热首次运行初始化与HTTP缓存"""
+        options = cls._create_browser_options(browser_type, is_remote=False)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        # 预热需要把子资源都写入HTTP缓存，等页面完全加载
+        options.page_load_strategy = "normal"
+        driver, _, _ = cls._launch_local(browser_type, options)
+        try:
+            base_url = cls._current_config.base_url.rstrip("/")
+            for path in cls._current_config.get("webdriver.profile.warm_paths", ["/"]):
+                driver.get(f"{base_url}{path}")
+        finally:
+            driver.quit()
+
+    @classmethod
+    def _attach_browser(cls, browser_type, debugger_address):
+        """
+        创建附加到已运行浏览器的驱动会话（不会启动新的浏览器进程）
+        附加会话不能携带启动参数，页面加载策略与性能日志能力仍与普通会话一致；
+        驱动配置在切换到隔离标签页后由SharedBrowser调用_configure_driver完成
+        """
+        options = _OPTIONS_CLASSES[browser_type]()
+        options.debugger_address = debugger_address
+        options.page_load_strategy = cls._page_load_strategy()
+        if cls._performance_log_enabled():
+            options.set_capability(
+                LOGGING_PREFS_CAPABILITY[browser_type], {"performance": "ALL"}
+            )
+        service, _ = cls._resolve_service(browser_type, options)
+        # 附加模式下浏览器路径无意义
+        options.binary_location = ""
+        driver = _LOCAL_DRIVER_CLASSES[browser_type](service=service, options=options)
+        cls._get_reaper().track(driver)
+        cls._guard_session(driver, options, browser_type)
+        return driver
+
+    @classmethod
+    def _pool_key(cls, browser_type):
+        """会话池键：只有配置一致的会话才能复用"""
+        webdriver_config = cls._current_config.webdriver
+        return (webdriver_config.mode, browser_type, bool(webdriver_config.headless))
+
+    @classmethod
+    def _acquire_driver(cls, browser_type, record_video, test_name=None):
+        """优先从会话池获取驱动，未命中时创建新驱动"""
+        if browser_type is None:
+            browser_type = cls._current_config.webdriver.browser
+
+        # 录屏会话的文件名与用例绑定，不参与复用和预创建
+        if record_video:
+            return cls._create_driver(browser_type, record_video, test_name)
+
+        # 标签页隔离：在共享浏览器中开一个独立上下文
+        shared = cls._get_shared_browser(browser_type)
+        if shared is not None:
+            return shared.open_context()
+
+        key = cls._pool_key(browser_type)
+        pool = cls._get_pool()
+        prefetcher = cls._get_prefetcher()
+
+        driver = pool.acquire(key) if pool is not None else None
+        if driver is None:
+            if prefetcher is not None:
+                driver = prefetcher.take(key)
+            if driver is None:
+                driver = cls._create_driver(browser_type, record_video)
+            if pool is not None:
+                pool.register(driver, key)
+
+        # 当前会话用完后不会留在池中时，趁当前类执行期间预创建下一个会话
+        if prefetcher is not None and (pool is None or pool.will_retire(driver)):
+            prefetcher.prefetch(key, browser_type, False)
+        return driver
+
+    @classmethod
+    def _create_driver(cls, browser_type, record_video, test_name=None):
         """创建浏览器驱动"""
         # 从配置获取浏览器类型
         if browser_type is None:
@@ -50,10 +428,13 @@ class DriverManager:
         mode = cls._current_config.webdriver.mode
         if mode == "grid":
             logger.info("使用Selenium Grid分布式模式")
-            return cls._create_remote_driver(browser_type, record_video)
+            return cls._create_remote_driver(browser_type, record_video, test_name)
         else:
             logger.info("使用本地浏览器模式")
-            return cls._create_local_driver(browser_type)
+            driver = cls._create_local_driver(browser_type)
+            # 登记驱动进程，结束时清理残留进程
+            cls._get_reaper().track(driver)
+            return driver
 
     @classmethod
     def _create_local_driver(cls, browser_type=None):
@@ -61,7 +442,7 @@ class DriverManager:
         if browser_type is None:
             browser_type = cls._current_config.webdriver.browser
 
-        logger.info(f"启动本地浏览器: {browser_type}")
+        logger.info("启动本地浏览器: %s", browser_type)
 
         driver_creators = {
             "chrome": cls._create_chrome_driver,
@@ -76,32 +457,43 @@ class DriverManager:
             raise ValueError(f"不支持的浏览器类型: {browser_type}")
 
     @classmethod
-    def _create_remote_driver(cls, browser_type, record_video):
+    def _create_remote_driver(cls, browser_type, record_video, test_name=None):
         """创建远程浏览器驱动（Grid模式）"""
         if browser_type is None:
             browser_type = cls._current_config.webdriver.browser
 
         # 获取Grid Hub地址
         grid_url = cls._current_config.webdriver.grid_hub_url
-        logger.info(f"连接到Selenium Grid: {grid_url}, 浏览器: {browser_type}")
+        logger.info("连接到Selenium Grid: %s, 浏览器: %s", grid_url, browser_type)
 
         # 创建浏览器选项
         options = cls._create_browser_options(
-            browser_type, is_remote=True, record_video=record_video
+            browser_type, is_remote=True, record_video=record_video, test_name=test_name
         )
 
         try:
-            driver = webdriver.Remote(command_executor=grid_url, options=options)
+            admission = cls._get_admission(grid_url)
+            if admission is not None:
+                # 按Grid空闲槽位准入，排队超时自动退避重试
+                driver = admission.acquire_session(
+                    browser_type,
+                    lambda: webdriver.Remote(command_executor=grid_url, options=options),
+                )
+            else:
+                driver = webdriver.Remote(command_executor=grid_url, options=options)
         except Exception as e:
-            logger.error(f"连接到Selenium Grid失败: {e}")
+            logger.error("连接到Selenium Grid失败: %s", e)
             raise
 
         # 设置通用配置
         cls._configure_driver(driver, browser_type, grid_url)
+        cls._guard_session(driver, options, browser_type, grid_url)
         return driver
 
     @classmethod
-    def _create_browser_options(cls, browser_type, is_remote=False, record_video=False):
+    def _create_browser_options(
+        cls, browser_type, is_remote=False, record_video=False, test_name=None
+    ):
         """创建浏览器选项配置"""
         options_creators = {
             "chrome": cls._create_chrome_options,
@@ -113,10 +505,21 @@ class DriverManager:
         if not creator:
             raise ValueError(f"不支持的浏览器类型: {browser_type}")
 
-        return creator(is_remote, record_video)
+        # 远程录屏会话的能力中带有用例名，不使用模板
+        if is_remote and record_video:
+            return creator(is_remote, record_video, test_name)
+
+        # 同样配置的选项只构建一次，之后复制模板
+        key = (browser_type, is_remote, bool(cls._current_config.webdriver.headless))
+        with cls._pool_lock:
+            template = cls._options_templates.get(key)
+            if template is None:
+                template = creator(is_remote, record_video)
+                cls._options_templates[key] = template
+        return copy.deepcopy(template)
 
     @classmethod
-    def _create_chrome_options(cls, is_remote=False, record_video=False):
+    def _create_chrome_options(cls, is_remote=False, record_video=False, test_name=None):
         """创建Chrome选项"""
         options = ChromeOptions()
 
@@ -132,7 +535,7 @@ class DriverManager:
                 # options.set_capability("se:recordVideo", True)
                 # 录屏文件名称命名
                 logger.info(message="设置远程录屏")
-                options.set_capability("se:name", cls._test_name)
+                options.set_capability("se:name", test_name)
             else:
                 options.set_capability("se:recordVideo", False)
                 logger.info(message="禁止远程录屏")
@@ -145,6 +548,19 @@ class DriverManager:
             else:
                 options.add_argument("--headless=new")
                 options.add_argument("--disable-gpu")
+                # 本地有chrome-headless-shell时优先使用，启动更快、占用更少
+                if cls._current_config.get("webdriver.profile.headless_shell", False):
+                    shell = find_headless_shell()
+                    if shell:
+                        logger.info("使用chrome-headless-shell: %s", shell)
+                        options.binary_location = shell
+
+        # 性能参数组
+        if not is_remote:
+            for flag in performance_flags(
+                cls._current_config.get("webdriver.profile.flags", "default")
+            ):
+                options.add_argument(flag)
 
         # 禁用自动化提示
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -163,10 +579,18 @@ class DriverManager:
         }
         options.add_experimental_option("prefs", prefs)
 
+        # 资源屏蔽统计与HAR录制都读取性能日志中的Network事件
+        if not is_remote and cls._performance_log_enabled():
+            options.set_capability(
+                LOGGING_PREFS_CAPABILITY["chrome"], {"performance": "ALL"}
+            )
+
+        options.page_load_strategy = cls._page_load_strategy()
+
         return options
 
     @classmethod
-    def _create_firefox_options(cls, is_remote=False, record_video=False):
+    def _create_firefox_options(cls, is_remote=False, record_video=False, test_name=None):
         """创建Firefox选项"""
         options = FirefoxOptions()
 
@@ -176,7 +600,7 @@ class DriverManager:
                 logger.info("设置远程录屏")
                 options.set_capability("se:recordVideo", True)
                 # 录屏文件名称命名
-                options.set_capability("se:name", cls._test_name)
+                options.set_capability("se:name", test_name)
             else:
                 logger.info("禁止远程录屏")
                 options.set_capability("se:recordVideo", False)
@@ -185,10 +609,12 @@ class DriverManager:
         if headless:
             options.add_argument("--headless")
 
+        options.page_load_strategy = cls._page_load_strategy()
+
         return options
 
     @classmethod
-    def _create_edge_options(cls, is_remote=False, record_video=False):
+    def _create_edge_options(cls, is_remote=False, record_video=False, test_name=None):
         """创建Edge选项"""
         options = EdgeOptions()
 
@@ -197,7 +623,7 @@ class DriverManager:
             if record_video:
                 options.set_capability("se:recordVideo", True)
                 # 录屏文件名称命名
-                options.set_capability("se:name", cls._test_name)
+                options.set_capability("se:name", test_name)
             else:
                 options.set_capability("se:recordVideo", False)
 
@@ -205,18 +631,32 @@ class DriverManager:
         if headless:
             options.add_argument("--headless")
 
+        # 性能参数组
+        if not is_remote:
+            for flag in performance_flags(
+                cls._current_config.get("webdriver.profile.flags", "default")
+            ):
+                options.add_argument(flag)
+
+        # 资源屏蔽统计与HAR录制都读取性能日志中的Network事件
+        if not is_remote and cls._performance_log_enabled():
+            options.set_capability(
+                LOGGING_PREFS_CAPABILITY["edge"], {"performance": "ALL"}
+            )
+
+        options.page_load_strategy = cls._page_load_strategy()
+
         return options
 
     @classmethod
     def _configure_driver(cls, driver, browser_type, grid_url=None):
         """配置驱动的通用设置"""
-        # 设置隐式等待
-        timeout = cls._current_config.webdriver.timeout
-        driver.implicitly_wait(timeout)
+        # 关闭隐式等待，统一由WaitEngine显式等待，避免两者叠加
+        driver.implicitly_wait(0)
 
         # 记录启动信息
         grid_info = f"，Grid: {grid_url}" if grid_url else ""
-        logger.info(f"{browser_type}浏览器启动成功，隐式等待: {timeout}秒{grid_info}")
+        logger.info("%s浏览器启动成功%s", browser_type, grid_info)
 
         # Chrome特殊处理
         if browser_type == "chrome" and not grid_url:
@@ -225,25 +665,115 @@ class DriverManager:
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
 
+        # 资源屏蔽（仅支持CDP的本地Chrome/Edge，其他浏览器忽略）
+        policy = cls.get_network_policy()
+        if policy is not None and not grid_url:
+            policy.apply(driver, force=True)
+
+        # 网络请求计数，供页面就绪判断“网络空闲”使用（仅支持CDP的本地Chrome/Edge）
+        page_load = cls._current_config.get("webdriver.page_load.network_shim", False)
+        if page_load and not grid_url:
+            install_network_shim(driver)
+
     @classmethod
-    def _create_chrome_driver(cls):
-        """创建Chrome驱动"""
-        logger.debug("创建Chrome浏览器驱动")
+    def _page_load_strategy(cls):
+        """会话的页面加载策略（webdriver.page_load.strategy）"""
+        return page_load_strategy(
+            cls._current_config.get("webdriver.page_load.strategy", "normal")
+        )
 
-        options = cls._create_browser_options("chrome", is_remote=False)
+    @classmethod
+    def _resolve_service(cls, browser_type, options):
+        """
+        解析驱动路径：启动缓存 -> Selenium Manager -> drivers目录
+        :return: (Service, 是否命中启动缓存)
+        """
+        service_class = _SERVICE_CLASSES[browser_type]
+
+        cache = cls._get_startup_cache()
+        if cache is not None:
+            entry = cache.lookup(browser_type)
+            if entry:
+                logger.debug("启动缓存命中: %s %s", browser_type, entry["version"])
+                # 选项中已指定浏览器（如headless shell）时不覆盖
+                if entry["browser_path"] and not options.binary_location:
+                    options.binary_location = entry["browser_path"]
+                return service_class(entry["driver_path"]), True
 
         try:
-            # selenium4自动下载驱动
-            driver = webdriver.Chrome(options=options)
+            # selenium4自动解析驱动（同时会设置浏览器路径）
+            driver_path = SeleniumManager().driver_location(options)
         except Exception:
             logger.warning(
-                f"使用webdriver-manager安装失败: {traceback.format_exc()}, 尝试使用系统驱动"
+                "Selenium Manager解析驱动失败: %s, 尝试使用系统驱动",
+                traceback.format_exc(),
             )
-            logger.info("使用本地ChromeDriver驱动")
-            driver_path: Path = DRIVERS_DIR / "chromedriver.exe"
-            logger.info(f"本地ChromeDriver路径: {driver_path}")
-            service = ChromeService(str(driver_path))
-            driver = webdriver.Chrome(service=service, options=options)
+            suffix = ".exe" if sys.platform == "win32" else ""
+            driver_path: Path = DRIVERS_DIR / f"{_LOCAL_DRIVER_NAMES[browser_type]}{suffix}"
+            logger.info("本地驱动路径: %s", driver_path)
+        return service_class(str(driver_path)), False
+
+    @classmethod
+    def _remember_startup(cls, browser_type, driver, service, browser_path):
+        """首次启动成功后写入启动缓存"""
+        cache = cls._get_startup_cache()
+        if cache is None:
+            return
+        try:
+            cache.store(
+                browser_type,
+                version=driver.capabilities.get("browserVersion", "unknown"),
+                driver_path=service.path,
+                browser_path=browser_path,
+            )
+        except Exception as e:
+            logger.warning("写入启动缓存失败: %s", e)
+
+    @classmethod
+    def _launch_local(cls, browser_type, options):
+        """
+        启动本地驱动；使用启动缓存的驱动启动失败时（浏览器升级后驱动不匹配、
+        驱动文件被删除等）清除该浏览器的缓存，经Selenium Manager重新解析后重试一次
+        :return: (driver, Service, 是否命中启动缓存)
+        """
+        driver_class = _LOCAL_DRIVER_CLASSES[browser_type]
+        explicit_binary = getattr(options, "binary_location", None)
+        service, cached = cls._resolve_service(browser_type, options)
+        try:
+            return driver_class(service=service, options=options), service, cached
+        except Exception as e:
+            if not cached:
+                raise
+            logger.warning("使用缓存的驱动启动失败，清除启动缓存后重试: %s", e)
+        cls._get_startup_cache().invalidate(browser_type)
+        # 撤销缓存写入的浏览器路径，由Selenium Manager重新解析
+        options.binary_location = explicit_binary or ""
+        service, cached = cls._resolve_service(browser_type, options)
+        return driver_class(service=service, options=options), service, cached
+
+    @classmethod
+    def _start_local_browser(cls, browser_type):
+        """按解析出的驱动路径启动本地浏览器"""
+        options = cls._create_browser_options(browser_type, is_remote=False)
+        template = cls._get_profile_template(browser_type)
+        if template is not None:
+            # 每个会话使用模板的独立克隆，互不影响
+            options.add_argument(f"--user-data-dir={template.clone()}")
+        # 选项中显式指定的浏览器（如headless shell）不写入缓存，避免影响有头模式
+        explicit_binary = getattr(options, "binary_location", None)
+        driver, service, cached = cls._launch_local(browser_type, options)
+        if not cached:
+            browser_path = None if explicit_binary else getattr(options, "binary_location", None)
+            cls._remember_startup(browser_type, driver, service, browser_path)
+        cls._guard_session(driver, options, browser_type)
+        return driver
+
+    @classmethod
+    def _create_chrome_driver(cls):
+        """创建Chrome驱动"""
+        logger.debug("创建Chrome浏览器驱动")
+
+        driver = cls._start_local_browser("chrome")
 
         cls._configure_driver(driver, "chrome")
         return driver
@@ -253,8 +783,7 @@ class DriverManager:
         """创建Firefox驱动"""
         logger.debug("创建Firefox浏览器驱动")
 
-        options = cls._create_browser_options("firefox", is_remote=False)
-        driver = webdriver.Firefox(options=options)
+        driver = cls._start_local_browser("firefox")
 
         cls._configure_driver(driver, "firefox")
         return driver
@@ -264,29 +793,80 @@ class DriverManager:
         """创建Edge驱动"""
         logger.debug("创建Edge浏览器驱动")
 
-        options = cls._create_browser_options("edge", is_remote=False)
-        driver = webdriver.Edge(options=options)
+        driver = cls._start_local_browser("edge")
 
         cls._configure_driver(driver, "edge")
         return driver
 
     @classmethod
-    def quit_driver(cls):
-        """退出浏览器驱动"""
-        if hasattr(cls._local, "driver"):
-            try:
-                logger.info("关闭浏览器")
-                cls._local.driver.quit()
-            except Exception as e:
-                logger.error(f"关闭浏览器时发生错误: {e}")
-            finally:
-                del cls._local.driver
+    def quit_driver(cls, role=DEFAULT_ROLE):
+        """退出浏览器驱动（启用会话池时归还到池中）"""
+        session = cls._sessions().pop(role, None)
+        if session is None:
+            return
+        driver = session.driver
+        try:
+            shared = getattr(driver, "_shared_browser", None)
+            if shared is not None:
+                shared.close_context(driver)
+                return
+            if cls._pool is not None and cls._pool.release(driver):
+                return
+            logger.info("关闭浏览器: %s", session.role)
+            cls._get_reaper().submit(driver)
+        except Exception as e:
+            logger.error("关闭浏览器时发生错误: %s", e)
+
+    @classmethod
+    def quit_all(cls):
+        """退出当前线程的全部命名会话"""
+        for role in list(cls._sessions()):
+            cls.quit_driver(role)
+
+    @classmethod
+    def shutdown(cls):
+        """测试会话结束时调用：关闭池中和预创建的会话，清理残留进程并输出统计"""
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+            prefetcher, cls._prefetcher = cls._prefetcher, None
+            admission, cls._admission = cls._admission, None
+            shared_browsers = list(cls._shared_browsers.values())
+            cls._shared_browsers.clear()
+        reaper = cls._get_reaper()
+        for shared in shared_browsers:
+            shared.close()
+        if prefetcher is not None:
+            prefetcher.shutdown(reaper.submit)
+        if pool is not None:
+            pool.close()
+            logger.info(pool.report())
+        if admission is not None:
+            logger.info(admission.report())
+        logger.info(recovery_report())
+        logger.info(settle_report())
+        shutdown_screenshot_service()
+        policy = cls._network_policy
+        if policy:
+            logger.info(
+                "资源屏蔽统计: 共屏蔽 %s 个请求，约节省 %s 字节",
+                policy.total_blocked,
+                policy.total_bytes(),
+            )
+        reaper.shutdown()
+        with cls._pool_lock:
+            cls._reaper = None
+            profile_templates = list(cls._profile_templates.values())
+            cls._profile_templates.clear()
+        # 浏览器全部退出后才能删除配置目录
+        for template in profile_templates:
+            template.cleanup()
 
     @classmethod
-    def get_current_driver(cls):
+    def get_current_driver(cls, role=DEFAULT_ROLE):
         """获取当前驱动实例"""
-        if hasattr(cls._local, "driver"):
-            return cls._local.driver
+        session = cls.get_session(role)
+        if session is not None:
+            return session.driver
         return None
 
     @classmethod
@@ -310,18 +890,18 @@ class DriverManager:
         """切换到新标签页"""
         driver = cls.get_current_driver()
         if driver:
-            window_handles = driver.window_handles
+            window_handles = context_window_handles(driver)
             if len(window_handles) > 1:
                 driver.switch_to.window(window_handles[-1])
-                logger.info(f"切换到新标签页，共 {len(window_handles)} 个标签页")
+                logger.info("切换到新标签页，共 %s 个标签页", len(window_handles))
 
     @classmethod
     def close_tab_and_switch_back(cls):
         """关闭当前标签页并切换回上一个"""
         driver = cls.get_current_driver()
-        if driver and len(driver.window_handles) > 1:
+        if driver and len(context_window_handles(driver)) > 1:
             driver.close()
-            driver.switch_to.window(driver.window_handles[0])
+            driver.switch_to.window(context_window_handles(driver)[0])
             logger.info("关闭标签页，切回主标签页")
 
     @classmethod
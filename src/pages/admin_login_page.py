@@ -7,13 +7,13 @@
 @Desp    :
 """
 
-from time import sleep
-
 from configs import config
 from src.core.base_page import BasePage
 from src.core.element_locator import name, xpath
 from src.utils.captcha_utils import CaptchaRecognizer
 
+IMAGE_LOADED_JS = "return arguments[0].complete && arguments[0].naturalWidth > 0;"
+
 
 class AdminLoginPage(BasePage):
     # 定位器常量
@@ -24,16 +24,41 @@ class AdminLoginPage(BasePage):
     # captcha_img = id("captcha-img")
     login_button = xpath("//button[@type='submit']")  # 根据实际页面调整
 
+    # 登录表单可用即可操作，不等图片、统计脚本等子资源
+    page_load_strategy = "eager"
+    ready_locator = login_button
+    page_path = "/admin/login"
+    # 后台未开启验证码时不存在
+    optional_locators = ("captcha_img", "captcha_input")
+
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{config.base_url}/admin/login"
+        self.admin_url = f"{config.base_url}/admin"
         self.captcha_tool = CaptchaRecognizer(use_ocr=True)  # 按需初始化
 
     def open(self):
         """跳转到管理员登录页"""
-        self.logger.info(f"打开登录页面: {self.url}")
-        self.driver.get(self.url)
-        self.wait_for_page_load()
+        self.logger.info("打开登录页面: %s", self.url)
+        self.navigate_to(self.url)
+
+    def login(self, username: str, pwd: str):
+        """通过登录页面完成UI登录（含验证码识别）"""
+        self.open()
+        self.input_username(username)
+        self.input_pwd(pwd)
+        self.input_captcha()
+        self.click_admin_login_btn()
+
+    def open_admin_home(self):
+        """直接打开后台首页（已登录时停留在后台，未登录会被重定向到登录页）"""
+        self.driver.get(self.admin_url)
+
+    def is_logged_in(self):
+        """当前是否处于已登录的后台页面"""
+        return "/admin/login" not in self.driver.current_url and "JPress后台" in (
+            self.driver.title
+        )
 
     def input_username(self, username: str):
         self.input_text(self.username_input, username)
@@ -44,8 +69,11 @@ class AdminLoginPage(BasePage):
     def input_captcha(self):
         captcha_text = self.handle_text_captcha()
         if captcha_text:
-            # 4. 填写到输入框
-            sleep(2)
+            # 4. 填写到输入框（等待登录表单布局稳定）
+            captcha_element = self.find_element(self.captcha_input)
+            self.wait_for_settle(
+                captcha_element, layout=True, visible=True, baseline=2, label="验证码输入框"
+            )
             self.input_text(self.captcha_input, captcha_text)
             return True
         return False
@@ -54,9 +82,18 @@ class AdminLoginPage(BasePage):
         self.click(self.login_button)
 
     def handle_text_captcha(self):
-        """处理字符验证码"""
-        # 1. 定位验证码图片元素
+        """处理字符验证码（页面未启用验证码时返回None）"""
+        # 登录页加载完成后验证码图片应已在DOM中，不存在时不再等满超时
+        if not self.exists_now(self.captcha_img):
+            self.logger.info("登录页未启用验证码")
+            return None
+        # 1. 定位验证码图片元素（页面按eager就绪，图片可能还在加载）
         captcha_element = self.find_element(self.captcha_img)
+        self.wait.until(
+            lambda d: d.execute_script(IMAGE_LOADED_JS, captcha_element),
+            "验证码图片加载",
+            timeout=5,
+        )
         # 2. 获取图片字节
         img_bytes = self.get_element_bytes(captcha_element)
         # 3. 识别
@@ -1,14 +1,23 @@
-from time import sleep
-
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
 from src.core.base_page import BasePage
 
 
 class ArticlePage(BasePage):
+    # 文章列表页（删除相关定位器所在页面），编辑相关定位器在写文章页
+    page_path = "/admin/article/list"
+    requires_login = True
+    locator_paths = {
+        "article_title_loc": "/admin/article/write",
+        "iframe_loc": "/admin/article/write",
+        "body_loc": "/admin/article/write",
+        "add_btn_loc": "/admin/article/write",
+    }
+    # 列表中没有文章时不存在
+    optional_locators = ("article_link_loc", "del_article_link_loc")
+
     def __init__(self, driver):
         BasePage.__init__(self, driver)
 
@@ -72,7 +81,8 @@ class ArticlePage(BasePage):
     def input_body(self, body):
         # frame1 = self.find_element(*self.iframe_loc)
         # self.driver.switch_to.frame(frame1)
-        self.input_text(self.body_loc, body)
+        # 正文可能很长，一次性粘贴到编辑器，不逐字符输入
+        self.paste_text(self.body_loc, body)
         # self.driver.switch_to.default_content()
 
     # 点击添加
@@ -90,15 +100,18 @@ class ArticlePage(BasePage):
 
     # 删除所有文章
     def del_all_article(self):
-        sleep(1)
+        # 等待菜单展开动画结束后再点击
+        self.wait_for_settle(baseline=1, label="文章菜单")
         self.find_element(self.click_article_manage_loc).click()
-        sleep(1)
+        # 列表页的批量删除按钮可见即可操作，不等整页资源加载完成
+        self.wait_until_ready(ready_locator=self.del_all_btn_loc)
+        self.wait_for_settle(baseline=1, label="文章列表")
 
         link = self.find_element(self.select_all_checkbox_loc)
         link.click()
 
         self.find_element(self.del_all_btn_loc).click()
 
-        WebDriverWait(self.driver, 5).until(EC.alert_is_present())
+        self.wait.until(EC.alert_is_present(), timeout=5)
         alert = self.driver.switch_to.alert
         alert.accept()
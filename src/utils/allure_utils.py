@@ -50,6 +50,16 @@ class AllureUtils:
             attachment_type=allure.attachment_type.JSON,
         )
 
+    @staticmethod
+    def attach_har(name, har_path):
+        """附加HAR文件到报告（不读入内存）"""
+        allure.attach.file(
+            str(har_path),
+            name=name,
+            attachment_type=allure.attachment_type.JSON,
+            extension="har",
+        )
+
     @staticmethod
     def attach_video(name, video_path):
         """附加视频到报告"""
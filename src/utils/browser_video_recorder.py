@@ -45,7 +45,7 @@ class BrowserVideoRecorder:
             self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "1"})
             return True
         except Exception as e:
-            logger.warning(f"CDP命令不支持，可能在分布式环境中: {e}")
+            logger.warning("CDP命令不支持，可能在分布式环境中: %s", e)
             logger.info("将使用桌面录屏作为备用方案")
             return False
 
@@ -63,7 +63,7 @@ class BrowserVideoRecorder:
         self.recording = True
         self.frames = []
         # 启动CDP录屏
-        logger.info(f"开始浏览器录屏，目标帧率: {self.fps} fps")
+        logger.info("开始浏览器录屏，目标帧率: %s fps", self.fps)
         self.driver.execute_cdp_cmd(
             "Page.startScreencast",
             {"format": "png", "quality": 80, "maxWidth": 1920, "maxHeight": 1080},
@@ -91,7 +91,7 @@ class BrowserVideoRecorder:
             if hasattr(self, "desktop_recorder"):
                 self.desktop_recorder.stop_recording(str(self.video_path))
             self.recording = False
-            logger.info(f"桌面录屏结束，视频保存至: {self.video_path}")
+            logger.info("桌面录屏结束，视频保存至: %s", self.video_path)
             return
 
         self.recording = False
@@ -102,12 +102,12 @@ class BrowserVideoRecorder:
             self.thread.join(timeout=5)
         # 保存视频
         self._save_video()
-        logger.info(f"浏览器录屏结束，视频保存至: {self.video_path}")
+        logger.info("浏览器录屏结束，视频保存至: %s", self.video_path)
 
     def _capture_frames(self):
         """捕获帧"""
         frame_interval = 1.0 / self.fps
-        logger.info(f"录制帧{frame_interval}")
+        logger.info("录制帧%s", frame_interval)
         while self.recording:
             try:
                 # 获取当前屏幕截图
@@ -124,7 +124,7 @@ class BrowserVideoRecorder:
                     self.frames.append(frame)
                 time.sleep(frame_interval)
             except Exception as e:
-                logger.error(f"录制帧时出错: {e}")
+                logger.error("录制帧时出错: %s", e)
                 break
 
     def _save_video(self):
@@ -141,7 +141,7 @@ class BrowserVideoRecorder:
             out.write(frame)
 
         out.release()
-        logger.info(f"视频已保存: {self.video_path}")
+        logger.info("视频已保存: %s", self.video_path)
 
 
 def record_video(video_name=None, fps=10):
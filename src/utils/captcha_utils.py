@@ -7,8 +7,6 @@
 @Desp    :  验证码处理工具
 """
 
-from pathlib import Path
-
 import ddddocr
 from selenium.webdriver.remote.webelement import WebElement
 
@@ -46,10 +44,10 @@ class CaptchaRecognizer:
                 "Captcha OCR Result", f"验证码识别成功，结果: {result}"
             )
             AllureUtils.attach_img("原始验证码图", image_bytes)
-            logger.info(f"字符验证码识别结果: {result}")
+            logger.info("字符验证码识别结果: %s", result)
             return result
         except Exception as e:
-            logger.error(f"字符验证码识别失败: {e}")
+            logger.error("字符验证码识别失败: %s", e)
             return None
 
     def recognize_slide(self, target_bytes, background_bytes):
@@ -60,11 +58,11 @@ class CaptchaRecognizer:
             res = slide_det.slide_match(
                 target_bytes, background_bytes, simple_target=True
             )
-            logger.info(f"滑块缺口位置: {res}")
+            logger.info("滑块缺口位置: %s", res)
             # res 格式为 {'target': [x, y, width, height]}
             return res
         except Exception as e:
-            logger.error(f"滑块验证码识别失败: {e}")
+            logger.error("滑块验证码识别失败: %s", e)
             return None
 
     def detect_objects(self, image_bytes):
@@ -73,11 +71,11 @@ class CaptchaRecognizer:
             raise ValueError("目标检测模型未启用")
         try:
             bboxes = self.det.detection(image_bytes)
-            logger.info(f"检测到 {len(bboxes)} 个目标")
+            logger.info("检测到 %s 个目标", len(bboxes))
             # bboxes 格式为 [[x1, y1, x2, y2], ...]
             return bboxes
         except Exception as e:
-            logger.error(f"目标检测失败: {e}")
+            logger.error("目标检测失败: %s", e)
             return []
 
     # ---------- 针对Selenium的便捷方法 ----------
@@ -87,10 +85,5 @@ class CaptchaRecognizer:
         return screenshot_bytes
 
     def get_page_screenshot_bytes(self, driver):
-        """将整个页面截图转换为字节"""
-        screenshot_path = Path("temp_screenshot.png")
-        driver.save_screenshot(str(screenshot_path))
-        with open(screenshot_path, "rb") as f:
-            bytes_data = f.read()
-        screenshot_path.unlink()  # 删除临时文件
-        return bytes_data
+        """将整个页面截图转换为字节（直接取内存中的PNG，不经过临时文件）"""
+        return driver.get_screenshot_as_png()
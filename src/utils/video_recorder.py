@@ -46,7 +46,7 @@ class VideoRecorder:
         # 使用守护线程，确保主程序退出时能结束
         self.thread = threading.Thread(target=self._capture_frames, daemon=True)
         self.thread.start()
-        logger.info(f"开始录屏，目标帧率: {self.fps} fps")
+        logger.info("开始录屏，目标帧率: %s fps", self.fps)
 
     def _capture_frames(self):
         """捕获帧的核心循环"""
@@ -62,7 +62,7 @@ class VideoRecorder:
                 if self.frame_dimensions is None:
                     h, w = frame.shape[:2]
                     self.frame_dimensions = (w, h)  # OpenCV 使用 (宽度, 高度)
-                    logger.debug(f"动态设置帧尺寸: {self.frame_dimensions}")
+                    logger.debug("动态设置帧尺寸: %s", self.frame_dimensions)
 
                 self.frames.append(frame)
 
@@ -70,7 +70,7 @@ class VideoRecorder:
                 time.sleep(1.0 / self.fps)
 
             except Exception as e:
-                logger.error(f"捕获帧时发生错误: {e}")
+                logger.error("捕获帧时发生错误: %s", e)
                 self.recording = False
                 break
 
@@ -106,7 +106,7 @@ class VideoRecorder:
             )
 
             if not out.isOpened():
-                logger.error(f"无法初始化视频写入器，检查编码器或路径: {output_path}")
+                logger.error("无法初始化视频写入器，检查编码器或路径: %s", output_path)
                 return None
 
             # 写入所有帧
@@ -118,7 +118,7 @@ class VideoRecorder:
                         frame = cv2.resize(frame, self.frame_dimensions)
                         logger.debug("调整帧尺寸以匹配写入器")
                     except Exception as resize_e:
-                        logger.error(f"调整帧尺寸失败: {resize_e}")
+                        logger.error("调整帧尺寸失败: %s", resize_e)
                         continue
 
                 out.write(frame)
@@ -126,12 +126,17 @@ class VideoRecorder:
 
             out.release()
             logger.info(
-                f"视频已保存: {output_path} (尺寸: {width}x{height}, 帧数: {frames_count}, 时长: {frames_count / self.fps:.1f}秒)"
+                "视频已保存: %s (尺寸: %sx%s, 帧数: %s, 时长: %.1f秒)",
+                output_path,
+                width,
+                height,
+                frames_count,
+                frames_count / self.fps,
             )
             return output_path
 
         except Exception as e:
-            logger.error(f"保存视频失败: {e}")
+            logger.error("保存视频失败: %s", e)
             return None
 
     def get_recording_status(self):
@@ -184,7 +189,7 @@ def record_video(output_dir=VIDEOS_DIR, fps=15):
 
             # 开始录屏
             recorder.start_recording()
-            logger.info(f"开始为测试 '{test_name}' 录屏，文件将保存至: {video_path}")
+            logger.info("开始为测试 '%s' 录屏，文件将保存至: %s", test_name, video_path)
 
             try:
                 # 执行测试函数
@@ -192,9 +197,7 @@ def record_video(output_dir=VIDEOS_DIR, fps=15):
                 return result
             except Exception as test_exception:
                 # 测试失败时，记录额外信息
-                logger.warning(
-                    f"测试执行失败，但录屏会继续保存。错误: {test_exception}"
-                )
+                logger.warning("测试执行失败，但录屏会继续保存。错误: %s", test_exception)
                 raise  # 重新抛出异常
             finally:
                 # 确保录屏被停止并保存
@@ -204,11 +207,13 @@ def record_video(output_dir=VIDEOS_DIR, fps=15):
                     # 如果测试失败且视频文件存在，可以在这里将其附加到Allure报告
                     if video_path.exists() and video_path.stat().st_size > 0:
                         logger.info(
-                            f"测试 '{test_name}' 录屏完成，文件大小: {video_path.stat().st_size / 1024:.1f} KB"
+                            "测试 '%s' 录屏完成，文件大小: %.1f KB",
+                            test_name,
+                            video_path.stat().st_size / 1024,
                         )
                         # 这里可以添加将视频附加到Allure报告的代码
                 except Exception as save_error:
-                    logger.error(f"保存录屏文件时发生错误: {save_error}")
+                    logger.error("保存录屏文件时发生错误: %s", save_error)
 
         return wrapper
 
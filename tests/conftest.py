@@ -13,7 +13,11 @@ import pytest
 
 from configs import config
 from configs.path import REPORTS_DIR, SCREENSHOTS_DIR, VIDEOS_DIR
+from src.core.auth_state import AuthStateStore
 from src.core.logger import logger
+from src.core.network_capture import start_capture
+from src.core.page_perf import begin_test_capture, end_test_capture
+from src.core.wait_engine import finish_wait_budget, start_wait_budget
 from src.core.webdriver_manager import DriverManager
 from src.utils.allure_utils import AllureUtils
 from src.utils.browser_video_recorder import BrowserVideoRecorder
@@ -32,6 +36,7 @@ def setup_environment(request):
     # 设置环境变量
     os.environ["ENV"] = env
     config._update_current_config()  # 重新加载配置以使用新的环境变量
+    logger.set_level(os.getenv("LOG_LEVEL") or config.get("log.level", "DEBUG"))
 
     # 设置配置覆盖
     if browser:
@@ -41,44 +46,157 @@ def setup_environment(request):
     if record_video is not None:
         config.webdriver.record_video = record_video
 
-    logger.info(f"获取{os.getenv('ENV')}环境配置：{config}")
+    logger.info("获取%s环境配置：%s", os.getenv("ENV"), config)
 
     yield
 
+    # 关闭会话池并输出命中率、重置耗时等统计
+    DriverManager.shutdown()
+
 
 @pytest.fixture(scope="class", autouse=True)
 def driver(request):
     """提供浏览器驱动"""
-    logger.info(f"用例名称： {request.node}")
+    logger.info("用例名称： %s", request.node)
     test_name = request.node.name
     record_video = False
-    logger.info(f"初始化浏览器驱动: {test_name} {config.webdriver.record_video}")
+    logger.info("初始化浏览器驱动: %s %s", test_name, config.webdriver.record_video)
     if config.webdriver.record_video:
-        logger.info(f"检查是否需要录制视频 {request.node.get_closest_marker('video')}")
+        logger.info("检查是否需要录制视频 %s", request.node.get_closest_marker("video"))
         if request.node.get_closest_marker("video"):
             record_video = True
     driver = DriverManager.get_driver(test_name=test_name, record_video=record_video)
     yield driver
-    DriverManager.quit_driver()
+    # 同时退出类中创建的命名会话
+    DriverManager.quit_all()
+
+
+@pytest.fixture(scope="class")
+def named_driver(request, driver):
+    """按角色获取额外的独立会话，如 named_driver("reader")，随类结束退出"""
+
+    def factory(role, browser_type=None):
+        return DriverManager.get_driver(
+            browser_type=browser_type, test_name=request.node.name, role=role
+        )
+
+    return factory
+
+
+@pytest.fixture(scope="function", autouse=True)
+def wait_budget(request):
+    """每个用例的等待时间预算，耗尽后后续等待立即失败"""
+    budget = start_wait_budget(config.get("webdriver.wait.test_budget", 0))
+    yield budget
+    finish_wait_budget()
+    logger.info("用例 %s 等待 %s 次，共 %.3fs", request.node.name, budget.waits, budget.spent)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def resource_blocking(request, driver):
+    """按用例开关资源屏蔽（@pytest.mark.resource_block(False) 关闭），并统计被屏蔽的请求"""
+    policy = DriverManager.get_network_policy()
+    if policy is None or driver is None or not policy.supported(driver):
+        yield None
+        return
+
+    marker = request.node.get_closest_marker("resource_block")
+    enabled = marker.args[0] if marker and marker.args else True
+    policy.apply(driver, enabled)
+    policy.drain(driver)
+    yield policy
+
+    stats = policy.collect(driver)
+    logger.info(
+        "用例 %s 屏蔽请求 %s 个，已知节省 %s 字节（%s 个体积未知）",
+        request.node.name,
+        stats["requests"],
+        stats["bytes"],
+        stats["unknown"],
+    )
+
+
+@pytest.fixture(scope="function", autouse=True)
+def network_capture(request, driver):
+    """按用例录制网络请求为HAR（webdriver.har），失败时附加到Allure报告，并汇总最慢的请求"""
+    recorder = start_capture(driver, request.node.name) if driver else None
+    yield recorder
+    if recorder is None:
+        return
+    summary = recorder.stop()
+    for item in summary["slowest"]:
+        logger.info(
+            "慢请求 %.0fms %s %s %s",
+            item["time_ms"],
+            item["status"],
+            item["method"],
+            item["url"],
+        )
+    reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+    if any(report is not None and report.failed for report in reports):
+        AllureUtils.attach_json("网络请求摘要", summary)
+        AllureUtils.attach_har("network.har", recorder.path)
+    elif not config.get("webdriver.har.keep_passed", False):
+        recorder.path.unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def page_performance(request):
+    """收集用例内各页面的性能数据，附加到Allure报告，超出预算的指标单独列出"""
+    if not config.get("perf.enabled", False):
+        yield None
+        return
+    begin_test_capture()
+    yield
+    records = end_test_capture()
+    if not records:
+        return
+    AllureUtils.attach_json("页面性能", records)
+    violations = [
+        dict(violation, page=record["page"], url=record["url"])
+        for record in records
+        for violation in record["violations"]
+    ]
+    if violations:
+        AllureUtils.attach_json("性能预算超出", violations)
+        logger.warning("用例 %s 有 %s 项性能指标超出预算", request.node.name, len(violations))
 
 
 @pytest.fixture(scope="class")
 def admin_login(driver):
-    """提供已登录的管理员页面"""
+    """提供已登录的管理员页面（优先复用缓存的登录态）"""
     from src.pages.admin_login_page import AdminLoginPage
 
     admin_login_page = AdminLoginPage(driver)
-    admin_login_page.open()
-    admin_login_page.input_username(config.users.admin.username)
-    admin_login_page.input_pwd(config.users.admin.password)
-    admin_login_page.input_captcha()
-    admin_login_page.click_admin_login_btn()
-
-    # 验证登录成功
-    assert admin_login_page.wait_for_title_contains(title_part="JPress后台"), (
-        "登录失败，未跳转到JPress后台页面"
+    username = config.users.admin.username
+
+    def ui_login(_driver):
+        admin_login_page.login(username, config.users.admin.password)
+        # 验证登录成功
+        assert admin_login_page.wait_for_title_contains(title_part="JPress后台"), (
+            "登录失败，未跳转到JPress后台页面"
+        )
+
+    if not config.get("auth_cache.enabled", False):
+        ui_login(driver)
+        return admin_login_page
+
+    store = AuthStateStore(
+        f"{os.getenv('ENV', 'dev')}-{username}",
+        config.base_url,
+        ttl=config.get("auth_cache.ttl", 1800),
     )
 
+    def validate(_driver):
+        admin_login_page.open_admin_home()
+        return admin_login_page.is_logged_in()
+
+    store.restore_or_login(
+        driver,
+        origin_url=f"{config.base_url}{config.get('auth_cache.origin_path', '/')}",
+        validate=validate,
+        login=ui_login,
+    )
     return admin_login_page
 
 
@@ -87,22 +205,22 @@ def video_recorder(driver, request):
     """提供浏览器视频录制器"""
     # 获取测试名称作为视频文件名
     test_name = request.node.name
-    logger.info(f"初始化视频录制器: {test_name}")
+    logger.info("初始化视频录制器: %s", test_name)
     try:
         recorder = BrowserVideoRecorder(driver, fps=10, video_name=test_name)
-        logger.info(f"开始录制视频: {recorder.video_path}")
+        logger.info("开始录制视频: %s", recorder.video_path)
         recorder.start_recording()
         yield recorder
         logger.info("停止录制视频")
         recorder.stop_recording()
         # 附加视频到Allure报告
         if recorder.video_path.exists():
-            logger.info(f"附加视频到报告: {recorder.video_path}")
+            logger.info("附加视频到报告: %s", recorder.video_path)
             AllureUtils.attach_video(str(recorder.video_path), str(recorder.video_path))
         else:
-            logger.warning(f"视频文件不存在: {recorder.video_path}")
+            logger.warning("视频文件不存在: %s", recorder.video_path)
     except Exception as e:
-        logger.error(f"视频录制失败: {e}")
+        logger.error("视频录制失败: %s", e)
         import traceback
 
         logger.error(traceback.format_exc())
@@ -111,6 +229,12 @@ def video_recorder(driver, request):
 
 def pytest_configure(config):
     """pytest配置"""
+    config.addinivalue_line(
+        "markers", "resource_block(enabled): 按用例开启/关闭网络资源屏蔽"
+    )
+    # xdist worker也会执行这里，只由主进程清理，避免清掉其他worker已写入的截图
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return
     # 确保报告目录存在且为空
     # ensure_empty_directory(LOGS_DIR)
     ensure_empty_directory(REPORTS_DIR / "allure-results")
@@ -143,12 +267,14 @@ def pytest_runtest_makereport(item, call):
     """测试报告钩子"""
     outcome = yield
     rep = outcome.get_result()
-    logger.info(f"测试报告: {rep} {rep.when} {rep.outcome} {rep.passed}")
+    logger.info("测试报告: %s %s %s %s", rep, rep.when, rep.outcome, rep.passed)
+    # 供fixture在清理阶段判断用例结果（如失败时附加HAR）
+    setattr(item, f"rep_{rep.when}", rep)
 
     # 测试执行完成后执行
     if rep.when == "call" or rep.when == "setup":
         # 检查是否为远程执行且标记为video
-        logger.info(f"测试执行完成: {item.name} {item}")
+        logger.info("测试执行完成: %s %s", item.name, item)
         if (
             config.webdriver.mode == "grid"
             and config.webdriver.record_video
@@ -156,34 +282,34 @@ def pytest_runtest_makereport(item, call):
         ):
             # 使用类名作为前缀查找视频文件
             class_name = item.cls.__name__ if item.cls else item.name
-            logger.info(f"使用类名作为前缀查找视频文件: {class_name}")
+            logger.info("使用类名作为前缀查找视频文件: %s", class_name)
             video_files = list(VIDEOS_DIR.glob(f"{class_name}*"))
-            logger.info(f"找到视频文件: {video_files}")
+            logger.info("找到视频文件: %s", video_files)
             if video_files:
                 # 选择最新的视频文件
                 video_path = max(video_files, key=lambda p: p.stat().st_mtime)
-                logger.info(f"附加视频到报告: {video_path}")
+                logger.info("附加视频到报告: %s", video_path)
                 try:
                     AllureUtils.attach_video(str(video_path), str(video_path))
                 except Exception as e:
-                    logger.error(f"附加视频失败: {e}")
+                    logger.error("附加视频失败: %s", e)
 
         # 在测试失败时执行（包括 setup 和 call 阶段）
         if rep.failed:
-            logger.error(f"测试 {item.name} 失败: {call.excinfo.value}")
+            logger.error("测试 %s 失败: %s", item.name, call.excinfo.value)
             # 截图
             if "driver" in item.fixturenames or "driver" in item.funcargs:
                 driver = item.funcargs["driver"]
                 try:
                     AllureUtils.attach_screenshot("failure_screenshot", driver)
                 except Exception as e:
-                    logger.error(f"截图失败: {e}")
+                    logger.error("截图失败: %s", e)
 
             # 记录失败信息
             AllureUtils.attach_text("failure_info", rep.longreprtext)
     """创建测试报告时调用"""
     if call.when == "call" and call.excinfo is not None:
-        logger.error(f"测试 {item.name} 失败: {call.excinfo.value}")
+        logger.error("测试 %s 失败: %s", item.name, call.excinfo.value)
 
 
 # @pytest.fixture(scope="function")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  conftest.py
+@Time    :  2026/10/16 09:40:12
+@Author  :  owl
+@Desp    :  框架单元测试固件，不启动真实浏览器
+"""
+
+import logging
+
+import pytest
+
+# 在导入框架模块之前挂上handler，全局Logger不再创建控制台/文件handler，
+# 单元测试的日志只由pytest捕获，不写 logs/
+logging.getLogger("selenium_automation").addHandler(logging.NullHandler())
+
+from configs import config  # noqa: E402
+
+
+@pytest.fixture(scope="class", autouse=True)
+def driver():
+    """覆盖全局driver固件，单元测试不需要浏览器"""
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def client_wait_backend():
+    """假驱动不执行异步脚本，页面对象的等待走客户端轮询"""
+    wait = config.webdriver.wait
+    backend = getattr(wait, "backend", None)
+    wait.backend = "client"
+    yield
+    wait.backend = backend
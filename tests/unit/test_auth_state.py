@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_auth_state.py
+@Time    :  2026/10/16 17:41:09
+@Author  :  owl
+@Desp    :  登录态缓存单元测试
+"""
+
+import stat
+import sys
+import time
+
+import pytest
+
+from src.core.auth_state import AuthStateStore
+
+BASE_URL = "http://jpress.local"
+
+
+class FakeDriver:
+    """模拟浏览器的cookie与localStorage"""
+
+    def __init__(self):
+        self.cookies = []
+        self.local_storage = {}
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        if args:
+            self.local_storage.update(args[0])
+            return None
+        return dict(self.local_storage)
+
+
+def logged_in(driver):
+    return any(c["name"] == "session" for c in driver.cookies)
+
+
+def ui_login(driver):
+    driver.cookies.append({"name": "session", "value": "abc"})
+    driver.local_storage["theme"] = "dark"
+
+
+class TestAuthStateStore:
+    def test_login_once_then_restore(self, tmp_path):
+        store = AuthStateStore("dev-admin", BASE_URL, state_dir=tmp_path)
+
+        assert store.restore_or_login(FakeDriver(), BASE_URL, logged_in, ui_login) is False
+
+        fresh = FakeDriver()
+        assert store.restore_or_login(fresh, BASE_URL, logged_in, ui_login) is True
+        assert fresh.local_storage == {"theme": "dark"}
+        assert store.logins == 1
+        assert store.restored == 1
+
+    def test_invalid_state_falls_back_to_login(self, tmp_path):
+        store = AuthStateStore("dev-admin", BASE_URL, state_dir=tmp_path)
+        store.save(
+            {
+                "base_url": BASE_URL,
+                "saved_at": time.time(),
+                "cookies": [{"name": "expired", "value": "x"}],
+                "local_storage": {},
+            }
+        )
+
+        driver = FakeDriver()
+        assert store.restore_or_login(driver, BASE_URL, logged_in, ui_login) is False
+        assert logged_in(driver)
+        assert [c["name"] for c in store.load()["cookies"]] == ["session"]
+
+    def test_expired_or_foreign_state_ignored(self, tmp_path):
+        store = AuthStateStore("dev-admin", BASE_URL, ttl=60, state_dir=tmp_path)
+        store.save({"base_url": BASE_URL, "saved_at": time.time() - 120, "cookies": []})
+        assert store.load() is None
+
+        store.save({"base_url": "http://other", "saved_at": time.time(), "cookies": []})
+        assert store.load() is None
+
+    def test_expired_cookies_not_injected(self, tmp_path):
+        store = AuthStateStore("dev-admin", BASE_URL, state_dir=tmp_path)
+        driver = FakeDriver()
+        store.inject(
+            driver,
+            {
+                "cookies": [
+                    {"name": "old", "value": "1", "expiry": int(time.time()) - 10},
+                    {"name": "session", "value": "abc"},
+                ]
+            },
+            BASE_URL,
+        )
+        assert [c["name"] for c in driver.cookies] == ["session"]
+        assert driver.visited == [BASE_URL]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Windows不支持POSIX权限位")
+    def test_state_file_private(self, tmp_path):
+        store = AuthStateStore("dev-admin", BASE_URL, state_dir=tmp_path)
+        store.save(store.capture(FakeDriver()))
+        assert stat.S_IMODE(store.state_file.stat().st_mode) == 0o600
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_batch_dom.py
+@Time    :  2026/10/16 18:58:02
+@Author  :  owl
+@Desp    :  BasePage批量读写单元测试（假驱动模拟注入脚本的返回）
+"""
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.core.base_page import BasePage
+from src.core.dom_script import PROBE_JS, READ_MANY_JS
+
+
+class ScriptDriver:
+    """记录execute_script调用，按顺序返回预设结果"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+class TestReadMany:
+    def test_single_script_for_all_fields(self):
+        driver = ScriptDriver(
+            {
+                "values": {"title": "标题", "link": "/a/1", "shown": True},
+                "missing": [],
+            }
+        )
+        page = BasePage(driver)
+        result = page.read_many(
+            {
+                "title": (By.ID, "title"),
+                "link": ((By.CSS_SELECTOR, "a.item"), "attribute", "href"),
+                "shown": ((By.XPATH, "//div"), "displayed"),
+            }
+        )
+
+        assert result == {"title": "标题", "link": "/a/1", "shown": True}
+        assert result.complete
+        assert len(driver.calls) == 1
+        script, (fields,) = driver.calls[0]
+        assert script == READ_MANY_JS
+        assert fields == [
+            ["title", "id", "title", "text", None],
+            ["link", "css selector", "a.item", "attribute", "href"],
+            ["shown", "xpath", "//div", "displayed", None],
+        ]
+
+    def test_missing_fields_reported(self):
+        driver = ScriptDriver({"values": {"title": None}, "missing": ["title"]})
+        result = BasePage(driver).read_many({"title": (By.ID, "title")})
+        assert result["title"] is None
+        assert result.missing == ["title"]
+
+    def test_timeout_waits_for_missing(self):
+        driver = ScriptDriver(
+            {"values": {"title": None}, "missing": ["title"]},
+            {"values": {"title": None}, "missing": ["title"]},
+            {"values": {"title": "出现了"}, "missing": []},
+        )
+        result = BasePage(driver).read_many({"title": (By.ID, "title")}, timeout=2)
+        assert result.complete
+        assert result["title"] == "出现了"
+
+    def test_invalid_spec(self):
+        page = BasePage(ScriptDriver({}))
+        with pytest.raises(ValueError):
+            page.read_many({"x": ((By.ID, "a"), "colour")})
+        with pytest.raises(ValueError):
+            page.read_many({"x": ((By.ID, "a"), "attribute")})
+        with pytest.raises(ValueError):
+            page.read_many({"x": ("by magic", "a")})
+
+
+class FakeElement:
+    def __init__(self, selected=False):
+        self.selected = selected
+        self.keys = []
+
+    def is_selected(self):
+        return self.selected
+
+    def click(self):
+        self.selected = not self.selected
+
+    def clear(self):
+        self.keys.clear()
+
+    def send_keys(self, text):
+        self.keys.append(text)
+
+
+class TestFillForm:
+    def test_one_script_for_all_fields(self):
+        driver = ScriptDriver(["ok", "ok", "ok"])
+        page = BasePage(driver)
+        methods = page.fill_form(
+            {(By.ID, "title"): "标题", (By.NAME, "count"): 3, (By.ID, "agree"): True}
+        )
+
+        assert set(methods.values()) == {"script"}
+        assert len(driver.calls) == 1
+        _, (payload,) = driver.calls[0]
+        assert payload == [
+            ["id", "title", "标题"],
+            ["name", "count", "3"],
+            ["id", "agree", True],
+        ]
+
+    def test_fallback_to_keys(self, monkeypatch):
+        driver = ScriptDriver(["ok", "missing"])
+        page = BasePage(driver)
+        typed = []
+        checkbox = FakeElement()
+        monkeypatch.setattr(page, "input_text", lambda loc, text: typed.append((loc, text)))
+        monkeypatch.setattr(page, "find_element", lambda loc: checkbox)
+
+        methods = page.fill_form(
+            {
+                (By.ID, "title"): "标题",
+                (By.ID, "late"): "后出现",
+                (By.ID, "search"): "关键字",
+                (By.ID, "agree"): True,
+            },
+            type_keys=[(By.ID, "search"), (By.ID, "agree")],
+        )
+
+        assert methods == {
+            (By.ID, "title"): "script",
+            (By.ID, "late"): "keys",
+            (By.ID, "search"): "keys",
+            (By.ID, "agree"): "keys",
+        }
+        assert typed == [((By.ID, "late"), "后出现"), ((By.ID, "search"), "关键字")]
+        assert checkbox.selected is True
+
+    def test_paste_text_falls_back_to_send_keys(self, monkeypatch):
+        driver = ScriptDriver("unsupported")
+        page = BasePage(driver)
+        element = FakeElement()
+        monkeypatch.setattr(page, "find_element", lambda loc: element)
+
+        page.paste_text((By.ID, "body"), "长文本" * 100)
+        assert element.keys == ["长文本" * 100]
+
+
+class TestProbes:
+    def test_exists_now_single_script(self):
+        driver = ScriptDriver({"count": 0, "displayed": 0})
+        page = BasePage(driver)
+        assert page.exists_now((By.CLASS_NAME, "toast-error")) is False
+        assert driver.calls == [(PROBE_JS, ("class name", "toast-error"))]
+
+    def test_is_displayed_now(self):
+        page = BasePage(ScriptDriver({"count": 2, "displayed": 0}))
+        assert page.exists_now((By.ID, "tip"))
+        assert not page.is_displayed_now((By.ID, "tip"))
+
+    def test_wait_until_absent_returns_immediately(self):
+        driver = ScriptDriver({"count": 0, "displayed": 0})
+        assert BasePage(driver).wait_until_absent((By.ID, "mask"), timeout=5)
+        assert len(driver.calls) == 1
+
+    def test_wait_until_absent_polls(self):
+        driver = ScriptDriver(
+            {"count": 1, "displayed": 1},
+            {"count": 1, "displayed": 0},
+        )
+        page = BasePage(driver)
+        assert page.wait_until_absent((By.ID, "mask"), timeout=2, hidden=True)
+        with pytest.raises(TimeoutException):
+            page.wait_until_absent((By.ID, "mask"), timeout=0.2)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_browser_profile.py
+@Time    :  2026/10/16 16:58:27
+@Author  :  owl
+@Desp    :  浏览器配置模板单元测试
+"""
+
+import time
+
+import pytest
+
+from src.core import browser_profile
+from src.core.browser_profile import ProfileTemplate, performance_flags
+
+
+@pytest.fixture
+def profiles_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_profile, "PROFILES_DIR", tmp_path)
+    return tmp_path
+
+
+def fake_warm(path):
+    """模拟浏览器预热：写入配置与缓存文件"""
+    (path / "Default" / "Cache" / "Cache_Data").mkdir(parents=True)
+    (path / "Default" / "Preferences").write_text("{}")
+    (path / "Default" / "Cache" / "Cache_Data" / "f_000001").write_bytes(b"cached")
+    (path / "Default" / "Cache" / "Cache_Data" / "index").write_bytes(b"index")
+    (path / "SingletonLock").write_text("host-1")
+
+
+class TestProfileTemplate:
+    def test_template_built_once(self, profiles_dir):
+        calls = []
+        template = ProfileTemplate("chrome", run_id="run1")
+
+        def warm(path):
+            calls.append(path)
+            fake_warm(path)
+
+        assert template.ensure(warm)
+        assert template.ensure(warm)
+        assert len(calls) == 1
+
+    def test_clone_is_independent(self, profiles_dir):
+        template = ProfileTemplate("chrome", run_id="run1")
+        template.ensure(fake_warm)
+
+        clone = template.clone()
+        assert clone != template.template_dir
+        assert (clone / "Default" / "Cache" / "Cache_Data" / "f_000001").read_bytes() == b"cached"
+        # 锁文件与就绪标记不复制
+        assert not (clone / "SingletonLock").exists()
+        assert not (clone / ".ready").exists()
+
+        # 修改克隆中的配置不影响模板
+        (clone / "Default" / "Preferences").write_text('{"changed": true}')
+        assert (template.template_dir / "Default" / "Preferences").read_text() == "{}"
+
+    def test_cache_files_are_not_hard_linked(self, profiles_dir):
+        template = ProfileTemplate("chrome", run_id="run1")
+        template.ensure(fake_warm)
+        template._reflink_supported = False
+        clone = template.clone()
+
+        cached = clone / "Default" / "Cache" / "Cache_Data" / "f_000001"
+        assert cached.stat().st_nlink == 1
+        # 浏览器原地改写缓存条目，不能影响模板
+        with open(cached, "r+b") as f:
+            f.write(b"CACHED")
+        source = template.template_dir / "Default" / "Cache" / "Cache_Data" / "f_000001"
+        assert source.read_bytes() == b"cached"
+
+    def test_failed_warm_disables_template(self, profiles_dir):
+        template = ProfileTemplate("chrome", run_id="run1")
+
+        def warm(path):
+            raise RuntimeError("浏览器启动失败")
+
+        assert template.ensure(warm) is False
+
+    def test_waiters_stop_when_build_fails(self, profiles_dir):
+        builder = ProfileTemplate("chrome", run_id="run1")
+
+        def warm(path):
+            raise RuntimeError("浏览器启动失败")
+
+        assert builder.ensure(warm) is False
+
+        waiter = ProfileTemplate("chrome", run_id="run1", warm_timeout=30)
+        start = time.monotonic()
+        assert waiter.ensure(lambda path: pytest.fail("不应重复构建模板")) is False
+        assert time.monotonic() - start < 5
+
+    def test_other_worker_waits_for_ready(self, profiles_dir):
+        builder = ProfileTemplate("chrome", run_id="run1")
+        builder.ensure(fake_warm)
+
+        waiter = ProfileTemplate("chrome", run_id="run1", warm_timeout=1)
+        assert waiter.ensure(lambda path: pytest.fail("不应重复构建模板"))
+
+    def test_cleanup_removes_clones(self, profiles_dir, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+        template = ProfileTemplate("chrome", run_id="run1")
+        template.ensure(fake_warm)
+        clone = template.clone()
+
+        template.cleanup()
+        assert not clone.exists()
+        assert not template.template_dir.exists()
+
+
+def test_performance_flags():
+    assert performance_flags("default") == []
+    assert "--no-first-run" in performance_flags("fast")
+    with pytest.raises(ValueError):
+        performance_flags("turbo")
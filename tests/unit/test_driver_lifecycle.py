@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_driver_lifecycle.py
+@Time    :  2026/10/17 17:05:36
+@Author  :  owl
+@Desp    :  浏览器会话异步回收与预创建单元测试
+"""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.core.driver_lifecycle import DriverPrefetcher, DriverReaper
+
+
+class FakeDriver:
+    """quit可以被阻塞的假驱动"""
+
+    def __init__(self, block=None, process=None):
+        self.block = block
+        self.started = threading.Event()
+        self.quit_thread = None
+        if process is not None:
+            self.service = type("Service", (), {"process": process})()
+
+    def quit(self):
+        self.quit_thread = threading.current_thread().name
+        self.started.set()
+        if self.block is not None:
+            self.block.wait(5)
+
+
+@pytest.fixture
+def sleeper():
+    """模拟驱动进程的子进程"""
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+class TestDriverReaper:
+    def test_sync_quit_when_disabled(self):
+        reaper = DriverReaper(async_quit=False)
+        driver = FakeDriver()
+        reaper.submit(driver)
+        assert driver.quit_thread == "driver-quit"
+        assert reaper._thread is None
+
+    def test_full_queue_falls_back_to_sync_quit(self):
+        block = threading.Event()
+        reaper = DriverReaper(async_quit=True, max_queue=1)
+        busy, queued, overflow = FakeDriver(block), FakeDriver(), FakeDriver()
+
+        reaper.submit(busy)
+        assert busy.started.wait(2)
+        reaper.submit(queued)  # 回收线程正忙，进入队列
+        reaper.submit(overflow)  # 队列已满，在当前线程同步关闭
+        assert overflow.started.is_set()
+        assert not queued.started.is_set()
+
+        block.set()
+        reaper.shutdown(timeout=5)
+        assert queued.started.is_set()
+
+    def test_quit_timeout_leaves_process_for_reaping(self, sleeper):
+        block = threading.Event()
+        reaper = DriverReaper(async_quit=False, quit_timeout=0.1)
+        driver = FakeDriver(block, process=sleeper)
+        reaper.track(driver)
+
+        reaper.quit(driver)
+        assert sleeper.poll() is None
+        assert id(driver) in reaper._processes
+
+        reaper.reap_orphans()
+        assert sleeper.wait(5) is not None
+        assert reaper._processes == {}
+        block.set()
+
+    def test_finished_quit_untracks_process(self, sleeper):
+        reaper = DriverReaper(async_quit=False)
+        driver = FakeDriver(process=sleeper)
+        reaper.track(driver)
+
+        reaper.quit(driver)
+        reaper.reap_orphans()
+        # 正常关闭的会话不会被强制结束
+        assert sleeper.poll() is None
+
+
+class TestDriverPrefetcher:
+    def test_prefetch_once_and_take(self):
+        created = []
+
+        def factory(browser_type):
+            created.append(browser_type)
+            return FakeDriver()
+
+        prefetcher = DriverPrefetcher(factory)
+        prefetcher.prefetch("chrome", "chrome")
+        prefetcher.prefetch("chrome", "chrome")  # 已有在途任务，忽略
+        driver = prefetcher.take("chrome", timeout=5)
+
+        assert isinstance(driver, FakeDriver)
+        assert created == ["chrome"]
+        assert prefetcher.take("chrome") is None
+        prefetcher.shutdown(lambda d: None)
+
+    def test_failed_prefetch_returns_none(self):
+        def factory():
+            raise RuntimeError("浏览器启动失败")
+
+        prefetcher = DriverPrefetcher(factory)
+        prefetcher.prefetch("chrome")
+        assert prefetcher.take("chrome", timeout=5) is None
+        prefetcher.shutdown(lambda d: None)
+
+    def test_shutdown_discards_unused(self):
+        driver = FakeDriver()
+        discarded = []
+        prefetcher = DriverPrefetcher(lambda: driver)
+        prefetcher.prefetch("chrome")
+
+        prefetcher.shutdown(discarded.append)
+        assert discarded == [driver]
+        assert prefetcher.take("chrome") is None
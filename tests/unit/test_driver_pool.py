@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_driver_pool.py
+@Time    :  2026/10/16 09:45:03
+@Author  :  owl
+@Desp    :  浏览器会话池单元测试
+"""
+
+from selenium.webdriver.remote.command import Command
+
+from src.core.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    """记录调用的假驱动"""
+
+    def __init__(self, fail_reset=False):
+        self.window_handles = ["main", "popup"]
+        self.current_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.fail_reset = fail_reset
+        self.quit_called = False
+        self.visited = []
+        self.urls = {"main": "http://jpress/admin", "popup": "http://jpress/admin"}
+        self.storage_cleared = 0
+
+    @property
+    def current_url(self):
+        return self.urls.get(self.current_handle, "about:blank")
+
+    def execute(self, driver_command, params=None):
+        if driver_command == Command.GET:
+            self.visited.append(params["url"])
+            self.urls[self.current_handle] = params["url"]
+        return {"value": None}
+
+    def get_window_size(self):
+        return {"width": 1280, "height": 800}
+
+    def set_window_size(self, width, height):
+        self.size = (width, height)
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def delete_all_cookies(self):
+        if self.fail_reset:
+            raise RuntimeError("session deleted")
+
+    def execute_async_script(self, script, *args):
+        self.storage_cleared += 1
+        return True
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    def quit(self):
+        self.quit_called = True
+
+
+class CdpDriver(FakeDriver):
+    """支持CDP命令的假驱动（Chrome/Edge）"""
+
+    def __init__(self):
+        super().__init__()
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+
+class TestDriverPool:
+    def test_release_resets_and_reuses_driver(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        assert pool.acquire("chrome") is None
+
+        driver = FakeDriver()
+        pool.register(driver, "chrome")
+        assert pool.release(driver)
+
+        assert driver.window_handles == ["main"]
+        assert driver.visited == ["about:blank"]
+        assert driver.size == (1280, 800)
+        assert pool.acquire("chrome") is driver
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+
+    def test_max_reuse_discards_driver(self):
+        pool = DriverPool(size=2, max_reuse=1, max_age=600)
+        driver = FakeDriver()
+        pool.register(driver, "chrome")
+
+        assert pool.release(driver)
+        assert driver.quit_called
+        assert pool.idle_count() == 0
+
+    def test_failed_reset_discards_driver(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        driver = FakeDriver(fail_reset=True)
+        pool.register(driver, "chrome")
+
+        assert pool.release(driver)
+        assert driver.quit_called
+        assert pool.stats()["reset_failures"] == 1
+
+    def test_visited_origins_cleared_through_cdp(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        driver = CdpDriver()
+        pool.register(driver, "chrome")
+        driver.get("http://jpress/admin")
+        driver.get("https://sso.example.com/login?next=/")
+        driver.get("http://jpress/admin/article/list")
+
+        assert pool.release(driver)
+        assert driver.storage_cleared == 1
+        assert driver.cdp == [
+            ("Network.clearBrowserCookies", {}),
+            (
+                "Storage.clearDataForOrigin",
+                {"origin": "https://sso.example.com", "storageTypes": "all"},
+            ),
+        ]
+        assert pool.acquire("chrome") is driver
+
+        # 重新借出后只清理本次访问过的源
+        driver.cdp.clear()
+        pool.release(driver)
+        assert driver.cdp == [("Network.clearBrowserCookies", {})]
+
+    def test_popup_origin_is_cleared(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        driver = CdpDriver()
+        driver.urls["popup"] = "https://cdn.example.com/preview"
+        pool.register(driver, "chrome")
+
+        pool.release(driver)
+        origins = [params["origin"] for _, params in driver.cdp[1:]]
+        assert origins == ["https://cdn.example.com"]
+
+    def test_other_origin_without_cdp_retires_driver(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        driver = FakeDriver()
+        pool.register(driver, "firefox")
+        driver.get("https://sso.example.com/login")
+        driver.get("http://jpress/admin")
+
+        assert pool.release(driver)
+        assert driver.quit_called
+        assert pool.idle_count() == 0
+
+    def test_unknown_driver_is_not_taken(self):
+        pool = DriverPool()
+        assert not pool.release(FakeDriver())
+
+    def test_close_quits_idle_drivers(self):
+        pool = DriverPool(size=2, max_reuse=5, max_age=600)
+        driver = FakeDriver()
+        pool.register(driver, "chrome")
+        pool.release(driver)
+
+        pool.close()
+        assert driver.quit_called
+        assert pool.idle_count() == 0
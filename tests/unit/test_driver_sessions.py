@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_driver_sessions.py
+@Time    :  2026/10/16 18:12:54
+@Author  :  owl
+@Desp    :  命名会话单元测试
+"""
+
+import threading
+
+import pytest
+
+from src.core.wait_engine import current_wait_budget, finish_wait_budget, start_wait_budget
+from src.core.webdriver_manager import DriverManager
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeReaper:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, driver):
+        self.submitted.append(driver)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    created = []
+
+    def acquire(browser_type, record_video, test_name=None):
+        driver = FakeDriver(f"{browser_type}-{len(created)}")
+        created.append((driver, test_name))
+        return driver
+
+    reaper = FakeReaper()
+    monkeypatch.setattr(DriverManager, "_acquire_driver", acquire)
+    monkeypatch.setattr(DriverManager, "_get_reaper", lambda: reaper)
+    monkeypatch.setattr(DriverManager, "_pool", None)
+    yield created, reaper
+    DriverManager.quit_all()
+
+
+class TestNamedSessions:
+    def test_roles_are_independent(self, manager):
+        created, _ = manager
+        admin = DriverManager.get_driver("chrome", test_name="t1", role="admin")
+        reader = DriverManager.get_driver("chrome", test_name="t1", role="reader")
+
+        assert admin is not reader
+        assert DriverManager.get_driver(role="admin") is admin
+        assert len(created) == 2
+        assert DriverManager.get_session("reader").test_name == "t1"
+
+    def test_sessions_are_per_thread(self, manager):
+        main = DriverManager.get_driver("chrome", test_name="main")
+        seen = {}
+
+        def worker():
+            seen["before"] = DriverManager.get_current_driver()
+            seen["own"] = DriverManager.get_driver("chrome", test_name="worker")
+            seen["meta"] = DriverManager.get_session().test_name
+            DriverManager.quit_all()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen["before"] is None
+        assert seen["own"] is not main
+        assert seen["meta"] == "worker"
+        assert DriverManager.get_session().test_name == "main"
+
+    def test_quit_single_role(self, manager):
+        _, reaper = manager
+        admin = DriverManager.get_driver("chrome", role="admin")
+        DriverManager.get_driver("chrome", role="reader")
+
+        DriverManager.quit_driver("admin")
+        assert reaper.submitted == [admin]
+        assert DriverManager.get_current_driver("admin") is None
+        assert DriverManager.get_current_driver("reader") is not None
+
+    def test_run_parallel(self, manager):
+        DriverManager.get_driver("chrome", role="admin")
+        DriverManager.get_driver("chrome", role="reader")
+        budget = start_wait_budget(30)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def task(driver):
+            # 两个角色同时执行才能通过屏障
+            barrier.wait()
+            return driver.name, current_wait_budget() is budget
+
+        try:
+            results = DriverManager.run_parallel({"admin": task, "reader": task})
+        finally:
+            finish_wait_budget()
+        assert results["admin"] == ("chrome-0", True)
+        assert results["reader"] == ("chrome-1", True)
+
+    def test_run_parallel_requires_sessions(self, manager):
+        with pytest.raises(ValueError):
+            DriverManager.run_parallel({"ghost": lambda d: None})
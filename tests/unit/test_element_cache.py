@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_element_cache.py
+@Time    :  2026/10/16 21:06:30
+@Author  :  owl
+@Desp    :  元素引用缓存单元测试
+"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from src.core.base_page import BasePage
+from src.core.element_cache import ElementCache
+
+TITLE = (By.ID, "title")
+
+
+class FakeElement:
+    def __init__(self, name, page):
+        self.name = name
+        self.page = page
+        self.stale = False
+
+    @property
+    def text(self):
+        self.page.execute("getElementText")
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+        return self.name
+
+    def click(self):
+        self.page.execute("elementClick")
+
+
+class FakePage:
+    """模拟页面：所有命令经过execute，便于统计命令数"""
+
+    def __init__(self):
+        self.commands = []
+        self.found = 0
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return {"value": None}
+
+    def find_element(self, by, value):
+        self.execute("findElement")
+        self.found += 1
+        return FakeElement(f"{value}-{self.found}", self)
+
+    def refresh(self):
+        self.execute("refresh")
+
+
+def read_title_three_times(cache_elements):
+    page = FakePage()
+    base = BasePage(page, cache_elements=cache_elements)
+    for _ in range(3):
+        base.get_text(TITLE)
+    return page.commands
+
+
+class TestElementCache:
+    def test_reuse_without_extra_commands(self):
+        page = FakePage()
+        base = BasePage(page, cache_elements=True)
+
+        first = base.find_element(TITLE)
+        assert base.find_element(TITLE) is first
+        assert page.commands == ["findElement"]
+        assert base.element_cache.hits == 1
+
+    def test_fewer_commands_than_without_cache(self):
+        cached = read_title_three_times(cache_elements=True)
+        uncached = read_title_three_times(cache_elements=False)
+
+        assert cached.count("findElement") == 1
+        assert uncached.count("findElement") == 3
+        assert len(cached) < len(uncached)
+
+    def test_stale_element_refound(self):
+        page = FakePage()
+        base = BasePage(page, cache_elements=True)
+
+        base.find_element(TITLE).stale = True
+        assert base.get_text(TITLE) == "title-2"
+        # 重新定位后的元素继续缓存
+        assert base.get_text(TITLE) == "title-2"
+
+    def test_refresh_clears_cache(self):
+        page = FakePage()
+        base = BasePage(page, cache_elements=True)
+
+        first = base.find_element(TITLE)
+        base.refresh_page()
+        assert base.find_element(TITLE) is not first
+        assert page.found == 2
+
+    def test_invalidate_single_locator(self):
+        cache = ElementCache(FakePage())
+        cache.store(TITLE, "title")
+        cache.store((By.ID, "body"), "body")
+
+        cache.invalidate(TITLE)
+        assert cache.lookup(TITLE) is None
+        assert cache.lookup((By.ID, "body")) == "body"
+
+    def test_disabled_by_default(self):
+        base = BasePage(FakePage())
+        assert base.element_cache is None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_element_locator.py
+@Time    :  2026/10/17 14:20:36
+@Author  :  owl
+@Desp    :  定位器转换为XPath的单元测试
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from src.core.element_locator import (
+    ElementLocator,
+    css_to_xpath,
+    selector_to_xpath,
+    xpath_literal,
+)
+
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class TestCssToXpath:
+    def test_compound_classes_match_whole_tokens(self):
+        assert css_to_xpath(".a.b") == f"//*[{has_class('a')}][{has_class('b')}]"
+        assert css_to_xpath("button.btn") == f"//button[{has_class('btn')}]"
+
+    def test_id_and_attributes(self):
+        assert css_to_xpath("#article-title") == "//*[@id='article-title']"
+        assert (
+            css_to_xpath("a[href^='/admin'][title]")
+            == "//a[starts-with(@href, '/admin')][@title]"
+        )
+        assert css_to_xpath('input[name="user"]') == "//input[@name='user']"
+        assert css_to_xpath("a[href$='.pdf']") == (
+            "//a[substring(@href, string-length(@href) - 3)='.pdf']"
+        )
+
+    def test_combinators(self):
+        assert css_to_xpath("div.list > table td") == (
+            f"//div[{has_class('list')}]/table//td"
+        )
+        assert css_to_xpath("li + li") == "//li/following-sibling::*[1][self::li]"
+        assert css_to_xpath("h2 ~ p") == "//h2/following-sibling::p"
+
+    def test_structural_pseudo_classes(self):
+        assert css_to_xpath("tr:nth-child(2) td:nth-of-type(3)") == (
+            "//tr[count(preceding-sibling::*)=1]//td[count(preceding-sibling::td)=2]"
+        )
+        assert css_to_xpath("li:first-child") == "//li[not(preceding-sibling::*)]"
+
+    def test_selector_group(self):
+        assert css_to_xpath("#a, .b[data-x='1,2']") == (
+            f"(//*[@id='a'] | //*[{has_class('b')}][@data-x='1,2'])"
+        )
+
+    @pytest.mark.parametrize(
+        "selector", ["a:hover", "div:not(.x)", "> a", "li:nth-child(2n)"]
+    )
+    def test_unsupported(self, selector):
+        with pytest.raises(ValueError):
+            css_to_xpath(selector)
+
+
+class TestSelectorToXpath:
+    def test_other_strategies(self):
+        assert selector_to_xpath((By.CLASS_NAME, "btn")) == f"//*[{has_class('btn')}]"
+        assert selector_to_xpath((By.NAME, "pwd")) == "//*[@name='pwd']"
+        assert selector_to_xpath((By.LINK_TEXT, "新建")) == "//a[normalize-space(.)='新建']"
+
+    def test_quotes(self):
+        assert xpath_literal("it's") == '"it\'s"'
+        assert xpath_literal("it's \"x\"") == "concat('it', \"'\", 's \"x\"')"
+
+    def test_parent_of_css_locator(self):
+        assert ElementLocator.get_parent_locator((By.ID, "batchDel")) == (
+            By.XPATH,
+            "(//*[@id='batchDel'])/..",
+        )
+        assert ElementLocator.get_parent_locator((By.CSS_SELECTOR, "ul > li")) == (
+            By.XPATH,
+            "(//ul/li)/..",
+        )
+
+
+class TestComposedGroups:
+    """选择器组/XPath并集与父、子、兄弟定位组合时，步骤作用于所有分支"""
+
+    def test_parent_and_sibling_of_group(self):
+        assert ElementLocator.get_parent_locator((By.CSS_SELECTOR, "#a, td.x")) == (
+            By.XPATH,
+            f"(//*[@id='a'] | //td[{has_class('x')}])/..",
+        )
+        assert ElementLocator.get_parent_locator((By.XPATH, "//a | //b")) == (
+            By.XPATH,
+            "(//a | //b)/..",
+        )
+        assert ElementLocator.get_sibling_locator((By.CSS_SELECTOR, "h2, h3")) == (
+            By.XPATH,
+            "(//h2 | //h3)/following-sibling::*[1]",
+        )
+
+    def test_child_group_applied_to_each_branch(self):
+        assert ElementLocator.get_child_locator(
+            (By.ID, "list"), (By.CSS_SELECTOR, "td.a, th")
+        ) == (
+            By.XPATH,
+            f"(//*[@id='list']/td[{has_class('a')}] | //*[@id='list']/th)",
+        )
+        assert ElementLocator.get_child_locator(
+            (By.XPATH, "//table | //ul"), (By.XPATH, "(//td | //li)")
+        ) == (By.XPATH, "((//table | //ul)//td | (//table | //ul)//li)")
+
+    def test_css_groups_combined(self):
+        assert ElementLocator.get_child_locator(
+            (By.CSS_SELECTOR, "#a, #b"), (By.CSS_SELECTOR, "td, th")
+        ) == (By.CSS_SELECTOR, "#a td, #a th, #b td, #b th")
+
+    def test_single_branch_unchanged(self):
+        assert ElementLocator.get_child_locator(
+            (By.XPATH, "(//table)[1]"), (By.XPATH, "//td")
+        ) == (By.XPATH, "(//table)[1]//td")
+        assert ElementLocator.get_sibling_locator((By.XPATH, "//li[@x='a|b']"), -1) == (
+            By.XPATH,
+            "//li[@x='a|b']/preceding-sibling::*[1]",
+        )
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_grid_admission.py
+@Time    :  2026/10/16 11:40:26
+@Author  :  owl
+@Desp    :  Grid会话准入单元测试，使用本地HTTP服务模拟Hub
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
+
+from src.core.grid_admission import GridAdmissionController
+
+
+class FakeHub:
+    """模拟Grid Hub的 /status 与 /session 接口"""
+
+    def __init__(self):
+        self.slots = [{"browserName": "chrome", "busy": False}]
+        self.reject_sessions = 0
+        self.session_requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_port}/wd/hub"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def status(self):
+        slots = [
+            {
+                "stereotype": {"browserName": slot["browserName"]},
+                "session": {"sessionId": "busy"} if slot["busy"] else None,
+            }
+            for slot in self.slots
+        ]
+        return {"value": {"ready": True, "nodes": [{"availability": "UP", "slots": slots}]}}
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.endswith("/status"):
+                    self._reply(200, hub.status())
+                else:
+                    self._reply(404, {"value": {"error": "unknown command"}})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                hub.session_requests += 1
+                if hub.reject_sessions > 0:
+                    hub.reject_sessions -= 1
+                    self._reply(
+                        500,
+                        {
+                            "value": {
+                                "error": "session not created",
+                                "message": "New session request timed out",
+                            }
+                        },
+                    )
+                    return
+                self._reply(
+                    200,
+                    {
+                        "value": {
+                            "sessionId": "fake-session",
+                            "capabilities": {"browserName": "chrome"},
+                        }
+                    },
+                )
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def hub():
+    with FakeHub() as fake_hub:
+        yield fake_hub
+
+
+def _remote_factory(hub):
+    return lambda: webdriver.Remote(
+        command_executor=hub.url, options=webdriver.ChromeOptions()
+    )
+
+
+class TestGridAdmission:
+    def test_free_slots_from_status(self, hub):
+        hub.slots.append({"browserName": "chrome", "busy": True})
+        hub.slots.append({"browserName": "firefox", "busy": False})
+        controller = GridAdmissionController(hub.url)
+        assert controller.free_slots() == {"chrome": 1, "firefox": 1}
+
+    def test_session_created_when_slot_free(self, hub):
+        controller = GridAdmissionController(hub.url)
+        driver = controller.acquire_session("chrome", _remote_factory(hub))
+        assert driver.session_id == "fake-session"
+        assert len(controller.wait_times) == 1
+        assert controller.wait_times[0][2] == 1
+
+    def test_waits_for_free_slot(self, hub):
+        hub.slots[0]["busy"] = True
+        timer = threading.Timer(0.3, lambda: hub.slots[0].update(busy=False))
+        timer.start()
+        controller = GridAdmissionController(hub.url, base_delay=0.05, max_delay=0.1)
+
+        controller.acquire_session("chrome", _remote_factory(hub))
+        browser, wait, attempts = controller.wait_times[0]
+        assert browser == "chrome"
+        assert wait >= 0.25
+        assert attempts > 1
+        assert hub.session_requests == 1
+
+    def test_retries_queue_timeout(self, hub):
+        hub.reject_sessions = 2
+        controller = GridAdmissionController(hub.url, base_delay=0.01, max_delay=0.02)
+
+        driver = controller.acquire_session("chrome", _remote_factory(hub))
+        assert driver.session_id == "fake-session"
+        assert hub.session_requests == 3
+
+    def test_gives_up_after_max_wait(self, hub):
+        hub.reject_sessions = 100
+        controller = GridAdmissionController(
+            hub.url, max_wait=0.2, base_delay=0.01, max_delay=0.02
+        )
+        with pytest.raises(SessionNotCreatedException):
+            controller.acquire_session("chrome", _remote_factory(hub))
+
+    def test_busy_browser_times_out(self, hub):
+        hub.slots.append({"browserName": "firefox", "busy": True})
+        controller = GridAdmissionController(
+            hub.url, max_wait=0.1, base_delay=0.01, max_delay=0.02
+        )
+        with pytest.raises(TimeoutException):
+            controller.acquire_session("firefox", _remote_factory(hub))
+        assert hub.session_requests == 0
+
+    def test_unsupported_browser_fails_fast(self, hub):
+        controller = GridAdmissionController(hub.url, max_wait=30)
+        start = time.monotonic()
+        with pytest.raises(SessionNotCreatedException, match="firefox"):
+            controller.acquire_session("firefox", _remote_factory(hub))
+        assert time.monotonic() - start < 5
+        assert hub.session_requests == 0
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_locator_health.py
+@Time    :  2026/10/17 15:58:14
+@Author  :  owl
+@Desp    :  定位器健康检查单元测试
+"""
+
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.common.by import By
+
+from src.core.base_page import BasePage
+from src.core.dom_script import CHECK_LOCATORS_JS
+from src.core.element_locator import DynamicLocator, css, id, xpath
+from src.core.locator_health import (
+    failures,
+    format_health,
+    locator_groups,
+    scan_page,
+    skipped_rows,
+)
+from src.pages.article_page import ArticlePage
+
+
+class ListPage(BasePage):
+    page_path = "/admin/article/list"
+    locator_paths = {"title_input": "/admin/article/write"}
+    optional_locators = ("first_row",)
+
+    batch_delete = id("batchDel")
+    first_row = xpath("//table/tbody/tr[2]")
+    broken = css("div[")
+    title_input = id("article-title")
+    row_by_title = DynamicLocator(By.XPATH, "//a[text()='{}']", sample=("我的文章1",))
+    row_by_id = DynamicLocator(By.CSS_SELECTOR, "tr[data-id='{id}']", sample={"id": 3})
+    row_no_sample = DynamicLocator(By.XPATH, "//tr[{}]")
+
+
+class CheckDriver:
+    """按选择器返回匹配数量的假驱动"""
+
+    def __init__(self, counts, fail=False):
+        self.counts = counts
+        self.fail = fail
+        self.calls = []
+
+    def execute_script(self, script, items):
+        assert script == CHECK_LOCATORS_JS
+        if self.fail:
+            raise JavascriptException("脚本执行失败")
+        self.calls.append(items)
+        result = {}
+        for name, by, value in items:
+            if value.endswith("["):
+                result[name] = {"error": "SyntaxError"}
+            else:
+                count = self.counts.get(value, 0)
+                result[name] = {"count": count, "displayed": count}
+        return result
+
+
+class TestGroups:
+    def test_grouped_by_page_with_dynamic_samples(self):
+        groups = locator_groups(ListPage)
+        assert list(groups) == ["/admin/article/list", "/admin/article/write"]
+        write_page = groups["/admin/article/write"]
+        assert write_page == {"title_input": (By.ID, "article-title")}
+        listed = groups["/admin/article/list"]
+        assert listed["row_by_title"] == (By.XPATH, "//a[text()='我的文章1']")
+        assert listed["row_by_id"] == (By.CSS_SELECTOR, "tr[data-id='3']")
+        assert "row_no_sample" not in listed
+        assert [row["name"] for row in skipped_rows(ListPage)] == ["row_no_sample"]
+
+    def test_article_page_edit_locators_on_write_page(self):
+        groups = locator_groups(ArticlePage)
+        assert "add_btn_loc" in groups["/admin/article/write"]
+        assert "del_all_btn_loc" in groups["/admin/article/list"]
+
+
+class TestScan:
+    def test_one_script_per_page(self):
+        driver = CheckDriver({"batchDel": 1, "//a[text()='我的文章1']": 2})
+        locators = locator_groups(ListPage)["/admin/article/list"]
+        rows = scan_page(driver, ListPage, locators, "/admin/article/list")
+        assert len(driver.calls) == 1
+        status = {row["name"]: row["status"] for row in rows}
+        assert status == {
+            "batch_delete": "ok",
+            "first_row": "optional",
+            "broken": "error",
+            "row_by_title": "ok",
+            "row_by_id": "missing",
+        }
+        assert [row["name"] for row in failures(rows)] == ["broken", "row_by_id"]
+        assert rows[3]["count"] == 2
+
+    def test_script_failure_marks_all_errors(self):
+        locators = {"batch_delete": ListPage.batch_delete}
+        (row,) = scan_page(CheckDriver({}, fail=True), ListPage, locators)
+        assert row["status"] == "error"
+
+    def test_report(self):
+        driver = CheckDriver({"batchDel": 1})
+        rows = scan_page(driver, ListPage, {"batch_delete": ListPage.batch_delete})
+        rows += skipped_rows(ListPage)
+        report = format_health(rows, elapsed=1.234)
+        assert "[正常] ListPage.batch_delete" in report
+        assert "[跳过] ListPage.row_no_sample" in report
+        assert report.endswith("共 2 个定位器，0 个需要处理，耗时 1.23s")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_locator_optimizer.py
+@Time    :  2026/10/17 14:36:02
+@Author  :  owl
+@Desp    :  定位器优化与报告单元测试
+"""
+
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.common.by import By
+
+from src.core.dom_script import LOCATOR_BENCH_JS, LOCATOR_CANDIDATES_JS
+from src.core.locator_optimizer import (
+    LocatorOptimizer,
+    discover_pages,
+    format_report,
+    page_locators,
+)
+from src.pages.admin_login_page import AdminLoginPage
+from src.pages.article_page import ArticlePage
+
+ARTICLE_LINK = ArticlePage.article_link_loc
+
+
+class OptimizerDriver:
+    """按定位器返回候选与计时的假驱动"""
+
+    def __init__(self, pages, timings):
+        self.pages = pages  # value -> (匹配数量, 候选)
+        self.timings = timings  # value -> 微秒
+        self.benchmarked = []
+
+    def execute_script(self, script, *args):
+        if script == LOCATOR_CANDIDATES_JS:
+            by, value = args[0]
+            if value not in self.pages:
+                raise JavascriptException("SyntaxError")
+            count, candidates = self.pages[value]
+            return {"count": count, "candidates": [dict(c) for c in candidates]}
+        assert script == LOCATOR_BENCH_JS
+        self.benchmarked.append([value for _, value in args[0]])
+        return [self.timings.get(value) for _, value in args[0]]
+
+
+def candidate(strategy, by, value):
+    return {"strategy": strategy, "by": by, "value": value}
+
+
+class TestOptimize:
+    def test_absolute_xpath_rewritten_to_fastest_stable_candidate(self):
+        driver = OptimizerDriver(
+            {
+                ARTICLE_LINK[1]: (
+                    1,
+                    [
+                        candidate("anchored", "css selector", "#list > tr > td > a"),
+                        candidate("class", "css selector", "a.article-title"),
+                        candidate("attribute", "css selector", 'a[title="我的文章1"]'),
+                    ],
+                )
+            },
+            {
+                ARTICLE_LINK[1]: 40.0,
+                "a.article-title": 8.0,
+                'a[title="我的文章1"]': 10.0,
+                "#list > tr > td > a": 5.0,
+            },
+        )
+        result = LocatorOptimizer(driver).optimize(ARTICLE_LINK, "article_link_loc")
+        # 候选按优先级排序后一起计时
+        assert driver.benchmarked == [
+            [
+                ARTICLE_LINK[1],
+                'a[title="我的文章1"]',
+                "a.article-title",
+                "#list > tr > td > a",
+            ]
+        ]
+        assert result["status"] == "rewrite"
+        # 锚定路径虽然最快，但只在优先级最高的两档中选择
+        assert result["suggested"] == ["css selector", "a.article-title"]
+        assert result["speedup"] == 5.0
+
+    def test_keeps_fast_locator_without_enough_gain(self):
+        driver = OptimizerDriver(
+            {"article-title": (1, [candidate("class", "css selector", "input.title")])},
+            {"article-title": 3.0, "input.title": 2.8},
+        )
+        result = LocatorOptimizer(driver).optimize((By.ID, "article-title"))
+        assert result["status"] == "ok"
+        assert result["suggested"] is None
+        assert result["candidates"][0]["us"] == 2.8
+
+    def test_candidate_equal_to_original_is_ignored(self):
+        driver = OptimizerDriver(
+            {"batchDel": (1, [candidate("id", "id", "batchDel")])}, {"batchDel": 2.0}
+        )
+        assert LocatorOptimizer(driver).optimize((By.ID, "batchDel"))["status"] == "ok"
+
+    def test_missing_and_error(self):
+        driver = OptimizerDriver({"//iframe": (0, [])}, {})
+        optimizer = LocatorOptimizer(driver)
+        assert optimizer.optimize((By.XPATH, "//iframe"))["status"] == "missing"
+        assert optimizer.optimize((By.XPATH, "//*["))["status"] == "error"
+        assert driver.benchmarked == []
+
+
+class TestPages:
+    def test_page_locators_skip_aliases(self):
+        locators = page_locators(AdminLoginPage)
+        assert "login_button" in locators
+        assert "ready_locator" not in locators
+        assert locators["captcha_img"] == (By.XPATH, "//img[@id='captcha-img']")
+
+    def test_discover_pages(self):
+        pages = discover_pages()
+        assert AdminLoginPage in pages and ArticlePage in pages
+        assert all(page.page_path for page in pages)
+
+    def test_report(self):
+        results = [
+            {
+                "page": "ArticlePage",
+                "name": "article_link_loc",
+                "status": "rewrite",
+                "original": list(ARTICLE_LINK),
+                "original_us": 40.0,
+                "suggested": ["css selector", "a.article-title"],
+                "suggested_us": 8.0,
+                "strategy": "class",
+                "speedup": 5.0,
+            },
+            {
+                "page": "ArticlePage",
+                "name": "iframe_loc",
+                "status": "missing",
+                "original": ["xpath", "//iframe"],
+            },
+        ]
+        report = format_report(results)
+        assert "建议改为: css selector=a.article-title" in report
+        assert "快 5.0x" in report
+        assert report.endswith("共 2 个定位器，建议替换 1 个")
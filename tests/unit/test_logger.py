@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_logger.py
+@Time    :  2026/10/16 21:32:08
+@Author  :  owl
+@Desp    :  日志管理器单元测试（延迟格式化、级别过滤、调用位置）
+"""
+
+import logging
+import queue
+
+import pytest
+
+from src.core.logger import Logger, _DeferredQueueHandler
+
+
+class Expensive:
+    """记录被格式化的次数"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "expensive"
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def bench_logger():
+    # 先挂上捕获handler，Logger不再创建控制台/文件handler，测试不写日志文件
+    capture = Capture()
+    logging.getLogger("unit_test_logger").addHandler(capture)
+    log = Logger("unit_test_logger")
+    yield log, capture
+    log.logger.removeHandler(capture)
+
+
+class TestLogger:
+    def test_disabled_level_skips_formatting(self, bench_logger):
+        log, capture = bench_logger
+        log.set_level("INFO")
+        arg = Expensive()
+        log.debug("元素: %s", arg)
+        assert arg.formatted == 0
+        assert capture.records == []
+
+    def test_enabled_level_keeps_args(self, bench_logger):
+        log, capture = bench_logger
+        log.set_level("DEBUG")
+        arg = Expensive()
+        log.debug("元素: %s", arg)
+        assert capture.records[0].args == (arg,)
+        assert capture.records[0].getMessage() == "元素: expensive"
+
+    def test_record_points_at_caller(self, bench_logger):
+        log, capture = bench_logger
+        log.set_level("DEBUG")
+        log.info("调用方")
+        log.log_action("点击", ("id", "submit"))
+        assert {r.filename for r in capture.records} == {"test_logger.py"}
+        assert capture.records[1].getMessage() == "点击: ('id', 'submit')"
+
+    def test_log_action_gated(self, bench_logger):
+        log, capture = bench_logger
+        log.set_level("WARNING")
+        log.log_action("点击", ("id", "submit"))
+        assert capture.records == []
+
+
+def test_queued_message_snapshots_mutable_args():
+    log_queue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    items = ["a"]
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, "元素: %s", (items,), None)
+
+    handler.emit(record)
+    items.append("b")
+    queued = log_queue.get_nowait()
+    assert queued.getMessage() == "元素: ['a']"
+    # 其他handler拿到的原始记录不受影响
+    assert record.args == (items,)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_network_capture.py
+@Time    :  2026/10/17 11:02:44
+@Author  :  owl
+@Desp    :  HAR录制与性能日志共享读取单元测试
+"""
+
+import json
+import threading
+
+from src.core.network_capture import (
+    HarRecorder,
+    PerformanceLog,
+    drain_capture,
+    har_path,
+)
+from src.core.network_policy import BlockingPolicy
+
+
+def event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def request(request_id, url, start, method="GET", wall_time=1760000000.0, **extra):
+    return event(
+        "Network.requestWillBeSent",
+        requestId=request_id,
+        request={"url": url, "method": method, "headers": {"Accept": "*/*"}, **extra},
+        timestamp=start,
+        wallTime=wall_time,
+        type="XHR",
+    )
+
+
+def response(request_id, status=200, mime="application/json", timing=None):
+    return event(
+        "Network.responseReceived",
+        requestId=request_id,
+        response={
+            "status": status,
+            "statusText": "OK",
+            "protocol": "http/1.1",
+            "headers": {"Content-Type": mime},
+            "mimeType": mime,
+            "timing": timing,
+        },
+    )
+
+
+def finished(request_id, end, size=100):
+    return event(
+        "Network.loadingFinished",
+        requestId=request_id,
+        timestamp=end,
+        encodedDataLength=size,
+    )
+
+
+def failed(request_id, end, reason=None):
+    return event(
+        "Network.loadingFailed",
+        requestId=request_id,
+        timestamp=end,
+        errorText="net::ERR_BLOCKED_BY_CLIENT",
+        blockedReason=reason,
+    )
+
+
+class LogDriver:
+    """按批次返回性能日志的假驱动"""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.bodies = []
+
+    def get_log(self, name):
+        assert name == "performance"
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Network.getResponseBody"
+        self.bodies.append(params["requestId"])
+        return {"body": '{"ok": true}', "base64Encoded": False}
+
+
+def recorder(driver, tmp_path, **kwargs):
+    return HarRecorder(driver, tmp_path / "case.har", **kwargs)
+
+
+def load(path):
+    return json.loads(path.read_text(encoding="utf-8"))["log"]
+
+
+class TestHarRecorder:
+    def test_streams_valid_har(self, tmp_path):
+        timing = {
+            "requestTime": 1.0,
+            "dnsStart": -1,
+            "sendStart": 2,
+            "sendEnd": 3,
+            "receiveHeadersEnd": 150,
+        }
+        driver = LogDriver(
+            [request("old", "http://x/stale", 0.5)],  # 开始录制前的事件被丢弃
+            [
+                request(
+                    "1",
+                    "http://x/admin/article/doWrite?id=3",
+                    1.0,
+                    method="POST",
+                    postData="title=a",
+                ),
+                response("1", timing=timing),
+                finished("1", 1.4, size=2048),
+                request("2", "http://x/slow.js", 1.0),
+                response("2", mime="application/javascript"),
+            ],
+            [finished("2", 3.0)],
+        )
+        har = recorder(driver, tmp_path, capture_bodies=True)
+        assert har.start()
+        har._log.poll()
+        summary = har.stop()
+
+        log = load(har.path)
+        assert [e["request"]["url"] for e in log["entries"]] == [
+            "http://x/admin/article/doWrite?id=3",
+            "http://x/slow.js",
+        ]
+        post = log["entries"][0]
+        assert round(post["time"]) == 400
+        assert post["request"]["queryString"] == [{"name": "id", "value": "3"}]
+        assert post["request"]["postData"]["text"] == "title=a"
+        assert post["response"]["content"]["text"] == '{"ok": true}'
+        assert post["timings"]["wait"] == 147
+        assert post["timings"]["dns"] == -1
+        assert post["startedDateTime"].startswith("2025-10-09")
+
+        assert summary["requests"] == 2
+        assert [s["url"] for s in summary["slowest"]] == [
+            "http://x/slow.js",
+            "http://x/admin/article/doWrite?id=3",
+        ]
+
+    def test_body_size_cap_and_failures(self, tmp_path):
+        driver = LogDriver(
+            [],
+            [
+                request("1", "http://x/big.json", 1.0),
+                response("1"),
+                finished("1", 1.1, size=200 * 1024),
+                request("2", "http://x/broken", 1.0),
+                failed("2", 1.2),
+                request("3", "http://x/never", 1.0),
+            ],
+        )
+        har = recorder(driver, tmp_path, capture_bodies=True, max_body_kb=64)
+        har.start()
+        summary = har.stop()
+        assert driver.bodies == []
+        assert summary["skipped_bodies"] == 1
+        assert summary["failed"] == 2
+        entries = load(har.path)["entries"]
+        assert entries[1]["_error"] == "net::ERR_BLOCKED_BY_CLIENT"
+        # 录制结束时仍未完成的请求也会写出
+        assert entries[2]["time"] == -1
+
+    def test_memory_bounded_by_pending_limit(self, tmp_path):
+        batch = [request(str(i), f"http://x/{i}", 1.0) for i in range(10)]
+        har = recorder(LogDriver([], batch), tmp_path, max_pending=3, top=2)
+        har.start()
+        har._log.poll()
+        assert len(har._pending) == 3
+        assert har.entries == 7
+        summary = har.stop()
+        assert summary["requests"] == 10
+        assert len(summary["slowest"]) == 2
+
+    def test_drained_on_test_thread_and_bodies_fetched_at_stop(self, tmp_path):
+        driver = LogDriver(
+            [], [request("1", "http://x/a", 1.0), response("1"), finished("1", 1.2)]
+        )
+        har = recorder(driver, tmp_path, capture_bodies=True)
+        har.start()
+        threads = threading.enumerate()
+        drain_capture(driver)
+        assert har.entries == 1
+        # 录制期间不读取响应体
+        assert driver.bodies == []
+        assert har.stop()["requests"] == 1
+        assert driver.bodies == ["1"]
+        # 停止后不再读取日志
+        driver.batches = [[request("2", "http://x/b", 2.0)]]
+        drain_capture(driver)
+        assert driver.batches
+        # 录制不启动任何后台线程
+        assert threading.enumerate() == threads
+
+    def test_unsupported_driver(self, tmp_path):
+        assert not HarRecorder(object(), tmp_path / "x.har").start()
+
+    def test_path_per_worker(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+        assert har_path("test_publish[chrome]").name == "gw2-test_publish_chrome.har"
+
+
+class TestSharedReader:
+    def test_blocking_stats_and_har_see_the_same_events(self, tmp_path):
+        driver = LogDriver(
+            [],
+            [],
+            [
+                request("1", "http://x/logo.png", 1.0),
+                failed("1", 1.1, reason="inspector"),
+                request("2", "http://x/api", 1.0),
+                finished("2", 1.3),
+            ],
+        )
+        policy = BlockingPolicy(resource_types=["image"])
+        policy.drain(driver)
+        har = recorder(driver, tmp_path)
+        har.start()
+        # HAR录制先读取了日志，屏蔽统计仍能拿到被屏蔽的请求
+        har._log.poll()
+        assert policy.collect(driver)["requests"] == 1
+        assert har.stop()["requests"] == 2
+        assert PerformanceLog.for_driver(driver) is har._log
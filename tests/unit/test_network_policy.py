@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_network_policy.py
+@Time    :  2026/10/17 18:40:12
+@Author  :  owl
+@Desp    :  资源屏蔽策略单元测试
+"""
+
+import json
+import re
+
+import pytest
+
+from src.core.network_policy import BlockingPolicy
+
+
+def blocked(patterns, url):
+    """按*通配符整串匹配URL"""
+    return any(
+        re.fullmatch(".*".join(map(re.escape, p.split("*"))), url) for p in patterns
+    )
+
+
+class Cfg:
+    """只支持get的配置替身"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class CdpDriver:
+    def __init__(self, batches=()):
+        self.cdp = []
+        self.batches = list(batches)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+    def get_log(self, name):
+        return self.batches.pop(0) if self.batches else []
+
+
+def event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class TestPatterns:
+    def test_extension_anchored_to_path_end(self):
+        patterns = BlockingPolicy(resource_types=["image", "script"]).patterns
+        assert blocked(patterns, "http://jpress/static/logo.png")
+        assert blocked(patterns, "http://jpress/static/logo.png?v=3")
+        assert blocked(patterns, "http://jpress/static/app.js?v=3")
+        # 接口与页面不受影响
+        assert not blocked(patterns, "http://jpress/api/article.json")
+        assert not blocked(patterns, "http://jpress/admin/article?cover=a.png&page=2")
+        assert not blocked(patterns, "http://jpress/static/app.jsx")
+
+    def test_url_patterns_kept_as_is(self):
+        policy = BlockingPolicy(url_patterns=["*hm.baidu.com*"], resource_types=["font"])
+        assert policy.patterns[0] == "*hm.baidu.com*"
+        assert blocked(policy.patterns, "https://hm.baidu.com/hm.js?abc")
+        assert blocked(policy.patterns, "http://jpress/fonts/a.woff2")
+
+    def test_unknown_resource_type(self):
+        with pytest.raises(ValueError):
+            BlockingPolicy(resource_types=["document"])
+
+
+class TestFromConfig:
+    def test_disabled(self):
+        assert BlockingPolicy.from_config(Cfg({})) is None
+
+    def test_resource_types_skipped_while_perf_enabled(self):
+        values = {
+            "webdriver.network_block.enabled": True,
+            "webdriver.network_block.resource_types": ["image", "font"],
+            "webdriver.network_block.url_patterns": ["*google-analytics.com*"],
+            "perf.enabled": True,
+        }
+        policy = BlockingPolicy.from_config(Cfg(values))
+        assert policy.patterns == ["*google-analytics.com*"]
+
+        values["perf.enabled"] = False
+        policy = BlockingPolicy.from_config(Cfg(values))
+        assert "*.png" in policy.patterns
+
+
+class TestApply:
+    def test_apply_and_toggle(self):
+        policy = BlockingPolicy(url_patterns=["*ads*"])
+        driver = CdpDriver()
+
+        assert policy.apply(driver)
+        assert driver.cdp == [
+            ("Network.enable", {}),
+            ("Network.setBlockedURLs", {"urls": ["*ads*"]}),
+        ]
+        # 状态未变化时不重复下发
+        policy.apply(driver)
+        assert len(driver.cdp) == 2
+
+        policy.apply(driver, enabled=False)
+        assert driver.cdp[-1] == ("Network.setBlockedURLs", {"urls": []})
+        policy.apply(driver, enabled=False, force=True)
+        assert len(driver.cdp) == 6
+
+    def test_unsupported_driver(self):
+        assert not BlockingPolicy(url_patterns=["*ads*"]).apply(object())
+
+
+class TestCollect:
+    def test_counts_only_inspector_blocked_requests(self):
+        driver = CdpDriver(
+            [
+                [],
+                [
+                    event(
+                        "Network.requestWillBeSent",
+                        requestId="1",
+                        request={"url": "http://jpress/logo.png"},
+                    ),
+                    event(
+                        "Network.loadingFailed", requestId="1", blockedReason="inspector"
+                    ),
+                    event(
+                        "Network.requestWillBeSent",
+                        requestId="2",
+                        request={"url": "http://jpress/api"},
+                    ),
+                    event("Network.loadingFailed", requestId="2", errorText="net::ERR"),
+                ],
+            ]
+        )
+        policy = BlockingPolicy(resource_types=["image"])
+        policy.drain(driver)
+
+        stats = policy.collect(driver)
+        assert stats == {"requests": 1, "bytes": 0, "unknown": 1}
+        assert policy.total_blocked == 1
+        assert policy.collect(driver)["requests"] == 0
+
+    def test_bytes_from_unblocked_loads_without_requests(self):
+        logo = {"url": "http://jpress/logo.png"}
+        driver = CdpDriver(
+            [
+                [
+                    # 关闭屏蔽的用例中正常加载过
+                    event("Network.requestWillBeSent", requestId="1", request=logo),
+                    event(
+                        "Network.loadingFinished", requestId="1", encodedDataLength=2048
+                    ),
+                    event(
+                        "Network.requestWillBeSent",
+                        requestId="2",
+                        request={"url": "http://jpress/api"},
+                    ),
+                    event("Network.loadingFinished", requestId="2", encodedDataLength=99),
+                ],
+                [
+                    event("Network.requestWillBeSent", requestId="3", request=logo),
+                    event(
+                        "Network.loadingFailed", requestId="3", blockedReason="inspector"
+                    ),
+                    event(
+                        "Network.requestWillBeSent",
+                        requestId="4",
+                        request={"url": "http://cdn/banner.png"},
+                    ),
+                    event(
+                        "Network.loadingFailed", requestId="4", blockedReason="inspector"
+                    ),
+                ],
+            ]
+        )
+        policy = BlockingPolicy(resource_types=["image"], count_bytes=True)
+        assert policy.collect(driver)["requests"] == 0
+
+        stats = policy.collect(driver)
+        assert stats == {"requests": 2, "bytes": 2048, "unknown": 1}
+        assert policy.total_bytes() == 2048
+        # 不匹配屏蔽规则的资源不记录体积
+        assert "http://jpress/api" not in policy._size_cache
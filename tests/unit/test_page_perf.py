@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_page_perf.py
+@Time    :  2026/10/16 23:31:47
+@Author  :  owl
+@Desp    :  页面性能采集、预算检查与跨运行对比单元测试
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from src.core import page_perf
+from src.core.base_page import BasePage
+from src.core.page_perf import (
+    PAGE_PERF_JS,
+    PerfStore,
+    begin_test_capture,
+    check_budgets,
+    collect_page_perf,
+    compare_runs,
+    end_test_capture,
+    flatten,
+    record_page_perf,
+)
+
+
+def sample(page="LoginPage", ttfb=120.0, lcp=900.0):
+    return {
+        "page": page,
+        "url": "http://x/admin/login",
+        "navigation": {"type": "navigate", "ttfb": ttfb, "load": None},
+        "resources": {"count": 12, "transfer_kb": 300.0, "slowest": []},
+        "vitals": {
+            "fcp": 400.0,
+            "lcp": lcp,
+            "cls": 0.02,
+            "long_tasks": 1,
+            "long_task_ms": 80,
+        },
+    }
+
+
+# 在node中模拟eager加载：DOMContentLoaded后开始采集，load事件与最终LCP之后才到来
+EAGER_PAGE_JS = r"""
+var clock = 0, timers = [], lcpCallbacks = [];
+global.performance = {
+    now: function () { return clock; },
+    getEntriesByName: function () { return [{startTime: 300}]; },
+    getEntriesByType: function (type) {
+        if (type === 'navigation') return [{type: 'navigate', responseStart: 100,
+            domInteractive: 250, domContentLoadedEventEnd: 260,
+            loadEventEnd: page.loadAt !== null && clock >= page.loadAt ? page.loadAt : 0,
+            transferSize: 2048}];
+        return clock >= (page.loadAt === null ? Infinity : page.loadAt)
+            ? [{name: 'hero.png', initiatorType: 'img', duration: 900, transferSize: 51200}]
+            : [];
+    }
+};
+var page = JSON.parse(process.argv[2]);
+global.document = {get readyState() {
+    return page.loadAt !== null && clock >= page.loadAt ? 'complete' : 'interactive';
+}};
+global.location = {href: 'http://x/'};
+global.setTimeout = function (fn, ms) { timers.push([clock + ms, fn]); };
+function PerformanceObserver(cb) { this.cb = cb; }
+PerformanceObserver.supportedEntryTypes = ['largest-contentful-paint'];
+PerformanceObserver.prototype.observe = function () { lcpCallbacks.push(this.cb); };
+PerformanceObserver.prototype.takeRecords = function () { return []; };
+PerformanceObserver.prototype.disconnect = function () {};
+global.PerformanceObserver = PerformanceObserver;
+global.window = global;
+
+var script = new Function(process.argv[1]);
+script({top: 1, timeout: page.timeout, lcp_settle: 500}, function (record) {
+    console.log(JSON.stringify(record));
+});
+while (timers.length) {
+    timers.sort(function (a, b) { return a[0] - b[0]; });
+    var next = timers.shift();
+    clock = next[0];
+    // 主图在load前后绘制，产生新的LCP候选
+    if (page.lcpAt !== null && clock >= page.lcpAt && !page.lcpSent) {
+        page.lcpSent = true;
+        lcpCallbacks.forEach(function (cb) {
+            cb({getEntries: function () { return [{startTime: page.lcpAt}]; }});
+        });
+    }
+    next[1]();
+}
+"""
+
+
+def run_perf_script(load_at, lcp_at, timeout=10000):
+    page = {"loadAt": load_at, "lcpAt": lcp_at, "timeout": timeout}
+    result = subprocess.run(
+        ["node", "-e", EAGER_PAGE_JS, PAGE_PERF_JS, json.dumps(page)],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=10,
+    )
+    return json.loads(result.stdout)
+
+
+class PerfDriver:
+    """不支持CDP的驱动（如Firefox）"""
+
+    def __init__(self):
+        self.cdp_calls = []
+        self.scripts = []
+
+    def execute_async_script(self, script, options):
+        self.scripts.append(options)
+        assert script == PAGE_PERF_JS
+        return sample(page=None)
+
+    def get(self, url):
+        pass
+
+
+class CdpPerfDriver(PerfDriver):
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append(cmd)
+        if cmd == "Performance.getMetrics":
+            return {
+                "metrics": [
+                    {"name": "JSHeapUsedSize", "value": 8 * 1024 * 1024},
+                    {"name": "LayoutCount", "value": 14},
+                    {"name": "Timestamp", "value": 1.0},
+                ]
+            }
+        return {}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = PerfStore(run_id="run-b", directory=tmp_path)
+    monkeypatch.setattr(page_perf, "_store", store)
+    return store
+
+
+class TestCollect:
+    def test_collects_page_and_cdp_metrics(self):
+        driver = CdpPerfDriver()
+        record = collect_page_perf(driver, page="LoginPage", top=3)
+        assert driver.scripts == [{"top": 3, "timeout": 10000, "lcp_settle": 500}]
+        assert record["page"] == "LoginPage"
+        assert record["cdp"] == {"js_heap_mb": 8.0, "layout_count": 14}
+        collect_page_perf(driver)
+        # Performance域只开启一次
+        assert driver.cdp_calls.count("Performance.enable") == 1
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="需要node执行注入脚本")
+    def test_waits_for_load_and_final_lcp(self):
+        record = run_perf_script(load_at=1500, lcp_at=1800)
+        assert record["complete"] is True
+        assert record["navigation"]["load"] == 1500
+        assert record["vitals"]["lcp"] == 1800
+        assert record["resources"]["transfer_kb"] == 50
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="需要node执行注入脚本")
+    def test_incomplete_load_drops_unsettled_metrics(self):
+        record = run_perf_script(load_at=None, lcp_at=None, timeout=2000)
+        assert record["complete"] is False
+        assert record["vitals"]["lcp"] is None
+        assert record["navigation"]["load"] is None
+        assert record["resources"]["transfer_kb"] is None
+        assert "vitals.lcp" not in flatten(record)
+        assert flatten(record)["navigation.ttfb"] == 100
+
+    def test_without_cdp(self):
+        record = collect_page_perf(PerfDriver(), page="LoginPage")
+        assert "cdp" not in record
+
+    def test_flatten_skips_non_numeric(self):
+        metrics = flatten(sample())
+        assert metrics["navigation.ttfb"] == 120.0
+        assert "navigation.type" not in metrics
+        assert "navigation.load" not in metrics
+        assert "resources.slowest" not in metrics
+
+
+class TestBudgets:
+    def test_violations(self):
+        budgets = {"vitals.lcp": 800, "navigation.ttfb": 500, "cdp.js_heap_mb": 10}
+        assert check_budgets(sample(), budgets) == [
+            {"metric": "vitals.lcp", "value": 900.0, "budget": 800}
+        ]
+
+    def test_page_override(self):
+        budgets = page_perf.budgets_for("AdminLoginPage")
+        assert budgets["vitals.lcp"] < page_perf.budgets_for("ArticlePage")["vitals.lcp"]
+        assert "navigation.ttfb" in budgets
+
+
+class TestStoreAndCapture:
+    def test_record_goes_to_store_and_current_test(self, store):
+        begin_test_capture()
+        record = record_page_perf(sample(page="AdminLoginPage", lcp=5000))
+        assert end_test_capture() == [record]
+        assert [v["metric"] for v in record["violations"]] == ["vitals.lcp"]
+        (saved,) = PerfStore.load("run-b", store.directory)
+        assert saved["run"] == "run-b"
+        assert saved["vitals"]["lcp"] == 5000
+
+    def test_navigate_to_captures(self, store):
+        class LoginPage(BasePage):
+            capture_performance = True
+
+        driver = PerfDriver()
+        begin_test_capture()
+        LoginPage(driver).navigate_to("http://x/admin/login")
+        (record,) = end_test_capture()
+        assert record["page"] == "LoginPage"
+
+    def test_compare_runs(self, tmp_path):
+        baseline = PerfStore(run_id="run-a", directory=tmp_path)
+        current = PerfStore(run_id="run-b", directory=tmp_path)
+        for ttfb in (100, 120, 140):
+            baseline.append(sample(ttfb=ttfb))
+            current.append(sample(ttfb=ttfb * 2))
+
+        assert PerfStore.runs(tmp_path) == ["run-a", "run-b"]
+        rows = {
+            (page, metric): (old, new, change)
+            for page, metric, old, new, change in compare_runs(
+                PerfStore.load("run-a", tmp_path), PerfStore.load("run-b", tmp_path)
+            )
+        }
+        assert rows[("LoginPage", "navigation.ttfb")] == (120, 240, 1.0)
+        assert rows[("LoginPage", "vitals.lcp")][2] == 0
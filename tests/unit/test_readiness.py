@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_readiness.py
+@Time    :  2026/10/16 22:41:05
+@Author  :  owl
+@Desp    :  页面加载策略与就绪判断单元测试
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from src.core.base_page import BasePage
+from src.core.dom_script import NETWORK_SHIM_JS, READY_CHECK_JS
+from src.core.readiness import (
+    DomReady,
+    NetworkIdle,
+    ReadySelector,
+    install_network_shim,
+    ready_predicates,
+    wait_until_ready,
+)
+from src.core.wait_engine import finish_wait_budget
+
+LOGIN = (By.XPATH, "//button[@type='submit']")
+
+
+class ReadyDriver:
+    """按顺序返回未满足的就绪条件"""
+
+    def __init__(self, *pending, strategy="eager"):
+        self.pending = list(pending)
+        self.scripts = []
+        self.cdp = []
+        self.capabilities = {"pageLoadStrategy": strategy}
+
+    def execute_script(self, script, *args):
+        assert script == READY_CHECK_JS
+        self.scripts.append(args[0])
+        return self.pending.pop(0) if len(self.pending) > 1 else self.pending[0]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+
+class LoginPage(BasePage):
+    page_load_strategy = "eager"
+    ready_locator = LOGIN
+
+
+@pytest.fixture(autouse=True)
+def no_budget():
+    finish_wait_budget()
+
+
+class TestReadyPredicates:
+    def test_session_strategy_already_covers_dom(self):
+        assert ready_predicates("eager", session="eager") == []
+        assert ready_predicates("eager", session="normal") == []
+
+    def test_stricter_page_adds_dom_state(self):
+        (dom,) = ready_predicates("normal", session="eager")
+        assert isinstance(dom, DomReady) and dom.state == "complete"
+        (dom,) = ready_predicates("eager", session="none")
+        assert dom.state == "interactive"
+
+    def test_selector_and_network_idle(self):
+        predicates = ready_predicates("none", "none", LOGIN, network_idle=300)
+        assert [type(p) for p in predicates] == [NetworkIdle, ReadySelector]
+        assert predicates[0].payload()["idle_ms"] == 300
+        assert predicates[1].payload() == {
+            "type": "selector",
+            "name": "selector://button[@type='submit']",
+            "by": "xpath",
+            "value": "//button[@type='submit']",
+            "visible": True,
+        }
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            ready_predicates("lazy")
+
+
+class TestWaitUntilReady:
+    def test_all_predicates_in_one_check(self):
+        driver = ReadyDriver(["selector:x"], [])
+        predicates = [DomReady(), NetworkIdle(200), ReadySelector((By.ID, "x"))]
+        assert wait_until_ready(driver, predicates, timeout=2)
+        assert [p["type"] for p in driver.scripts[0]] == ["dom", "network_idle", "selector"]
+
+    def test_timeout_returns_false(self):
+        driver = ReadyDriver(["network_idle:200ms"])
+        assert not wait_until_ready(driver, [NetworkIdle(200)], timeout=0.2)
+
+    def test_callable_predicate(self):
+        calls = []
+
+        def app_ready(driver):
+            calls.append(driver)
+            return len(calls) > 1
+
+        driver = ReadyDriver([])
+        assert wait_until_ready(driver, [app_ready], timeout=2)
+        assert len(calls) == 2
+        assert driver.scripts == []
+
+    def test_page_object_uses_class_settings(self):
+        driver = ReadyDriver([], strategy="none")
+        assert LoginPage(driver).wait_until_ready()
+        assert [p["type"] for p in driver.scripts[0]] == ["dom", "selector"]
+
+    def test_nothing_to_wait_for(self):
+        driver = ReadyDriver([], strategy="normal")
+        assert BasePage(driver).wait_until_ready()
+        assert driver.scripts == []
+
+
+class TestNetworkShim:
+    def test_installed_once_per_driver(self):
+        driver = ReadyDriver([])
+        assert install_network_shim(driver)
+        assert install_network_shim(driver)
+        assert driver.cdp == [
+            ("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_SHIM_JS})
+        ]
+
+    def test_unsupported_driver(self):
+        assert not install_network_shim(object())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_screenshot_service.py
+@Time    :  2026/10/17 09:40:18
+@Author  :  owl
+@Desp    :  异步截图服务单元测试
+"""
+
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core import screenshot_service
+from src.core.base_page import BasePage
+from src.core.screenshot_service import (
+    ScreenshotService,
+    encode,
+    set_current_test,
+)
+from src.utils.captcha_utils import CaptchaRecognizer
+
+
+def make_png(width=400, height=300):
+    image = np.full((height, width, 3), 200, np.uint8)
+    ok, data = cv2.imencode(".png", image)
+    assert ok
+    return data.tobytes()
+
+
+PNG = make_png()
+
+
+class ShotDriver:
+    def __init__(self):
+        self.calls = 0
+
+    def get_screenshot_as_png(self):
+        self.calls += 1
+        return PNG
+
+    def save_screenshot(self, filename):
+        raise AssertionError("不应经过文件截图")
+
+
+def size_of(path):
+    image = cv2.imdecode(np.frombuffer(path.read_bytes(), np.uint8), cv2.IMREAD_COLOR)
+    return image.shape[1], image.shape[0]
+
+
+@pytest.fixture
+def test_name():
+    set_current_test("test_login")
+    yield
+    set_current_test(None)
+
+
+class TestEncode:
+    def test_png_passthrough(self):
+        assert encode(PNG) is PNG
+
+    def test_jpeg_downscaled(self, tmp_path):
+        data = encode(PNG, "jpeg", quality=70, max_width=200)
+        assert data[:2] == b"\xff\xd8"
+        path = tmp_path / "a.jpg"
+        path.write_bytes(data)
+        assert size_of(path) == (200, 150)
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            encode(PNG, "gif")
+
+
+class TestService:
+    def test_naming_by_worker_test_and_sequence(self, tmp_path, monkeypatch, test_name):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        service = ScreenshotService(directory=tmp_path, fmt="webp")
+        first = service.capture(ShotDriver(), "before click")
+        second = service.capture(ShotDriver(), "before click")
+        assert first.name == "gw1-test_login-001-before_click.webp"
+        assert second.name == "gw1-test_login-002-before_click.webp"
+        assert service.path_for("x", test="test_other").name.startswith(
+            "gw1-test_other-001-"
+        )
+        assert service.flush()
+        assert first.exists() and second.exists()
+        assert not list(tmp_path.glob("*.part"))
+        service.shutdown()
+
+    def test_test_name_from_pytest(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        monkeypatch.setenv(
+            "PYTEST_CURRENT_TEST", "tests/test_a.py::TestA::test_ok[chrome] (call)"
+        )
+        path = ScreenshotService(directory=tmp_path).path_for("shot")
+        assert path.name == "main-test_ok_chrome-001-shot.png"
+
+    def test_encoding_off_the_calling_thread(self, tmp_path, test_name):
+        service = ScreenshotService(directory=tmp_path, fmt="jpeg", max_width=100)
+        threads = []
+        original = service._write
+
+        def record_thread(png, path):
+            threads.append(threading.current_thread().name)
+            return original(png, path)
+
+        service._write = record_thread
+        path = service.capture(ShotDriver(), "page")
+        service.shutdown()
+        assert threads[0].startswith("screenshot")
+        assert size_of(path) == (100, 75)
+        assert service.saved == 1
+
+    def test_full_queue_writes_synchronously(self, tmp_path, test_name):
+        service = ScreenshotService(directory=tmp_path, queue_size=1)
+        gate = threading.Event()
+        original = service._write
+
+        def blocked(png, path):
+            if "queued" in path.name:
+                gate.wait(5)
+            return original(png, path)
+
+        service._write = blocked
+        queued = service.capture(ShotDriver(), "queued")
+        path = service.capture(ShotDriver(), "sync")
+        # 第二张在测试线程写完，第一张仍在排队
+        assert path.exists() and not queued.exists()
+        assert service.sync_writes == 1
+        gate.set()
+        service.shutdown()
+        assert queued.exists()
+        assert service.saved == 2
+
+    def test_failure_is_counted(self, tmp_path, test_name):
+        service = ScreenshotService(directory=tmp_path, fmt="jpeg")
+        service.save(b"not a png", "broken")
+        service.shutdown()
+        assert service.failed == 1
+        assert not list(tmp_path.iterdir())
+
+
+class TestCallers:
+    def test_page_screenshot_uses_service(self, tmp_path, monkeypatch, test_name):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        service = ScreenshotService(directory=tmp_path)
+        monkeypatch.setattr(screenshot_service, "_service", service)
+        driver = ShotDriver()
+        path = BasePage(driver).take_screenshot()
+        service.flush()
+        assert path.name == "main-test_login-001-screenshot_BasePage.png"
+        assert path.read_bytes() == PNG
+
+    def test_captcha_page_bytes_in_memory(self):
+        recognizer = CaptchaRecognizer.__new__(CaptchaRecognizer)
+        assert recognizer.get_page_screenshot_bytes(ShotDriver()) == PNG
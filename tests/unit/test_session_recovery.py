@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_session_recovery.py
+@Time    :  2026/10/16 14:40:37
+@Author  :  owl
+@Desp    :  会话恢复单元测试
+"""
+
+import pytest
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+)
+from selenium.webdriver.remote.command import Command
+
+from src.core.session_recovery import SessionGuard, is_dead_session_error
+
+
+class FakeDriver:
+    """可以模拟会话崩溃的假驱动"""
+
+    def __init__(self):
+        self.session_id = "session-1"
+        self.alive = True
+        self.commands = []
+        self.cookies = [{"name": "jpress_token", "value": "token"}]
+        self.url = "about:blank"
+
+    def execute(self, driver_command, params=None):
+        if not self.alive and driver_command != Command.NEW_SESSION:
+            raise InvalidSessionIdException("invalid session id")
+        self.commands.append((driver_command, params))
+        if driver_command == Command.GET:
+            self.url = params["url"]
+        if driver_command == Command.GET_CURRENT_URL:
+            return {"value": self.url}
+        if driver_command == Command.GET_ALL_COOKIES:
+            return {"value": list(self.cookies)}
+        if driver_command == Command.GET_TITLE:
+            return {"value": "JPress后台"}
+        return {"value": None}
+
+    def start_session(self, capabilities):
+        self.alive = True
+        self.execute(Command.NEW_SESSION, capabilities)
+        self.session_id = "session-2"
+
+
+@pytest.fixture()
+def driver():
+    fake = FakeDriver()
+    SessionGuard(fake, {"browserName": "chrome"}, snapshot_interval=0)
+    return fake
+
+
+def commands(driver, command):
+    return [params for cmd, params in driver.commands if cmd == command]
+
+
+class TestSessionRecovery:
+    def test_dead_session_classification(self):
+        assert is_dead_session_error(InvalidSessionIdException("gone"))
+        assert not is_dead_session_error(NoSuchElementException("missing"))
+
+    def test_recovers_and_retries_idempotent_command(self, driver):
+        driver.execute(Command.GET, {"url": "http://jpress/admin"})
+        driver.execute(Command.FIND_ELEMENT, {"using": "id", "value": "title"})
+        driver.alive = False
+
+        assert driver.execute(Command.GET_TITLE)["value"] == "JPress后台"
+        assert driver.session_id == "session-2"
+        restored = [params for cmd, params in driver.commands if cmd == Command.ADD_COOKIE]
+        assert restored == [{"cookie": {"name": "jpress_token", "value": "token"}}]
+        gets = [params["url"] for cmd, params in driver.commands if cmd == Command.GET]
+        assert gets[-1] == "http://jpress/admin"
+
+    def test_non_idempotent_command_is_not_retried(self, driver):
+        driver.alive = False
+        with pytest.raises(InvalidSessionIdException):
+            driver.execute(Command.CLICK_ELEMENT, {"id": "old-element"})
+        # 会话已恢复，后续命令正常执行
+        assert driver.session_id == "session-2"
+        assert driver.execute(Command.GET_TITLE)["value"] == "JPress后台"
+
+    def test_click_driven_login_is_captured(self, driver):
+        driver.execute(Command.GET, {"url": "http://jpress/admin/login"})
+        driver.cookies = []
+        driver.execute(Command.FIND_ELEMENT, {"using": "id", "value": "login"})
+        # 点击登录：站点写入cookie并跳转，没有driver.get
+        driver.execute(Command.CLICK_ELEMENT, {"id": "login"})
+        driver.cookies = [{"name": "jpress_token", "value": "token"}]
+        driver.url = "http://jpress/admin/index"
+        driver.execute(Command.FIND_ELEMENT, {"using": "id", "value": "menu"})
+        driver.alive = False
+
+        driver.execute(Command.GET_TITLE)
+        assert commands(driver, Command.ADD_COOKIE) == [
+            {"cookie": {"name": "jpress_token", "value": "token"}}
+        ]
+        assert commands(driver, Command.GET)[-1]["url"] == "http://jpress/admin/index"
+
+    def test_consecutive_actions_snapshot_once(self, driver):
+        guard = driver._session_guard
+        driver.execute(Command.GET, {"url": "http://jpress/admin"})
+        driver.execute(Command.SEND_KEYS_TO_ELEMENT, {"id": "title", "text": "a"})
+        driver.execute(Command.CLICK_ELEMENT, {"id": "save"})
+        assert guard.snapshots == 0
+        driver.execute(Command.FIND_ELEMENT, {"using": "id", "value": "ok"})
+        driver.execute(Command.FIND_ELEMENT, {"using": "id", "value": "ok"})
+        assert guard.snapshots == 1
+        assert len(commands(driver, Command.GET_ALL_COOKIES)) == 1
+
+    def test_snapshot_interval_limits_cost(self):
+        fake = FakeDriver()
+        guard = SessionGuard(fake, {"browserName": "chrome"}, snapshot_interval=60)
+        for page in ("a", "b", "c"):
+            fake.execute(Command.GET, {"url": f"http://jpress/{page}"})
+            fake.execute(Command.FIND_ELEMENT, {"using": "id", "value": "x"})
+        assert guard.snapshots == 1
+        # 跳转目标无需请求即可得知
+        assert guard.last_url == "http://jpress/c"
+
+    def test_snapshot_disabled(self):
+        fake = FakeDriver()
+        guard = SessionGuard(fake, {"browserName": "chrome"}, snapshot_interval=None)
+        fake.execute(Command.GET, {"url": "http://jpress/admin"})
+        fake.execute(Command.FIND_ELEMENT, {"using": "id", "value": "x"})
+        assert guard.snapshots == 0
+        assert commands(fake, Command.GET_ALL_COOKIES) == []
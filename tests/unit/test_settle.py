@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_settle.py
+@Time    :  2026/10/16 19:52:40
+@Author  :  owl
+@Desp    :  界面稳定检测单元测试
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from src.core import settle
+from src.core.dom_script import SETTLE_JS
+from src.core.settle import settle_report, wait_for_settle
+
+
+class AsyncDriver:
+    """按顺序返回注入脚本结果，异常对象会被抛出"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def execute_async_script(self, script, options, element):
+        self.calls.append((dict(options), element))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def clean_events(monkeypatch):
+    monkeypatch.setattr(
+        settle,
+        "settle_stats",
+        {"count": 0, "unsettled": 0, "spent": 0.0, "baseline": 0.0},
+    )
+
+
+class TestWaitForSettle:
+    def test_settled_quickly_records_saving(self):
+        driver = AsyncDriver({"settled": True, "elapsed": 30})
+        assert wait_for_settle(driver, baseline=0.5, label="滚动") is True
+
+        options, element = driver.calls[0]
+        assert element is None
+        # 没有元素时不做布局与可见性检测
+        assert options["layout"] is False and options["visible"] is False
+        assert settle.settle_stats["baseline"] == 0.5
+        assert "节省" in settle_report()
+
+    def test_element_options(self):
+        driver = AsyncDriver({"settled": True, "elapsed": 10})
+        element = object()
+        wait_for_settle(driver, element, layout=True, visible=True, max_wait=1)
+
+        options, passed = driver.calls[0]
+        assert passed is element
+        assert options["layout"] and options["visible"]
+        assert options["max_ms"] <= 1000
+
+    def test_retry_while_navigating(self):
+        driver = AsyncDriver(
+            JavascriptException("document unloaded while waiting for result"),
+            {"settled": True, "elapsed": 5},
+        )
+        assert wait_for_settle(driver, max_wait=1) is True
+        assert len(driver.calls) == 2
+
+    def test_gives_up_after_max_wait(self):
+        driver = AsyncDriver(*[JavascriptException("unloaded")] * 100)
+        assert wait_for_settle(driver, max_wait=0.1) is False
+        assert settle.settle_stats["unsettled"] == 1
+
+    def test_empty_report(self):
+        assert settle_report() == "界面稳定检测统计: 无"
+
+    def test_stats_do_not_grow(self):
+        for _ in range(3):
+            settle.record_settle("对话框", 0.1, 1.0)
+        assert settle.settle_stats["count"] == 3
+        assert len(settle.settle_stats) == 4
+
+
+# 在node中运行SETTLE_JS：页面一直在滚动（每帧scrollY+1）
+_NODE_HARNESS = """
+var window = {scrollX: 0, scrollY: 0};
+var document = {hidden: false};
+function requestAnimationFrame(f) { setTimeout(function () { window.scrollY++; f(); }, 1); }
+(function () { %s }).apply(null, [%s, null, function (r) { console.log(JSON.stringify(r)); }]);
+"""
+
+
+def run_settle_js(**options):
+    opts = {"animations": False, "layout": False, "visible": False, "frames": 3, "max_ms": 300}
+    opts.update(options)
+    output = subprocess.run(
+        ["node", "-e", _NODE_HARNESS % (SETTLE_JS, json.dumps(opts))],
+        capture_output=True,
+        text=True,
+        timeout=10,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="需要node运行注入脚本")
+class TestSettleScript:
+    def test_scrolling_page_not_settled(self):
+        assert run_settle_js(scroll=True)["settled"] is False
+
+    def test_scroll_ignored_when_disabled(self):
+        assert run_settle_js(scroll=False)["settled"] is True
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_startup_cache.py
+@Time    :  2026/10/17 17:32:18
+@Author  :  owl
+@Desp    :  浏览器启动缓存单元测试
+"""
+
+import os
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from src.core import webdriver_manager
+from src.core.startup_cache import DriverStartupCache
+from src.core.webdriver_manager import DriverManager
+
+
+@pytest.fixture
+def binaries(tmp_path):
+    driver_path = tmp_path / "chromedriver"
+    browser_path = tmp_path / "chrome"
+    driver_path.write_bytes(b"driver")
+    browser_path.write_bytes(b"browser-141")
+    return driver_path, browser_path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DriverStartupCache(tmp_path / "driver_startup.json")
+
+
+class TestDriverStartupCache:
+    def test_lookup_after_store(self, cache, binaries, tmp_path):
+        driver_path, browser_path = binaries
+        assert cache.lookup("chrome") is None
+        cache.store("chrome", "141.0", driver_path, browser_path)
+
+        # 新进程读取同一个缓存文件
+        entry = DriverStartupCache(tmp_path / "driver_startup.json").lookup("chrome")
+        assert entry["driver_path"] == str(driver_path)
+        assert entry["version"] == "141.0"
+        assert cache.lookup("edge") is None
+
+    def test_new_version_replaces_old(self, cache, binaries):
+        driver_path, browser_path = binaries
+        cache.store("chrome", "140.0", driver_path, browser_path)
+        cache.store("chrome", "141.0", driver_path, browser_path)
+        assert list(cache._load()) == [cache.make_key("chrome", "141.0")]
+
+    def test_browser_upgrade_invalidates_entry(self, cache, binaries):
+        driver_path, browser_path = binaries
+        cache.store("chrome", "141.0", driver_path, browser_path)
+        browser_path.write_bytes(b"browser-142-upgraded")
+        assert cache.lookup("chrome") is None
+
+    def test_missing_driver_invalidates_entry(self, cache, binaries):
+        driver_path, browser_path = binaries
+        cache.store("chrome", "141.0", driver_path, browser_path)
+        os.remove(driver_path)
+        assert cache.lookup("chrome") is None
+
+    def test_invalidate(self, cache, binaries):
+        driver_path, browser_path = binaries
+        cache.store("chrome", "141.0", driver_path, browser_path)
+        cache.store("edge", "141.0", driver_path, None)
+
+        cache.invalidate("chrome")
+        assert cache.lookup("chrome") is None
+        assert cache.lookup("edge") is not None
+        cache.invalidate()
+        assert cache.lookup("edge") is None
+
+
+class FakeChrome:
+    """按驱动路径决定能否启动的假驱动类"""
+
+    launched = []
+
+    def __init__(self, service, options):
+        FakeChrome.launched.append((service.path, options.binary_location))
+        if service.path.endswith("stale-chromedriver"):
+            raise SessionNotCreatedException(
+                "This version of ChromeDriver only supports Chrome version 140"
+            )
+
+
+class FakeSeleniumManager:
+    def driver_location(self, options):
+        options.binary_location = "/opt/chrome/chrome"
+        return "/opt/chrome/chromedriver"
+
+
+class TestLaunchFallback:
+    @pytest.fixture
+    def stale_cache(self, cache, tmp_path, monkeypatch):
+        stale = tmp_path / "stale-chromedriver"
+        stale.write_bytes(b"driver")
+        cache.store("chrome", "140.0", stale, None)
+        FakeChrome.launched = []
+        monkeypatch.setattr(DriverManager, "_get_startup_cache", lambda: cache)
+        drivers = webdriver_manager._LOCAL_DRIVER_CLASSES
+        monkeypatch.setitem(drivers, "chrome", FakeChrome)
+        monkeypatch.setattr(webdriver_manager, "SeleniumManager", FakeSeleniumManager)
+        return stale
+
+    def test_stale_cached_driver_is_invalidated_and_retried(self, cache, stale_cache):
+        driver, service, cached = DriverManager._launch_local("chrome", ChromeOptions())
+        assert isinstance(driver, FakeChrome)
+        assert not cached
+        assert FakeChrome.launched == [
+            (str(stale_cache), ""),
+            ("/opt/chrome/chromedriver", "/opt/chrome/chrome"),
+        ]
+        assert cache.lookup("chrome") is None
+
+    def test_failure_without_cache_is_raised(self, cache, stale_cache, monkeypatch):
+        cache.invalidate()
+
+        class BrokenChrome(FakeChrome):
+            def __init__(self, service, options):
+                raise SessionNotCreatedException("Chrome failed to start")
+
+        drivers = webdriver_manager._LOCAL_DRIVER_CLASSES
+        monkeypatch.setitem(drivers, "chrome", BrokenChrome)
+        with pytest.raises(SessionNotCreatedException):
+            DriverManager._launch_local("chrome", ChromeOptions())
+
+
+class TestUnmanagedDriver:
+    def test_cold_start_invalidates_cache_and_skips_pool(
+        self, cache, binaries, monkeypatch
+    ):
+        cache.store("chrome", "141.0", *binaries)
+        created = []
+        tracked = []
+
+        class FakeReaper:
+            def track(self, driver):
+                tracked.append(driver)
+
+        monkeypatch.setattr(DriverManager, "_get_startup_cache", lambda: cache)
+        monkeypatch.setattr(DriverManager, "_get_reaper", lambda: FakeReaper())
+        monkeypatch.setattr(
+            DriverManager,
+            "_create_local_driver",
+            lambda browser_type: created.append(browser_type) or "driver",
+        )
+        monkeypatch.setattr(
+            DriverManager, "_acquire_driver", lambda *args: pytest.fail("使用了会话池")
+        )
+
+        driver = DriverManager.create_unmanaged_driver("chrome", cold_start=True)
+        assert driver == "driver"
+        assert created == ["chrome"]
+        assert tracked == ["driver"]
+        assert cache.lookup("chrome") is None
+        assert DriverManager.get_session() is None
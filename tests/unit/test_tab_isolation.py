@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_tab_isolation.py
+@Time    :  2026/10/17 18:02:45
+@Author  :  owl
+@Desp    :  标签页隔离单元测试，使用模拟CDP的假驱动
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.remote.command import Command
+
+from src.core.tab_isolation import SharedBrowser, context_window_handles
+from src.core.webdriver_manager import DriverManager
+
+
+class Browser:
+    """被多个附加会话共享的浏览器：记录上下文与标签页"""
+
+    def __init__(self):
+        self.targets = [{"targetId": "T0", "type": "page"}]
+        self.contexts = []
+
+
+class CdpDriver:
+    """附加到共享浏览器的假驱动"""
+
+    def __init__(self, browser, fail_on=None):
+        self.browser = browser
+        self.fail_on = fail_on
+        self.current = "T0"
+        self.switch_to = self
+        self.quit_called = False
+        self.alive = True
+        self.session_id = "attached-1"
+        self.capabilities = {
+            "goog:chromeOptions": {"debuggerAddress": "localhost:9222"}
+        }
+
+    def window(self, handle):
+        self.current = handle
+
+    @property
+    def window_handles(self):
+        return [t["targetId"] for t in self.browser.targets if t["type"] == "page"]
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == self.fail_on:
+            raise WebDriverException(f"{cmd} failed")
+        if cmd == "Target.createBrowserContext":
+            context = f"C{len(self.browser.contexts) + 1}"
+            self.browser.contexts.append(context)
+            return {"browserContextId": context}
+        if cmd == "Target.createTarget":
+            target = f"T{len(self.browser.targets)}"
+            self.browser.targets.append(
+                {
+                    "targetId": target,
+                    "type": "page",
+                    "browserContextId": params["browserContextId"],
+                }
+            )
+            return {"targetId": target}
+        if cmd == "Target.disposeBrowserContext":
+            self.browser.contexts.remove(params["browserContextId"])
+            self.browser.targets = [
+                t
+                for t in self.browser.targets
+                if t.get("browserContextId") != params["browserContextId"]
+            ]
+            return {}
+        if cmd == "Target.getTargets":
+            return {"targetInfos": list(self.browser.targets)}
+        raise AssertionError(f"未预期的CDP命令: {cmd}")
+
+    def execute(self, driver_command, params=None):
+        if not self.alive:
+            raise InvalidSessionIdException("invalid session id")
+        return {"value": None}
+
+    def start_session(self, capabilities):
+        # 重新附加后回到共享浏览器的默认标签页
+        self.alive = True
+        self.session_id = "attached-2"
+        self.current = "T0"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def browser():
+    return Browser()
+
+
+def shared_browser(browser, configured=None, **kwargs):
+    attached = []
+
+    def attacher(browser_type, debugger_address):
+        assert (browser_type, debugger_address) == ("chrome", "localhost:9222")
+        driver = CdpDriver(browser, **kwargs)
+        attached.append(driver)
+        return driver
+
+    def configure(driver):
+        if configured is not None:
+            configured.append(driver.current)
+
+    shared = SharedBrowser(
+        "chrome",
+        launcher=lambda: CdpDriver(browser),
+        attacher=attacher,
+        configure=configure,
+    )
+    return shared, attached
+
+
+class TestSharedBrowser:
+    def test_open_context_switches_then_configures(self, browser):
+        configured = []
+        shared, attached = shared_browser(browser, configured)
+
+        first = shared.open_context()
+        second = shared.open_context()
+
+        assert attached == [first, second]
+        assert (first._browser_context, second._browser_context) == ("C1", "C2")
+        assert (first.current, second.current) == ("T1", "T2")
+        # 配置在各自的隔离标签页上执行
+        assert configured == ["T1", "T2"]
+        assert first._shared_browser is shared
+        assert shared.contexts == 2
+
+    def test_failed_open_quits_attached_session(self, browser):
+        shared, attached = shared_browser(browser, fail_on="Target.createTarget")
+        with pytest.raises(WebDriverException):
+            shared.open_context()
+        assert attached[0].quit_called
+        assert shared.contexts == 0
+
+    def test_close_context_disposes_and_quits(self, browser):
+        shared, _ = shared_browser(browser)
+        driver = shared.open_context()
+
+        shared.close_context(driver)
+        assert browser.contexts == []
+        assert driver.quit_called
+        assert shared.contexts == 0
+
+    def test_close_context_quits_even_if_dispose_fails(self, browser):
+        shared, _ = shared_browser(browser, fail_on="Target.disposeBrowserContext")
+        driver = shared.open_context()
+
+        shared.close_context(driver)
+        assert driver.quit_called
+        assert shared.contexts == 0
+
+    def test_host_launched_once(self, browser):
+        shared, _ = shared_browser(browser)
+        shared.open_context()
+        host = shared._host_driver
+        shared.open_context()
+        assert shared._host_driver is host
+
+        shared.close()
+        assert host.quit_called
+
+    def test_unsupported_browser(self):
+        with pytest.raises(ValueError):
+            SharedBrowser("firefox", launcher=None, attacher=None)
+
+
+class TestContextWindowHandles:
+    def test_only_own_context_tabs(self, browser):
+        shared, _ = shared_browser(browser)
+        first = shared.open_context()
+        second = shared.open_context()
+        browser.targets.append(
+            {"targetId": "W1", "type": "page", "browserContextId": "C1"}
+        )
+        browser.targets.append(
+            {"targetId": "SW", "type": "service_worker", "browserContextId": "C1"}
+        )
+
+        assert context_window_handles(first) == ["T1", "W1"]
+        assert context_window_handles(second) == ["T2"]
+
+    def test_plain_session_sees_all_tabs(self, browser):
+        assert context_window_handles(CdpDriver(browser)) == ["T0"]
+
+
+class TestRecovery:
+    def test_recovered_attached_session_is_isolated_again(self, browser, monkeypatch):
+        configured = []
+        monkeypatch.setattr(
+            DriverManager,
+            "_configure_driver",
+            lambda d, browser_type, grid_url=None: configured.append(d.current),
+        )
+        monkeypatch.setattr(
+            DriverManager._current_config.webdriver.recovery, "enabled", True
+        )
+        shared, _ = shared_browser(browser)
+        driver = shared.open_context()
+        DriverManager._guard_session(driver, ChromeOptions(), "chrome")
+
+        driver.alive = False
+        driver.execute(Command.GET_TITLE)
+        assert driver._browser_context == "C2"
+        assert driver.current == "T2"
+        assert configured == ["T2"]
+
+
+class TestSharedHostAcrossWorkers:
+    @staticmethod
+    def worker(browser, tmp_path, launcher=None, **kwargs):
+        return SharedBrowser(
+            "chrome",
+            launcher=launcher or (lambda: CdpDriver(browser)),
+            attacher=lambda browser_type, address: CdpDriver(browser),
+            run_id="run-1",
+            state_dir=tmp_path,
+            **kwargs,
+        )
+
+    def test_second_worker_attaches_to_first_host(self, browser, tmp_path):
+        first = self.worker(browser, tmp_path)
+        second = self.worker(
+            browser, tmp_path, launcher=lambda: pytest.fail("重复启动宿主浏览器")
+        )
+
+        first.open_context()
+        second.open_context()
+        assert second.debugger_address == "localhost:9222"
+        assert second._host_driver is None
+
+        host = first._host_driver
+        second.close()
+        first.close()
+        assert host.quit_called
+        assert list(tmp_path.iterdir()) == []
+
+    def test_host_closed_after_other_workers_leave(self, browser, tmp_path):
+        first = self.worker(browser, tmp_path)
+        second = self.worker(browser, tmp_path)
+        first.open_context()
+        second.open_context()
+        host = first._host_driver
+
+        closing = threading.Thread(target=first.close)
+        closing.start()
+        time.sleep(0.3)
+        # 其他worker仍在使用，宿主保持运行
+        assert not host.quit_called
+        second.close()
+        closing.join(5)
+        assert host.quit_called
+
+    def test_failed_host_falls_back_to_own_browser(self, browser, tmp_path):
+        (tmp_path / "chrome-run-1.lock").touch()
+        (tmp_path / "chrome-run-1.failed").touch()
+        launched = []
+        shared = self.worker(
+            browser, tmp_path, launcher=lambda: launched.append(1) or CdpDriver(browser)
+        )
+
+        shared.open_context()
+        assert launched == [1]
+        assert list((tmp_path / "chrome-run-1.users").iterdir()) == []
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Windows上不判断进程存活")
+    def test_wait_for_users_ignores_exited_workers(self, browser, tmp_path):
+        shared = self.worker(browser, tmp_path, linger_timeout=5)
+        shared.open_context()
+        (tmp_path / "chrome-run-1.users" / "999999999-dead").touch()
+
+        start = time.monotonic()
+        shared.close()
+        assert time.monotonic() - start < 1
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_typing_engine.py
+@Time    :  2026/10/16 20:21:37
+@Author  :  owl
+@Desp    :  模拟人工输入单元测试
+"""
+
+import random
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from src.core.typing_engine import compile_typing, keystroke_delays
+
+
+class RecordingDriver:
+    """记录发送的命令"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append((command, params))
+        return {"value": None}
+
+
+def key_actions(payload):
+    return next(a for a in payload["actions"] if a["type"] == "key")["actions"]
+
+
+class TestTypingEngine:
+    def test_single_perform_for_whole_text(self):
+        driver = RecordingDriver()
+        chain, duration = compile_typing(driver, "hello", delay=0.05)
+        chain.perform()
+
+        assert len(driver.commands) == 1
+        command, payload = driver.commands[0]
+        assert command == Command.W3C_ACTIONS
+        actions = key_actions(payload)
+        typed = [a["value"] for a in actions if a["type"] == "keyDown"]
+        assert typed == list("hello")
+        pauses = [a["duration"] for a in actions if a["type"] == "pause" and a["duration"]]
+        # 按键之间4次间隔，最后一个按键后不等待
+        assert pauses == [50, 50, 50, 50]
+        assert duration == pytest.approx(0.2)
+
+    def test_hold_adds_pause_between_down_and_up(self):
+        driver = RecordingDriver()
+        chain, _ = compile_typing(driver, "ab", delay=0, hold=0.02)
+        chain.perform()
+        kinds = [(a["type"], a.get("duration")) for a in key_actions(driver.commands[0][1])]
+        assert kinds[:3] == [("keyDown", None), ("pause", 20), ("keyUp", None)]
+
+    def test_jitter_bounds(self):
+        delays = keystroke_delays(200, delay=0.1, jitter=0.5, rng=random.Random(1))
+        assert delays[-1] == 0.0
+        assert all(0.05 <= d <= 0.15 for d in delays[:-1])
+        assert len(set(delays[:-1])) > 1
+
+    def test_invalid_jitter(self):
+        with pytest.raises(ValueError):
+            keystroke_delays(3, jitter=2)
+
+    def test_empty_text(self):
+        assert keystroke_delays(0) == []
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""
+@File    :  test_wait_engine.py
+@Time    :  2026/10/16 13:30:51
+@Author  :  owl
+@Desp    :  统一等待引擎单元测试
+"""
+
+import shutil
+import subprocess
+import time
+from unittest import mock
+
+import pytest
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+
+from src.core.dom_script import WAIT_FOR_JS, WAIT_MARKER_JS
+from src.core.wait_engine import (
+    WaitEngine,
+    current_wait_budget,
+    finish_wait_budget,
+    start_wait_budget,
+)
+
+
+class Countdown:
+    """第n次调用才返回真值的条件"""
+
+    def __init__(self, n, error=None):
+        self.n = n
+        self.calls = 0
+        self.error = error
+
+    def __call__(self, driver):
+        self.calls += 1
+        if self.calls >= self.n:
+            return "ready"
+        if self.error:
+            raise self.error
+        return False
+
+
+class TestWaitEngine:
+    @pytest.fixture(autouse=True)
+    def no_budget(self):
+        """不受conftest中用例预算的影响"""
+        finish_wait_budget()
+
+    def test_returns_condition_value(self):
+        engine = WaitEngine(driver=None, timeout=1)
+        assert engine.until(Countdown(1)) == "ready"
+
+    def test_adaptive_polling_is_fast_early(self):
+        engine = WaitEngine(driver=None, timeout=2)
+        engine.poll_initial, engine.poll_max, engine.poll_backoff = 0.01, 0.5, 1.5
+        start = time.monotonic()
+        engine.until(Countdown(3))
+        # 0.01 + 0.015，远小于固定0.5s轮询的1s
+        assert time.monotonic() - start < 0.2
+
+    def test_ignores_missing_element_until_timeout(self):
+        engine = WaitEngine(driver=None, timeout=0.2)
+        with pytest.raises(TimeoutException):
+            engine.until(Countdown(1000, NoSuchElementException("missing")), "元素")
+
+    def test_until_not(self):
+        engine = WaitEngine(driver=None, timeout=1)
+        assert engine.until_not(lambda d: False) is True
+
+    def test_budget_limits_and_fails_fast(self):
+        budget = start_wait_budget(0.2)
+        engine = WaitEngine(driver=None, timeout=10)
+        start = time.monotonic()
+        with pytest.raises(TimeoutException):
+            engine.until(lambda d: False)
+        assert time.monotonic() - start < 1
+        assert budget.spent >= 0.2
+        assert current_wait_budget() is budget
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutException, match="预算已耗尽"):
+            engine.until(lambda d: True)
+        assert time.monotonic() - start < 0.05
+
+
+class AsyncScriptDriver:
+    """
+    按顺序返回异步脚本结果，结果为异常时抛出
+    :param navigated: 脚本报错时文档是否已跳转（新文档上没有等待标记）
+    """
+
+    def __init__(self, *results, navigated=True):
+        self.results = list(results)
+        self.payloads = []
+        self.navigated = navigated
+
+    def execute_script(self, script):
+        assert script == WAIT_MARKER_JS
+        return not self.navigated
+
+    def execute_async_script(self, script, payload):
+        assert script == WAIT_FOR_JS
+        self.payloads.append(dict(payload))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestBrowserBackend:
+    @pytest.fixture(autouse=True)
+    def no_budget(self):
+        finish_wait_budget()
+
+    def test_single_command_per_wait(self):
+        driver = AsyncScriptDriver({"ok": True, "value": "element"})
+        engine = WaitEngine(driver, timeout=3, backend="browser")
+        assert engine.wait_for("clickable", (By.ID, "submit")) == "element"
+        assert driver.payloads == [
+            {
+                "type": "clickable",
+                "expected": None,
+                "by": "id",
+                "value": "submit",
+                "max_ms": pytest.approx(3000, abs=50),
+            }
+        ]
+
+    def test_navigation_interrupts_and_retries(self):
+        driver = AsyncScriptDriver(
+            JavascriptException("document unloaded while waiting for result"),
+            {"ok": True, "value": True},
+        )
+        engine = WaitEngine(driver, timeout=3, backend="browser")
+        assert engine.wait_for("title_contains", expected="后台") is True
+        assert len(driver.payloads) == 2
+        assert "by" not in driver.payloads[0]
+
+    def test_script_error_on_same_document_raised(self):
+        error = JavascriptException("Refused to evaluate a string as JavaScript")
+        driver = AsyncScriptDriver(error, {"ok": True, "value": True}, navigated=False)
+        engine = WaitEngine(driver, timeout=3, backend="browser")
+        start = time.monotonic()
+        with pytest.raises(JavascriptException):
+            engine.wait_for("title_contains", expected="后台")
+        assert time.monotonic() - start < 1
+        assert len(driver.payloads) == 1
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="需要node检查注入脚本")
+    def test_wait_script_parses(self):
+        # 语法错误的脚本不会留下标记，会被当作页面跳转一直重试
+        subprocess.run(
+            ["node", "-e", "new Function(process.argv[1])", WAIT_FOR_JS],
+            capture_output=True,
+            check=True,
+            timeout=10,
+        )
+
+    def test_timeout_and_long_waits_are_chunked(self):
+        driver = AsyncScriptDriver({"ok": False}, {"ok": False})
+        engine = WaitEngine(driver, timeout=60, backend="browser")
+        clock = mock.patch(
+            "src.core.wait_engine.time.monotonic", side_effect=[0, 0, 25, 25, 60]
+        )
+        with clock, pytest.raises(TimeoutException):
+            engine.wait_for("presence", (By.ID, "x"))
+        assert [p["max_ms"] for p in driver.payloads] == [25000, 25000]
+
+    def test_selector_error(self):
+        driver = AsyncScriptDriver({"ok": False, "error": "not a valid XPath"})
+        engine = WaitEngine(driver, timeout=1, backend="browser")
+        with pytest.raises(InvalidSelectorException):
+            engine.wait_for("presence", (By.XPATH, "//["))
+
+    def test_budget_charged(self):
+        budget = start_wait_budget(5)
+        driver = AsyncScriptDriver({"ok": True, "value": []})
+        WaitEngine(driver, timeout=10, backend="browser").wait_for(
+            "count", (By.TAG_NAME, "tr"), expected=0
+        )
+        assert budget.waits == 1
+        assert driver.payloads[0]["max_ms"] <= 5000
+
+    def test_unknown_condition(self):
+        with pytest.raises(ValueError):
+            WaitEngine(None, backend="browser").wait_for("enabled", (By.ID, "x"))